@@ -8,6 +8,7 @@ from .schemas import (
     MapObjectIcon,
     MapObjectType,
     MapObjectIconBg,
+    EngineModel,
     IndicatorsModel,
     MapInfoModel,
     MapObjectModel,
@@ -15,6 +16,15 @@ from .schemas import (
     CompassDirection,
     CompassModel,
     GyroscopeModel,
+    HistoryModel,
+    MapTilesModel,
+    MapTrackModel,
+    PlayerModel,
+    SnapshotModel,
+    SourceStatusModel,
+    SquadMemberModel,
+    SquadModel,
+    CircuitBreakerModel,
     Status
 )
 
@@ -25,6 +35,7 @@ __all__ = [
     "MapObjectIcon",
     "MapObjectType",
     "MapObjectIconBg",
+    "EngineModel",
     "IndicatorsModel",
     "MapInfoModel",
     "MapObjectModel",
@@ -32,5 +43,14 @@ __all__ = [
     "CompassDirection",
     "CompassModel",
     "GyroscopeModel",
+    "HistoryModel",
+    "MapTilesModel",
+    "MapTrackModel",
+    "SnapshotModel",
+    "SourceStatusModel",
+    "PlayerModel",
+    "SquadMemberModel",
+    "SquadModel",
+    "CircuitBreakerModel",
     "Status"
 ]
@@ -5,23 +5,116 @@ Ce module définit la classe `App` (sous-classe de FastAPI) qui construit les ro
 pour les indicateurs, la carte, les objets de la carte et l'état du joueur.
 """
 
-import base64
+import asyncio
+import math
+from contextlib import aclosing, asynccontextmanager
+from pathlib import Path
+from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Response
-from httpx import AsyncClient
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
+from .breaker import DEFAULT_BACKOFF, DEFAULT_MAX_BACKOFF, DEFAULT_THRESHOLD, CircuitBreaker
+from .columnar import COLUMNAR, FORMATS, ROWS
+from .compression import compress, compressible, negotiate as negotiate_coding, variant_etag
+from .encoding import ENCODERS, JSON, NAMES, encode, negotiate
+from .history import DEFAULT_CAPACITY, DEFAULT_MAX_POINTS, MAX_POINTS, MIN_POINTS
+from .map_image import etag_matches
+from .metrics import Metrics, instrumented_route, serializing, track_subscriber
+from .players import DEFAULT_PLAYER, Player, PlayerDocument, Squad
+from .recorder import SessionRecorder
+from .rendering import DEFAULT_SIZE, MAX_SIZE, MEDIA_TYPES, MIN_SIZE, PNG, snap_size
 from .schemas import (
     IndicatorsModel,
     MapInfoModel,
     MapObjectModel,
-    MapObjectType,
-    MapObjectIcon,
-    MapObjectIconBg,
+    MapTilesModel,
+    MapTrackModel,
     StateModel,
     CompassModel,
     GyroscopeModel,
+    HistoryModel,
+    PlayerModel,
+    SnapshotModel,
+    SquadModel,
     Status
 )
+from .spatial import MapQuery
+from .streaming import WS_KEEPALIVE, iter_changes, iter_keepalive, iter_sse, parse_rate, parse_topics
+from .telemetry import DEFAULT_MAX_STALE, TelemetryPoller, TelemetrySnapshot
+from .tiles import TileCache, TilePyramid
+from .upstream import WarThunderClient
+
+#: Réponse documentée des routes de télémétrie lorsque le format demandé n'est pas installé.
+NOT_ACCEPTABLE_RESPONSE: dict = {
+    "description": "Requested encoding not available (MessagePack needs `msgpack`, CBOR needs `cbor2`)",
+    "content": {
+        "application/json": {
+            "example": {"detail": "Not acceptable. Available media types: application/json"}
+        }
+    }
+}
+
+#: Réponse documentée des routes `/players/{name}/...` lorsque le joueur n'est pas déclaré.
+UNKNOWN_PLAYER_RESPONSE: dict = {
+    "description": "Unknown player",
+    "content": {
+        "application/json": {
+            "example": {"detail": "Unknown player 'foo'. Available players: pilot, tanker"}
+        }
+    }
+}
+
+
+def map_query(
+        bbox: Optional[str] = None,
+        near: Optional[str] = None,
+        radius: Optional[float] = None,
+        k: Optional[int] = None,
+        side: Optional[str] = None
+) -> Optional[MapQuery]:
+    """
+    Dépendance commune des routes d'objets de la carte : filtre de voisinage optionnel.
+
+    :param bbox: rectangle `x_min,y_min,x_max,y_max` en coordonnées normalisées.
+    :param near: centre de la recherche : `player` ou `x,y`.
+    :param radius: distance maximale à `near`, en unités normalisées.
+    :param k: nombre d'objets les plus proches de `near`.
+    :param side: camp des objets (`enemy` ou `ally`).
+    :return: `MapQuery`, ou None sans filtre.
+    :except: HTTPException(400) si un paramètre est invalide.
+    """
+    try:
+        return MapQuery.parse(bbox=bbox, near=near, radius=radius, k=k, side=side)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def stale_budget(request: Request, max_stale_ms: Optional[float] = Query(None, ge=0)) -> Optional[float]:
+    """
+    Dépendance commune des routes de télémétrie : ancienneté maximale acceptée pour une source en échec.
+
+    Le paramètre `max_stale_ms` l'emporte sur la directive `max-stale` de l'en-tête `Cache-Control`
+    (en secondes ; sans valeur, toute ancienneté est acceptée).
+
+    :param request: requête HTTP.
+    :param max_stale_ms: ancienneté maximale en millisecondes (0 : données fraîches uniquement).
+    :return: ancienneté maximale en secondes, ou None pour celle de l'application (`MAX_STALE`).
+    :except: HTTPException(400) si la directive `max-stale` est invalide.
+    """
+    if max_stale_ms is not None:
+        return max_stale_ms / 1000
+    for directive in request.headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-stale":
+            try:
+                seconds = float(value.strip('"')) if value else math.inf
+            except ValueError:
+                seconds = -1.0
+            if not seconds >= 0:
+                raise HTTPException(status_code=400, detail=f"Invalid Cache-Control max-stale: {value!r}")
+            return seconds
+    return None
 
 
 class App(FastAPI):
@@ -32,58 +125,159 @@ class App(FastAPI):
     :type IP_SERVER_WAR_THUNDER: str
     :param PORT_SERVER_WAR_THUNDER: Port d'écoute du serveur War Thunder.
     :type PORT_SERVER_WAR_THUNDER: int
+    :param UPSTREAM_TIMEOUTS: timeouts en secondes par source upstream (optionnel).
+    :type UPSTREAM_TIMEOUTS: Optional[dict[str, float]]
+    :param MAX_CONNECTIONS: taille maximale du pool de connexions upstream.
+    :type MAX_CONNECTIONS: int
+    :param MAX_KEEPALIVE_CONNECTIONS: nombre maximal de connexions keep-alive.
+    :type MAX_KEEPALIVE_CONNECTIONS: int
+    :param KEEPALIVE_EXPIRY: durée de vie d'une connexion keep-alive inactive (secondes).
+    :type KEEPALIVE_EXPIRY: float
+    :param POLL_INTERVAL: intervalle en secondes entre deux ticks de polling upstream en bataille.
+    :type POLL_INTERVAL: float
+    :param IDLE_POLL_INTERVAL: intervalle en secondes entre deux ticks au hangar ou jeu injoignable.
+    :type IDLE_POLL_INTERVAL: float
+    :param ADAPTIVE_POLLING: adapte le rythme et les sources interrogées à l'état du jeu.
+    :type ADAPTIVE_POLLING: bool
+    :param TRUSTED_INGEST: construit `StateModel` sans revalidation Pydantic à chaque tick.
+    :type TRUSTED_INGEST: bool
+    :param RECORD_DIR: dossier d'enregistrement des sessions (optionnel, désactivé si None).
+    :type RECORD_DIR: Optional[str]
+    :param HISTORY_CAPACITY: nombre de points d'historique conservés par source.
+    :type HISTORY_CAPACITY: int
+    :param PLAYERS: joueurs suivis, par nom : (hôte, port) de leur jeu (optionnel; remplace
+        `IP_SERVER_WAR_THUNDER`/`PORT_SERVER_WAR_THUNDER`).
+    :type PLAYERS: Optional[dict[str, tuple[str, int]]]
+    :param BREAKER_THRESHOLD: échecs réseau consécutifs qui ouvrent le disjoncteur d'une source upstream.
+    :type BREAKER_THRESHOLD: int
+    :param BREAKER_BACKOFF: délai en secondes avant la première sonde d'une source injoignable.
+    :type BREAKER_BACKOFF: float
+    :param BREAKER_MAX_BACKOFF: délai maximal en secondes entre deux sondes.
+    :type BREAKER_MAX_BACKOFF: float
+    :param MAX_STALE: ancienneté maximale en secondes de la dernière valeur valide servie à la place
+        d'une source en échec, sauf `max_stale_ms` ou `Cache-Control: max-stale` dans la requête.
+    :type MAX_STALE: float
     :return: instance de `App` prête à être lancée par Uvicorn.
     :except: Aucune exception levée directement; les erreurs réseau sont propagées
              en tant que `HTTPException` lors des appels aux endpoints.
     """
 
-    API_WAR_THUNDER_INDICATORS: str = "indicators"
-    API_WAR_THUNDER_STATE: str = "state"
-    API_WAR_THUNDER_MAP_INFO: str = "map_info.json"
-    API_WAR_THUNDER_MAP_OBJ: str = "map_obj.json"
-    API_WAR_THUNDER_MAP_IMG: str = "map.img"
-
     def __init__(
             self,
             IP_SERVER_WAR_THUNDER: str = "localhost",
-            PORT_SERVER_WAR_THUNDER: int = 8111
+            PORT_SERVER_WAR_THUNDER: int = 8111,
+            UPSTREAM_TIMEOUTS: Optional[dict[str, float]] = None,
+            MAX_CONNECTIONS: int = 10,
+            MAX_KEEPALIVE_CONNECTIONS: int = 10,
+            KEEPALIVE_EXPIRY: float = 30.0,
+            POLL_INTERVAL: float = 0.2,
+            IDLE_POLL_INTERVAL: float = 2.0,
+            ADAPTIVE_POLLING: bool = True,
+            TRUSTED_INGEST: bool = False,
+            RECORD_DIR: Optional[str] = None,
+            HISTORY_CAPACITY: int = DEFAULT_CAPACITY,
+            PLAYERS: Optional[dict[str, tuple[str, int]]] = None,
+            BREAKER_THRESHOLD: int = DEFAULT_THRESHOLD,
+            BREAKER_BACKOFF: float = DEFAULT_BACKOFF,
+            BREAKER_MAX_BACKOFF: float = DEFAULT_MAX_BACKOFF,
+            MAX_STALE: float = DEFAULT_MAX_STALE
     ):
         """
-        Initialise l'application et configure les URLs upstream utilisées par les endpoints.
+        Initialise l'application et configure, pour chaque joueur, le client upstream et le poller
+        utilisés par les endpoints.
 
         :param IP_SERVER_WAR_THUNDER: hôte du serveur War Thunder (par défaut 'localhost').
         :param PORT_SERVER_WAR_THUNDER: port du serveur War Thunder (par défaut 8111).
+        :param UPSTREAM_TIMEOUTS: timeouts en secondes par source upstream
+            ('indicators', 'state', 'map_info', 'map_objects', 'map_img').
+        :param MAX_CONNECTIONS: nombre maximal de connexions du pool upstream.
+        :param MAX_KEEPALIVE_CONNECTIONS: nombre maximal de connexions keep-alive du pool.
+        :param KEEPALIVE_EXPIRY: durée en secondes avant fermeture d'une connexion inactive.
+        :param POLL_INTERVAL: intervalle en secondes entre deux ticks de polling upstream en bataille.
+        :param IDLE_POLL_INTERVAL: intervalle en secondes entre deux ticks au hangar ou jeu injoignable.
+        :param ADAPTIVE_POLLING: adapte le rythme et les sources interrogées à l'état du jeu.
+        :param TRUSTED_INGEST: construit `StateModel` sans revalidation Pydantic (chemin rapide).
+        :param RECORD_DIR: dossier où enregistrer chaque partie dans un fichier `.wtrec` (optionnel).
+        :param HISTORY_CAPACITY: nombre de points conservés par source pour `/history` (mémoire constante).
+        :param PLAYERS: joueurs suivis, par nom : (hôte, port) de leur jeu. Le premier est servi par
+            les routes non préfixées; chacun l'est par `/players/{name}/...`. Avec `RECORD_DIR`,
+            chaque joueur enregistre dans le sous-dossier à son nom.
+        :param BREAKER_THRESHOLD: échecs réseau consécutifs après lesquels une source échoue immédiatement.
+        :param BREAKER_BACKOFF: délai en secondes avant la première sonde d'une source injoignable,
+            doublé à chaque sonde en échec.
+        :param BREAKER_MAX_BACKOFF: délai maximal en secondes entre deux sondes.
+        :param MAX_STALE: ancienneté maximale en secondes des données servies à la place d'une source
+            en échec (0 : une source en échec renvoie toujours 502).
         :return: None
-        :except: Aucun sauf erreurs internes lors de l'initialisation (rare).
+        :except: ValueError si `UPSTREAM_TIMEOUTS` contient une source inconnue, si un nom de joueur
+                 est invalide, si `POLL_INTERVAL`/`IDLE_POLL_INTERVAL`/`HISTORY_CAPACITY` n'est pas
+                 strictement positif ou si un paramètre de disjoncteur est hors bornes.
         """
-        self.API_WAR_THUNDER_INDICATORS = (
-            f"http://{IP_SERVER_WAR_THUNDER}:{PORT_SERVER_WAR_THUNDER}"
-            f"/{self.API_WAR_THUNDER_INDICATORS}"
-        )
-        self.API_WAR_THUNDER_STATE = (
-            f"http://{IP_SERVER_WAR_THUNDER}:{PORT_SERVER_WAR_THUNDER}"
-            f"/{self.API_WAR_THUNDER_STATE}"
-        )
-        self.API_WAR_THUNDER_MAP_INFO = (
-            f"http://{IP_SERVER_WAR_THUNDER}:{PORT_SERVER_WAR_THUNDER}"
-            f"/{self.API_WAR_THUNDER_MAP_INFO}"
-        )
-        self.API_WAR_THUNDER_MAP_OBJ = (
-            f"http://{IP_SERVER_WAR_THUNDER}:{PORT_SERVER_WAR_THUNDER}"
-            f"/{self.API_WAR_THUNDER_MAP_OBJ}"
-        )
-
-        self.API_WAR_THUNDER_MAP_IMG = (
-            f"http://{IP_SERVER_WAR_THUNDER}:{PORT_SERVER_WAR_THUNDER}"
-            f"/{self.API_WAR_THUNDER_MAP_IMG}"
-        )
+        self.metrics = Metrics()
+        upstreams = PLAYERS or {DEFAULT_PLAYER: (IP_SERVER_WAR_THUNDER, PORT_SERVER_WAR_THUNDER)}
+        players = []
+        for name, (host, port) in upstreams.items():
+            recorder = None
+            if RECORD_DIR:
+                recorder = SessionRecorder(Path(RECORD_DIR) / name if PLAYERS else RECORD_DIR)
+            client = WarThunderClient(
+                host=host,
+                port=port,
+                timeouts=UPSTREAM_TIMEOUTS,
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+                trusted_ingest=TRUSTED_INGEST,
+                recorder=recorder,
+                metrics=self.metrics,
+                breaker_threshold=BREAKER_THRESHOLD,
+                breaker_backoff=BREAKER_BACKOFF,
+                breaker_max_backoff=BREAKER_MAX_BACKOFF
+            )
+            players.append(Player(
+                name,
+                client,
+                recorder=recorder,
+                poll_interval=POLL_INTERVAL,
+                idle_poll_interval=IDLE_POLL_INTERVAL,
+                adaptive_polling=ADAPTIVE_POLLING,
+                history_capacity=HISTORY_CAPACITY
+            ))
+        self.squad = Squad(players)
+        default = self.squad.default
+        self.war_thunder = default.client
+        self.recorder = default.recorder
+        self.history = default.history
+        self.poller = default.poller
+        self.map_image = default.map_image
+        self.tiles = TileCache(self.metrics)
+        self.max_stale = MAX_STALE
 
-        super().__init__()
+        super().__init__(lifespan=self._lifespan)
         self.title = "War Thunder API"
         self.version = "1.0.0"
         self.description = "API for War Thunder related functionalities"
+        self.router.route_class = instrumented_route(self.metrics)
         self.add_routes()
 
+    @asynccontextmanager
+    async def _lifespan(self, _app: FastAPI):
+        """
+        Ouvre le pool de connexions upstream, démarre l'enregistrement éventuel et le polling
+        de chaque joueur au démarrage, puis les arrête dans l'ordre inverse à l'arrêt, ainsi que le pool
+        de découpe des tuiles de la carte.
+
+        :param _app: instance FastAPI (elle-même), imposée par la signature de lifespan.
+        :return: générateur asynchrone utilisé comme context manager par Starlette.
+        :except: Aucun.
+        """
+        await self.squad.start()
+        try:
+            yield
+        finally:
+            await self.squad.stop()
+            self.tiles.close()
+
     def add_routes(self):
         """
         Enregistre les routes HTTP sur l'instance FastAPI.
@@ -102,15 +296,36 @@ class App(FastAPI):
             tags=["Status"],
             summary="Get API status",
             response_model=Status,
-            description="Endpoint to check the status of the War Thunder API",
+            description="Endpoint to check the status of the War Thunder API and the circuit breaker of each"
+                        " upstream source, per player. An open breaker fails requests to its source"
+                        " immediately (502 with the last network error) while the game is probed in the"
+                        " background; `status` is then `degraded`.",
             responses={
                 200: {
                     "description": "API is running smoothly",
                     "content": {
                         "application/json": {
                             "example": {
-                                "status": "ok",
-                                "message": "API is running smoothly"
+                                "status": "degraded",
+                                "message": "Upstream unreachable, failing fast: default/indicators",
+                                "upstreams": {
+                                    "default": {
+                                        "indicators": {
+                                            "state": "open",
+                                            "failures": 5,
+                                            "last_error": "All connection attempts failed",
+                                            "opened_at": 1700000000.0,
+                                            "next_probe_in": 3.2
+                                        },
+                                        "state": {
+                                            "state": "closed",
+                                            "failures": 0,
+                                            "last_error": None,
+                                            "opened_at": None,
+                                            "next_probe_in": None
+                                        }
+                                    }
+                                }
                             }
                         }
                     }
@@ -122,11 +337,41 @@ class App(FastAPI):
             Endpoint de vérification de l'état de l'API.
 
             :param: None
-            :return: `Status` contenant les champs `status` (str) et `message` (str).
-            :except: Aucun; opération locale et déterministe.
+            :return: `Status` contenant les champs `status` (str), `message` (str) et `upstreams`.
+            :except: Aucun; opération locale, sans requête upstream.
             """
             return self._status()
 
+        @self.get(
+            path="/metrics",
+            tags=["Status"],
+            summary="Get Prometheus metrics",
+            response_class=PlainTextResponse,
+            description="Prometheus text exposition of upstream fetch, parse and serialization durations,"
+                        " upstream and HTTP error counters, cache hit ratios and stream subscribers.",
+            responses={
+                200: {
+                    "description": "Metrics rendered successfully",
+                    "content": {
+                        "text/plain": {
+                            "example": "# HELP wt_upstream_fetch_seconds Duration of upstream War Thunder"
+                                       " requests.\n# TYPE wt_upstream_fetch_seconds histogram\n"
+                                       "wt_upstream_fetch_seconds_bucket{source=\"state\",le=\"0.001\"} 42\n"
+                        }
+                    }
+                }
+            }
+        )
+        async def metrics():
+            """
+            Expose les métriques de l'application au format texte Prometheus.
+
+            :param: None
+            :return: PlainTextResponse au format d'exposition Prometheus.
+            :except: Aucun.
+            """
+            return self._get_metrics()
+
         @self.get(
             path="/indicators",
             tags=["Official_API"],
@@ -181,18 +426,22 @@ class App(FastAPI):
                             }
                         }
                     }
-                }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
             }
         )
-        async def get_indicators():
+        async def get_indicators(request: Request, max_stale: Optional[float] = Depends(stale_budget)):
             """
             Récupère les indicateurs depuis le serveur War Thunder et les valide via Pydantic.
 
-            :param: None
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
             :return: `IndicatorsModel` avec les indicateurs remontés par l'upstream.
-            :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+            :except: HTTPException(502) si l'upstream est injoignable ou répond mal;
+                HTTPException(406) si le format demandé n'est pas disponible.
             """
-            return await self._get_indicators()
+            return await self._serve(request, WarThunderClient.INDICATORS, max_stale=max_stale)
 
         @self.get(
             path="/map_info",
@@ -227,25 +476,34 @@ class App(FastAPI):
                             }
                         }
                     }
-                }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
             }
         )
-        async def get_map_info():
+        async def get_map_info(request: Request, max_stale: Optional[float] = Depends(stale_budget)):
             """
             Récupère les informations de la carte depuis le serveur War Thunder.
 
-            :param: None
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
             :return: `MapInfoModel` décrivant la grille et les bornes de la carte.
-            :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+            :except: HTTPException(502) si l'upstream est injoignable ou répond mal;
+                HTTPException(406) si le format demandé n'est pas disponible.
             """
-            return await self._get_map_info()
+            return await self._serve(request, WarThunderClient.MAP_INFO, max_stale=max_stale)
 
         @self.get(
             path="/map_objects",
             tags=["Official_API"],
             summary="Get Map Objects",
             response_model=list[MapObjectModel],
-            description="Endpoint to retrieve map objects from War Thunder",
+            description="Endpoint to retrieve map objects from War Thunder."
+                        " Add ?format=columnar to get one array per field, with enum and color"
+                        " columns dictionary-encoded (-1/null when absent)."
+                        " Filter with ?bbox=x_min,y_min,x_max,y_max, ?near=player (or x,y) with ?radius="
+                        " and/or ?k= (k nearest, closest first) and ?side=enemy|ally; coordinates and"
+                        " radius are normalized (0-1). Filters use a spatial index built once per tick.",
             responses={
                 200: {
                     "description": "Map objects retrieved successfully",
@@ -668,6 +926,22 @@ class App(FastAPI):
                         }
                     }
                 },
+                400: {
+                    "description": "Unknown output format or invalid filter",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Unknown format 'csv'. Available formats: rows, columnar"}
+                        }
+                    }
+                },
+                404: {
+                    "description": "near=player while the player is not on the map",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Player is not on the map"}
+                        }
+                    }
+                },
                 502: {
                     "description": "Upstream service unreachable",
                     "content": {
@@ -677,25 +951,327 @@ class App(FastAPI):
                             }
                         }
                     }
-                }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
             }
         )
-        async def get_map_objects():
+        async def get_map_objects(
+                request: Request,
+                format: str = ROWS,
+                query: Optional[MapQuery] = Depends(map_query),
+                max_stale: Optional[float] = Depends(stale_budget)
+        ):
             """
             Récupère la liste des objets présents sur la carte depuis l'upstream.
+            Si `format=columnar` est passé en querystring, renvoie une colonne par champ.
+
+            :param request: requête HTTP (l'en-tête `Accept` choisit l'encodage de la réponse).
+            :param format: format de sortie (`rows` ou `columnar`).
+            :param query: filtre de voisinage (`bbox`, `near`, `radius`, `k`, `side`), optionnel.
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
+            :return: liste d'objets `MapObjectModel`, ou Response JSON en colonnes.
+            :except: HTTPException(400) si le format ou le filtre est invalide; HTTPException(404) si
+                `near=player` alors que le joueur n'est pas sur la carte; HTTPException(406) si l'encodage
+                demandé n'est pas disponible; HTTPException(502) si l'upstream est injoignable.
+            """
+            return await self._get_map_objects(request, output_format=format, query=query, max_stale=max_stale)
+
+        @self.get(
+            path="/map_tracks",
+            tags=["Custom_API"],
+            summary="Get Tracked Map Objects",
+            response_model=list[MapTrackModel],
+            description="Endpoint to retrieve map objects with a stable `id` across frames and their"
+                        " estimated velocity (`vx`/`vy` in normalized map units per second, `speed` in"
+                        " m/s) and `heading` (degrees, 0 = north). Objects are matched frame to frame"
+                        " by type, icon, color and nearest predicted position; ids reset on map change."
+                        " Accepts the same filters as /map_objects (bbox, near, radius, k, side).",
+            responses={
+                200: {
+                    "description": "Tracked map objects retrieved successfully",
+                    "content": {
+                        "application/json": {
+                            "example": [
+                                {
+                                    "type": "aircraft",
+                                    "icon": "Fighter",
+                                    "icon_bg": "none",
+                                    "color_hex": "#fa0C00",
+                                    "color_rgb": [250, 12, 0],
+                                    "blink": 0,
+                                    "x": 0.421337,
+                                    "y": 0.377012,
+                                    "dx": 0.707107,
+                                    "dy": -0.707107,
+                                    "sx": None,
+                                    "sy": None,
+                                    "ex": None,
+                                    "ey": None,
+                                    "id": 17,
+                                    "vx": 0.00191,
+                                    "vy": -0.00189,
+                                    "speed": 174.8,
+                                    "heading": 45.3
+                                }
+                            ]
+                        }
+                    }
+                },
+                400: {
+                    "description": "Invalid filter",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "radius and k require near (player or x,y)"}
+                        }
+                    }
+                },
+                404: {
+                    "description": "near=player while the player is not on the map",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Player is not on the map"}
+                        }
+                    }
+                },
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
+            }
+        )
+        async def get_map_tracks(
+                request: Request,
+                query: Optional[MapQuery] = Depends(map_query),
+                max_stale: Optional[float] = Depends(stale_budget)
+        ):
+            """
+            Récupère les objets de la carte avec leur identifiant stable, leur vitesse et leur cap estimés.
+
+            :param request: requête HTTP (l'en-tête `Accept` choisit l'encodage de la réponse).
+            :param query: filtre de voisinage (`bbox`, `near`, `radius`, `k`, `side`), optionnel.
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
+            :return: liste d'objets `MapTrackModel`, dans l'ordre de /map_objects.
+            :except: HTTPException(400) si le filtre est invalide; HTTPException(404) si `near=player`
+                alors que le joueur n'est pas sur la carte; HTTPException(406) si l'encodage demandé
+                n'est pas disponible; HTTPException(502) si l'upstream est injoignable.
+            """
+            return await self._get_map_tracks(request, query=query, max_stale=max_stale)
+
+        @self.get(
+            path="/map_render",
+            tags=["Custom_API"],
+            summary="Get Rendered Map",
+            description="Endpoint to retrieve the map image composited server-side with the grid, airfields"
+                        " and current map objects, as one PNG (default) or WebP image of `size` x `size`"
+                        " pixels (rounded to a multiple of 64, 64-2048). One frame is rendered per tick and"
+                        " shared by every client; it keeps its ETag while nothing moved by a pixel, so"
+                        " If-None-Match returns 304.",
+            responses={
+                200: {
+                    "description": "Composited map rendered successfully",
+                    "content": {
+                        "image/png": {
+                            "example": "<binary image stream>"
+                        },
+                        "image/webp": {
+                            "example": "<binary image stream>"
+                        }
+                    }
+                },
+                304: {
+                    "description": "Frame not modified since the version identified by If-None-Match"
+                },
+                400: {
+                    "description": "Unknown output format",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Unknown format 'gif'. Available formats: png, webp"}
+                        }
+                    }
+                },
+                501: {
+                    "description": "Rendering not available (Pillow is not installed)",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Map rendering requires Pillow (pip install pillow)"}
+                        }
+                    }
+                },
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        async def get_map_render(
+                request: Request,
+                format: str = PNG,
+                size: int = Query(DEFAULT_SIZE, ge=MIN_SIZE, le=MAX_SIZE)
+        ):
+            """
+            Renvoie la carte composée côté serveur, pour les clients qui ne peuvent pas la redessiner.
+
+            :param request: requête HTTP (en-tête `If-None-Match`).
+            :param format: format de l'image (`png` ou `webp`).
+            :param size: côté de l'image en pixels.
+            :return: Response avec l'image composée, ou un 304 vide.
+            :except: HTTPException(400) si le format est inconnu; HTTPException(501) si Pillow n'est pas
+                installé; HTTPException(502) si l'image de la carte est injoignable ou illisible.
+            """
+            return await self._get_map_render(
+                output_format=format,
+                size=size,
+                if_none_match=request.headers.get("if-none-match")
+            )
+
+        @self.get(
+            path="/map_tiles",
+            tags=["Custom_API"],
+            summary="Get Map Tiles Info",
+            response_model=MapTilesModel,
+            description="Endpoint to describe the tile pyramid of the current map image: tile size, zoom levels,"
+                        " tile format, memory held and generation time. The pyramid is built once per map"
+                        " in a worker process, on the first request.",
+            responses={
+                200: {
+                    "description": "Tile pyramid described successfully",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "generation": 3,
+                                "tile_size": 256,
+                                "max_zoom": 3,
+                                "media_type": "image/jpeg",
+                                "tiles": 85,
+                                "bytes": 1843200,
+                                "build_seconds": 0.412
+                            }
+                        }
+                    }
+                },
+                501: {
+                    "description": "Tiles not available (Pillow is not installed)",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Map tiles require Pillow (pip install pillow)"}
+                        }
+                    }
+                },
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        async def get_map_tiles():
+            """
+            Décrit la pyramide de tuiles de l'image de la carte courante.
 
             :param: None
-            :return: liste d'objets `MapObjectModel`.
-            :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+            :return: `MapTilesModel` de la pyramide.
+            :except: HTTPException(501) si Pillow n'est pas installé; HTTPException(502) si l'image de la
+                carte est injoignable ou illisible; HTTPException(503) si le processus de découpe s'est arrêté.
+            """
+            return await self._get_map_tiles()
+
+        @self.get(
+            path="/map_tiles/{z}/{x}/{y}",
+            tags=["Custom_API"],
+            summary="Get Map Tile",
+            description="Endpoint to retrieve one tile of the map image, so that a zoomed-in client only"
+                        " downloads the tiles in view. Zoom level z covers the map with 2^z x 2^z tiles"
+                        " (x to the east, y to the south); see /map_tiles for the tile size and max zoom."
+                        " Tiles keep their ETag while the map image is unchanged, so If-None-Match returns 304.",
+            responses={
+                200: {
+                    "description": "Tile retrieved successfully",
+                    "content": {
+                        "image/jpeg": {
+                            "example": "<binary image stream>"
+                        },
+                        "image/png": {
+                            "example": "<binary image stream>"
+                        }
+                    }
+                },
+                304: {
+                    "description": "Tile not modified since the version identified by If-None-Match"
+                },
+                404: {
+                    "description": "Tile outside the pyramid",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Unknown tile 4/0/0: zoom ranges over 0-3 and x, y over 0 to 2^zoom - 1"
+                            }
+                        }
+                    }
+                },
+                501: {
+                    "description": "Tiles not available (Pillow is not installed)",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Map tiles require Pillow (pip install pillow)"}
+                        }
+                    }
+                },
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        async def get_map_tile(request: Request, z: int, x: int, y: int):
+            """
+            Renvoie une tuile de l'image de la carte courante.
+
+            :param request: requête HTTP (en-tête `If-None-Match`).
+            :param z: niveau de zoom.
+            :param x: colonne de la tuile.
+            :param y: ligne de la tuile.
+            :return: Response avec la tuile, ou un 304 vide.
+            :except: HTTPException(404) si la tuile n'existe pas; HTTPException(501) si Pillow n'est pas
+                installé; HTTPException(502) si l'image de la carte est injoignable ou illisible;
+                HTTPException(503) si le processus de découpe s'est arrêté.
             """
-            return await self._get_map_objects()
+            return await self._get_map_tile(z, x, y, if_none_match=request.headers.get("if-none-match"))
 
         @self.get(
             path="/map_img",
             tags=["Official_API"],
             summary="Get Map Image",
             description="Endpoint to retrieve the map image from War Thunder (binary image)."
-                        " Add ?as_base64=true to get a JSON base64 string.",
+                        " Add ?as_base64=true to get a JSON base64 string."
+                        " The image is cached per map generation and served with a strong ETag;"
+                        " send If-None-Match to get a 304 when the map did not change. The base64 JSON"
+                        " is gzip/brotli compressed once per map when Accept-Encoding allows it.",
             responses={
                 200: {
                     "description": "Map image retrieved successfully",
@@ -708,6 +1284,9 @@ class App(FastAPI):
                         }
                     }
                 },
+                304: {
+                    "description": "Map image not modified since the version identified by If-None-Match"
+                },
                 502: {
                     "description": "Upstream service unreachable",
                     "content": {
@@ -720,12 +1299,17 @@ class App(FastAPI):
                 }
             }
         )
-        async def get_map_img(as_base64: bool = False):
+        async def get_map_img(request: Request, as_base64: bool = False):
             """
             Récupère l'image de la carte depuis le serveur War Thunder et la renvoie telle quelle.
             Si `as_base64=true` est passé en querystring, renvoie un JSON {"content": "<base64>", "content_type": "..."}.
+            Renvoie 304 si l'en-tête `If-None-Match` correspond à l'image courante.
             """
-            return await self._get_map_img(as_base64=as_base64)
+            return await self._get_map_img(
+                as_base64=as_base64,
+                if_none_match=request.headers.get("if-none-match"),
+                accept_encoding=request.headers.get("accept-encoding")
+            )
 
         @self.get(
             path="/state",
@@ -783,18 +1367,22 @@ class App(FastAPI):
                             }
                         }
                     }
-                }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
             }
         )
-        async def get_state():
+        async def get_state(request: Request, max_stale: Optional[float] = Depends(stale_budget)):
             """
             Récupère l'état du joueur/véhicule depuis le serveur War Thunder.
 
-            :param: None
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
             :return: `StateModel` représentant l'état actuel (contrôles, moteurs, etc.).
-            :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+            :except: HTTPException(502) si l'upstream est injoignable ou répond mal;
+                HTTPException(406) si le format demandé n'est pas disponible.
             """
-            return await self.get_state()
+            return await self._serve(request, WarThunderClient.STATE, max_stale=max_stale)
 
         @self.get(
             path="/gyroscope",
@@ -825,18 +1413,22 @@ class App(FastAPI):
                             }
                         }
                     }
-                }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
             }
         )
-        async def get_gyroscope():
+        async def get_gyroscope(request: Request, max_stale: Optional[float] = Depends(stale_budget)):
             """
             Récupère les données du gyroscope depuis le serveur War Thunder.
 
-            :param: None
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
             :return: `GyroscopeModel` représentant les données du gyroscope.
-            :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+            :except: HTTPException(502) si l'upstream est injoignable ou répond mal;
+                HTTPException(406) si le format demandé n'est pas disponible.
             """
-            return await self._get_gyroscope()
+            return await self._serve(request, TelemetrySnapshot.GYROSCOPE, max_stale=max_stale)
 
         @self.get(
             path="/compass",
@@ -865,18 +1457,22 @@ class App(FastAPI):
                             }
                         }
                     }
-                }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
             }
         )
-        async def get_compass():
+        async def get_compass(request: Request, max_stale: Optional[float] = Depends(stale_budget)):
             """
             Récupère les données de la boussole depuis le serveur War Thunder.
 
-            :param: None
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
             :return: `CompassModel` représentant les données de la boussole.
-            :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+            :except: HTTPException(502) si l'upstream est injoignable ou répond mal;
+                HTTPException(406) si le format demandé n'est pas disponible.
             """
-            return await self._get_compass()
+            return await self._serve(request, TelemetrySnapshot.COMPASS, max_stale=max_stale)
 
         @self.get(
             path="/speed",
@@ -902,18 +1498,22 @@ class App(FastAPI):
                             }
                         }
                     }
-                }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
             }
         )
-        async def get_speed():
+        async def get_speed(request: Request, max_stale: Optional[float] = Depends(stale_budget)):
             """
             Récupère la vitesse actuelle depuis le serveur War Thunder.
 
-            :param: None
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
             :return: float représentant la vitesse actuelle en km/h.
-            :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+            :except: HTTPException(502) si l'upstream est injoignable ou répond mal;
+                HTTPException(406) si le format demandé n'est pas disponible.
             """
-            return await self._get_speed()
+            return await self._serve(request, TelemetrySnapshot.SPEED, max_stale=max_stale)
 
         @self.get(
             path="/altitude",
@@ -939,216 +1539,1235 @@ class App(FastAPI):
                             }
                         }
                     }
-                }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
             }
         )
-        async def get_altitude():
+        async def get_altitude(request: Request, max_stale: Optional[float] = Depends(stale_budget)):
             """
             Récupère l'altitude actuelle depuis le serveur War Thunder.
 
-            :param: None
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
             :return: float représentant l'altitude actuelle en mètres.
-            :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+            :except: HTTPException(502) si l'upstream est injoignable ou répond mal;
+                HTTPException(406) si le format demandé n'est pas disponible.
             """
-            return await self._get_altitude()
-
-    @staticmethod
-    def _status() -> Status:
-        """
-        Endpoint de vérification de l'état de l'API.
-
-        :param: None
-        :return: `Status` contenant les champs `status` (str) et `message` (str).
-        :except: Aucun; opération locale et déterministe.
-        """
-        return Status(status="ok", message="API is running smoothly")
+            return await self._serve(request, TelemetrySnapshot.ALTITUDE, max_stale=max_stale)
 
-    async def _get_indicators(self) -> IndicatorsModel:
-        """
-        Récupère les indicateurs depuis le serveur War Thunder et les valide via Pydantic.
+        @self.get(
+            path="/snapshot",
+            tags=["Custom_API"],
+            summary="Get Telemetry Snapshot",
+            response_model=SnapshotModel,
+            description="Endpoint to retrieve indicators, state, map info and map objects in one"
+                        " time-aligned document, fetched concurrently during the same tick."
+                        " Per-source failures are reported in `sources` instead of failing the response;"
+                        " a failed source whose last good value is within the staleness budget"
+                        " (?max_stale_ms= or `Cache-Control: max-stale`) is served with `stale: true`."
+                        " `Age`/`X-Data-Age-Ms` give the age of the oldest source."
+                        " Add ?fresh=true to force an immediate upstream fetch.",
+            responses={
+                200: {
+                    "description": "Snapshot retrieved successfully",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "seq": 42,
+                                "timestamp": 1700000000.215,
+                                "indicators": {"valid": True, "army": "air", "type": "a-35b", "speed": 56.37},
+                                "state": None,
+                                "map_info": {"map_generation": 1, "valid": True},
+                                "map_objects": [],
+                                "sources": {
+                                    "indicators": {"ok": True, "fetched_at": 1700000000.198, "error": None,
+                                                   "stale": False},
+                                    "state": {"ok": False, "fetched_at": 1700000000.211,
+                                              "error": "Upstream service unreachable: <error details>",
+                                              "stale": False},
+                                    "map_info": {"ok": True, "fetched_at": 1700000000.201, "error": None,
+                                                 "stale": False},
+                                    "map_objects": {"ok": True, "fetched_at": 1700000000.015,
+                                                    "error": "Upstream service unreachable: <error details>",
+                                                    "stale": True}
+                                }
+                            }
+                        }
+                    }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
+            }
+        )
+        async def get_snapshot(
+                request: Request,
+                fresh: bool = False,
+                max_stale: Optional[float] = Depends(stale_budget)
+        ):
+            """
+            Récupère toutes les sources upstream en un seul document cohérent.
 
-        :param: None
-        :return: `IndicatorsModel` avec les indicateurs remontés par l'upstream.
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
-        """
-        try:
-            async with AsyncClient(timeout=5.0) as client:
-                response = await client.get(self.API_WAR_THUNDER_INDICATORS)
-                response.raise_for_status()
-                data = response.json()
-                return IndicatorsModel(**data)
-        except Exception as exc:
-            raise HTTPException(status_code=502, detail=f"Upstream service unreachable: {exc}")
-
-    async def _get_map_info(self) -> MapInfoModel:
-        """
-        Récupère les informations de la carte depuis le serveur War Thunder.
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param fresh: force un tick immédiat au lieu de renvoyer le dernier instantané.
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
+            :return: `SnapshotModel` contenant chaque source et son état de récupération.
+            :except: HTTPException(406) si le format demandé n'est pas disponible;
+                les échecs par source sont rapportés dans `sources`.
+            """
+            return await self._serve(request, TelemetrySnapshot.SNAPSHOT, fresh=fresh, max_stale=max_stale)
 
-        :param: None
-        :return: `MapInfoModel` décrivant la grille et les bornes de la carte.
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        @self.get(
+            path="/history/{field}",
+            tags=["Custom_API"],
+            summary="Get Field History",
+            response_model=HistoryModel,
+            description="Endpoint to retrieve the recent history of a numeric field of /indicators or /state"
+                        " (e.g. `H_m`, `TAS_kmh`, `speed`), downsampled server-side with LTTB to at most"
+                        " `max_points` points. `since` is an epoch timestamp, or a negative number of seconds"
+                        " relative to now (e.g. -1800 for the last 30 minutes).",
+            responses={
+                200: {
+                    "description": "History retrieved successfully",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "field": "H_m",
+                                "source": "state",
+                                "since": 1700000000.0,
+                                "until": 1700001800.0,
+                                "count": 9000,
+                                "timestamps": [1700000000.198, 1700000006.2, 1700001800.0],
+                                "values": [6473.0, 6480.0, 1500.0]
+                            }
+                        }
+                    }
+                },
+                404: {
+                    "description": "Unknown field",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Unknown history field 'foo'"}
+                        }
+                    }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
+            }
+        )
+        async def get_history(
+                request: Request,
+                field: str,
+                since: Optional[float] = None,
+                until: Optional[float] = None,
+                max_points: int = Query(DEFAULT_MAX_POINTS, ge=MIN_POINTS, le=MAX_POINTS)
+        ):
+            """
+            Récupère l'historique sous-échantillonné d'un champ numérique.
+
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param field: nom du champ de `IndicatorsModel` ou `StateModel`.
+            :param since: début de la fenêtre (epoch, ou secondes relatives à maintenant si négatif).
+            :param until: fin de la fenêtre (epoch); maintenant par défaut.
+            :param max_points: nombre maximal de points renvoyés.
+            :return: `HistoryModel` de la fenêtre demandée.
+            :except: HTTPException(404) si le champ est inconnu;
+                HTTPException(406) si le format demandé n'est pas disponible.
+            """
+            return self._negotiated(
+                request, self._get_history(field, since=since, until=until, max_points=max_points)
+            )
+
+        @self.get(
+            path="/players",
+            tags=["Players"],
+            summary="List Players",
+            response_model=list[PlayerModel],
+            description="Endpoint to list the players (War Thunder clients) polled by this backend."
+                        " Each player is served under /players/{name}/...; the unprefixed routes"
+                        " serve the first player.",
+            responses={
+                200: {
+                    "description": "Players listed successfully",
+                    "content": {
+                        "application/json": {
+                            "example": [
+                                {"name": "pilot", "upstream": "http://192.168.1.20:8111", "active": True, "seq": 4210},
+                                {"name": "tanker", "upstream": "http://192.168.1.21:8111", "active": False, "seq": 97}
+                            ]
+                        }
+                    }
+                }
+            }
+        )
+        async def get_players():
+            """
+            Liste les joueurs suivis, dans l'ordre de déclaration.
+
+            :return: liste de `PlayerModel`.
+            """
+            return [player.describe() for player in self.squad]
+
+        @self.get(
+            path="/squad",
+            tags=["Players"],
+            summary="Get Squad View",
+            response_model=SquadModel,
+            description="Endpoint to retrieve a combined view of every player: indicators, vehicle state,"
+                        " position on the map and per-source status. The body is serialized once per"
+                        " combination of player snapshots and shared by all clients.",
+            responses={
+                200: {
+                    "description": "Squad view retrieved successfully",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "players": {
+                                    "pilot": {
+                                        "seq": 4210,
+                                        "timestamp": 1700000000.0,
+                                        "indicators": {"valid": True, "army": "air", "type": "p-51d-5", "speed": 124.5},
+                                        "state": {"valid": True, "H_m": 6474.0, "TAS_kmh": 448.0},
+                                        "position": {"type": "aircraft", "icon": "Player", "x": 0.51, "y": 0.48},
+                                        "sources": {
+                                            "indicators": {"ok": True, "error": None, "fetched_at": 1700000000.0},
+                                            "state": {"ok": True, "error": None, "fetched_at": 1700000000.0},
+                                            "map_info": {"ok": True, "error": None, "fetched_at": 1700000000.0},
+                                            "map_objects": {"ok": True, "error": None, "fetched_at": 1700000000.0}
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
+            }
+        )
+        async def get_squad(request: Request):
+            """
+            Renvoie la vue agrégée de tous les joueurs.
+
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :return: `SquadModel` indexé par nom de joueur.
+            :except: HTTPException(406) si le format demandé n'est pas disponible;
+                les échecs par source sont rapportés dans chaque joueur.
+            """
+            media_type = self._media_type(request)
+            coding = self._coding(request)
+            with serializing():
+                body = await self.squad.body(media_type)
+                if compressible(len(body), coding):
+                    body = await self.squad.body(media_type, coding)
+                else:
+                    coding = None
+            return self._response(body, media_type, coding)
+
+        @self.get(
+            path="/players/{name}/map_img",
+            tags=["Players"],
+            summary="Get Player Map Image",
+            description="Same as /map_img, for the given player.",
+            responses={
+                200: {
+                    "description": "Map image retrieved successfully",
+                    "content": {
+                        "image/*": {
+                            "example": "<binary image stream>"
+                        },
+                        "application/json": {
+                            "example": {"content": "<base64 string>", "content_type": "image/png"}
+                        }
+                    }
+                },
+                304: {
+                    "description": "Map image not modified since the version identified by If-None-Match"
+                },
+                404: UNKNOWN_PLAYER_RESPONSE,
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        async def get_player_map_img(request: Request, name: str, as_base64: bool = False):
+            """
+            Récupère l'image de la carte du jeu d'un joueur (voir `/map_img`).
+
+            :param request: requête HTTP (en-tête `If-None-Match`).
+            :param name: nom du joueur.
+            :param as_base64: renvoie un JSON base64 au lieu de l'image binaire.
+            :return: Response avec l'image, le JSON base64, ou un 304 vide.
+            :except: HTTPException(404) si le joueur est inconnu; HTTPException(502) si l'upstream est injoignable.
+            """
+            return await self._get_map_img(
+                as_base64=as_base64,
+                if_none_match=request.headers.get("if-none-match"),
+                accept_encoding=request.headers.get("accept-encoding"),
+                player=name
+            )
+
+        @self.get(
+            path="/players/{name}/map_render",
+            tags=["Players"],
+            summary="Get Player Rendered Map",
+            description="Same as /map_render, for the given player.",
+            responses={
+                200: {
+                    "description": "Composited map rendered successfully",
+                    "content": {
+                        "image/png": {
+                            "example": "<binary image stream>"
+                        },
+                        "image/webp": {
+                            "example": "<binary image stream>"
+                        }
+                    }
+                },
+                304: {
+                    "description": "Frame not modified since the version identified by If-None-Match"
+                },
+                400: {
+                    "description": "Unknown output format",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Unknown format 'gif'. Available formats: png, webp"}
+                        }
+                    }
+                },
+                404: UNKNOWN_PLAYER_RESPONSE,
+                501: {
+                    "description": "Rendering not available (Pillow is not installed)",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Map rendering requires Pillow (pip install pillow)"}
+                        }
+                    }
+                },
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        async def get_player_map_render(
+                request: Request,
+                name: str,
+                format: str = PNG,
+                size: int = Query(DEFAULT_SIZE, ge=MIN_SIZE, le=MAX_SIZE)
+        ):
+            """
+            Renvoie la carte composée côté serveur d'un joueur (voir `/map_render`).
+
+            :param request: requête HTTP (en-tête `If-None-Match`).
+            :param name: nom du joueur.
+            :param format: format de l'image (`png` ou `webp`).
+            :param size: côté de l'image en pixels.
+            :return: Response avec l'image composée, ou un 304 vide.
+            :except: HTTPException(400) si le format est inconnu; HTTPException(404) si le joueur est inconnu;
+                HTTPException(501) si Pillow n'est pas installé; HTTPException(502) si l'image de la carte
+                est injoignable ou illisible.
+            """
+            return await self._get_map_render(
+                output_format=format,
+                size=size,
+                if_none_match=request.headers.get("if-none-match"),
+                player=name
+            )
+
+        @self.get(
+            path="/players/{name}/map_tiles",
+            tags=["Players"],
+            summary="Get Player Map Tiles Info",
+            response_model=MapTilesModel,
+            description="Same as /map_tiles, for the given player. Players on the same map share one pyramid.",
+            responses={
+                404: UNKNOWN_PLAYER_RESPONSE,
+                501: {
+                    "description": "Tiles not available (Pillow is not installed)",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Map tiles require Pillow (pip install pillow)"}
+                        }
+                    }
+                },
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        async def get_player_map_tiles(name: str):
+            """
+            Décrit la pyramide de tuiles de la carte d'un joueur (voir `/map_tiles`).
+
+            :param name: nom du joueur.
+            :return: `MapTilesModel` de la pyramide.
+            :except: HTTPException(404) si le joueur est inconnu; HTTPException(501) si Pillow n'est pas
+                installé; HTTPException(502) si l'image de la carte est injoignable ou illisible;
+                HTTPException(503) si le processus de découpe s'est arrêté.
+            """
+            return await self._get_map_tiles(player=name)
+
+        @self.get(
+            path="/players/{name}/map_tiles/{z}/{x}/{y}",
+            tags=["Players"],
+            summary="Get Player Map Tile",
+            description="Same as /map_tiles/{z}/{x}/{y}, for the given player.",
+            responses={
+                200: {
+                    "description": "Tile retrieved successfully",
+                    "content": {
+                        "image/jpeg": {
+                            "example": "<binary image stream>"
+                        },
+                        "image/png": {
+                            "example": "<binary image stream>"
+                        }
+                    }
+                },
+                304: {
+                    "description": "Tile not modified since the version identified by If-None-Match"
+                },
+                404: {
+                    "description": "Unknown player, or tile outside the pyramid",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Unknown tile 4/0/0: zoom ranges over 0-3 and x, y over 0 to 2^zoom - 1"
+                            }
+                        }
+                    }
+                },
+                501: {
+                    "description": "Tiles not available (Pillow is not installed)",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Map tiles require Pillow (pip install pillow)"}
+                        }
+                    }
+                },
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        async def get_player_map_tile(request: Request, name: str, z: int, x: int, y: int):
+            """
+            Renvoie une tuile de la carte d'un joueur (voir `/map_tiles/{z}/{x}/{y}`).
+
+            :param request: requête HTTP (en-tête `If-None-Match`).
+            :param name: nom du joueur.
+            :param z: niveau de zoom.
+            :param x: colonne de la tuile.
+            :param y: ligne de la tuile.
+            :return: Response avec la tuile, ou un 304 vide.
+            :except: HTTPException(404) si le joueur ou la tuile est inconnu; HTTPException(501) si Pillow
+                n'est pas installé; HTTPException(502) si l'image de la carte est injoignable ou illisible;
+                HTTPException(503) si le processus de découpe s'est arrêté.
+            """
+            return await self._get_map_tile(z, x, y, if_none_match=request.headers.get("if-none-match"), player=name)
+
+        @self.get(
+            path="/players/{name}/history/{field}",
+            tags=["Players"],
+            summary="Get Player Field History",
+            response_model=HistoryModel,
+            description="Same as /history/{field}, for the given player.",
+            responses={
+                404: {
+                    "description": "Unknown player or field",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Unknown history field 'foo'"}
+                        }
+                    }
+                },
+                406: NOT_ACCEPTABLE_RESPONSE
+            }
+        )
+        async def get_player_history(
+                request: Request,
+                name: str,
+                field: str,
+                since: Optional[float] = None,
+                until: Optional[float] = None,
+                max_points: int = Query(DEFAULT_MAX_POINTS, ge=MIN_POINTS, le=MAX_POINTS)
+        ):
+            """
+            Récupère l'historique sous-échantillonné d'un champ numérique d'un joueur (voir `/history/{field}`).
+
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param name: nom du joueur.
+            :param field: nom du champ de `IndicatorsModel` ou `StateModel`.
+            :param since: début de la fenêtre (epoch, ou secondes relatives à maintenant si négatif).
+            :param until: fin de la fenêtre (epoch); maintenant par défaut.
+            :param max_points: nombre maximal de points renvoyés.
+            :return: `HistoryModel` de la fenêtre demandée.
+            :except: HTTPException(404) si le joueur ou le champ est inconnu;
+                HTTPException(406) si le format demandé n'est pas disponible.
+            """
+            return self._negotiated(
+                request,
+                self._get_history(field, since=since, until=until, max_points=max_points, player=name)
+            )
+
+        @self.get(
+            path="/players/{name}/{document}",
+            tags=["Players"],
+            summary="Get Player Document",
+            description="Same as the unprefixed route of the same name (/state, /indicators, /map_objects,"
+                        " /map_tracks, /snapshot, ...), for the given player. `format` applies to"
+                        " map_objects, the bbox/near/radius/k/side filters to map_objects and"
+                        " map_tracks, and `fresh` to snapshot.",
+            responses={
+                200: {
+                    "description": "Document retrieved successfully",
+                    "content": {
+                        "application/json": {
+                            "example": {"valid": True, "H_m": 6474.0, "TAS_kmh": 448.0}
+                        }
+                    }
+                },
+                400: {
+                    "description": "Invalid map objects format",
+                    "content": {
+                        "application/json": {
+                            "example": {"detail": "Unknown format 'csv'. Available formats: rows, columnar"}
+                        }
+                    }
+                },
+                404: UNKNOWN_PLAYER_RESPONSE,
+                406: NOT_ACCEPTABLE_RESPONSE,
+                502: {
+                    "description": "Upstream service unreachable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Upstream service unreachable: <error details>"
+                            }
+                        }
+                    }
+                }
+            }
+        )
+        async def get_player_document(
+                request: Request,
+                name: str,
+                document: PlayerDocument,
+                format: str = ROWS,
+                fresh: bool = False,
+                query: Optional[MapQuery] = Depends(map_query),
+                max_stale: Optional[float] = Depends(stale_budget)
+        ):
+            """
+            Renvoie un document de télémétrie d'un joueur.
+
+            :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+            :param name: nom du joueur.
+            :param document: document demandé (state, indicators, map_objects, snapshot, ...).
+            :param format: format de map_objects (`rows` ou `columnar`).
+            :param fresh: pour snapshot, force un tick immédiat.
+            :param query: pour map_objects et map_tracks, filtre de voisinage optionnel.
+            :param max_stale: ancienneté maximale (`max_stale_ms` ou `Cache-Control: max-stale`) de la dernière
+                valeur valide servie si l'upstream est en échec (None : `MAX_STALE` de l'application).
+            :return: Response portant le document encodé.
+            :except: HTTPException(400) si le format ou le filtre est invalide; HTTPException(404) si le joueur
+                est inconnu;
+                HTTPException(406) si le format demandé n'est pas disponible;
+                HTTPException(502) si la source du document était en échec lors du tick.
+            """
+            if document is PlayerDocument.MAP_OBJECTS:
+                return await self._get_map_objects(
+                    request, output_format=format, player=name, query=query, max_stale=max_stale
+                )
+            if document is PlayerDocument.MAP_TRACKS:
+                return await self._get_map_tracks(request, player=name, query=query, max_stale=max_stale)
+            return await self._serve(
+                request, document.value, fresh=fresh and document is PlayerDocument.SNAPSHOT, player=name,
+                max_stale=max_stale
+            )
+
+        @self.websocket(path="/ws/telemetry")
+        async def ws_telemetry(
+                websocket: WebSocket,
+                topics: Optional[str] = None,
+                max_rate: float = 5.0,
+                encoding: Optional[str] = None,
+                player: Optional[str] = None
+        ):
+            """
+            Diffuse la télémétrie en continu vers un client WebSocket.
+
+            Le client choisit ses sujets (`topics`, séparés par des virgules parmi
+            indicators, state, gyroscope, compass, map_objects) et son rythme maximal
+            (`max_rate`, en trames par seconde). Seuls les sujets modifiés sont envoyés ;
+            sans changement pendant 15 s, une trame vide `{}` garde la connexion ouverte.
+            Les trames sont des messages texte JSON, ou des messages binaires si `encoding`
+            (ou l'en-tête `Accept`) demande MessagePack ou CBOR.
+
+            :param websocket: connexion WebSocket du client.
+            :param topics: sujets demandés (tous par défaut).
+            :param max_rate: rythme maximal en trames par seconde (5 par défaut).
+            :param encoding: encodage des trames (`json`, `msgpack` ou `cbor`; JSON par défaut).
+            :param player: joueur suivi (voir `/players`; premier joueur par défaut).
+            :return: None
+            :except: Aucun; une demande invalide ferme la connexion avec le code 1008.
+            """
+            await self._stream_websocket(websocket, topics, max_rate, encoding, player)
+
+        @self.get(
+            path="/sse/telemetry",
+            tags=["Stream"],
+            summary="Stream Telemetry (Server-Sent Events)",
+            response_class=StreamingResponse,
+            description="Server-Sent Events stream of telemetry frames. The first frame (event `keyframe`)"
+                        " carries the full value of every topic; following frames (event `delta`) only"
+                        " carry the fields that changed and must be merged into the previous values."
+                        " A keyframe is repeated every `keyframe_interval` seconds.",
+            responses={
+                200: {
+                    "description": "Telemetry stream opened",
+                    "content": {
+                        "text/event-stream": {
+                            "example": "id: 42\nevent: delta\n"
+                                       "data: {\"seq\":42,\"timestamp\":1700000000.0,"
+                                       "\"data\":{\"state\":{\"H_m\":6474.0}},\"errors\":{}}\n\n"
+                        }
+                    }
+                },
+                400: {
+                    "description": "Invalid topics, rate or keyframe interval",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Unknown topic(s): foo. Available topics: indicators, state, ..."
+                            }
+                        }
+                    }
+                },
+                404: UNKNOWN_PLAYER_RESPONSE
+            }
+        )
+        async def sse_telemetry(
+                topics: str = "indicators,state",
+                max_rate: float = 5.0,
+                keyframe_interval: float = 5.0,
+                player: Optional[str] = None
+        ):
+            """
+            Ouvre un flux Server-Sent Events de trames de télémétrie delta.
+
+            :param topics: sujets demandés, séparés par des virgules (indicators et state par défaut).
+            :param max_rate: rythme maximal en trames par seconde (5 par défaut).
+            :param keyframe_interval: intervalle en secondes entre deux keyframes (5 par défaut).
+            :param player: joueur suivi (voir `/players`; premier joueur par défaut).
+            :return: `StreamingResponse` de type text/event-stream.
+            :except: HTTPException(400) si les sujets, le rythme ou l'intervalle sont invalides;
+                HTTPException(404) si le joueur est inconnu.
+            """
+            return self._stream_sse(topics, max_rate, keyframe_interval, player)
+
+    async def _stream_websocket(
+            self,
+            websocket: WebSocket,
+            topics: Optional[str],
+            max_rate: float,
+            encoding: Optional[str] = None,
+            player: Optional[str] = None
+    ) -> None:
+        """
+        Envoie à un client WebSocket les trames de télémétrie modifiées jusqu'à sa déconnexion.
+
+        Les messages du client sont lus en parallèle de l'envoi : sa déconnexion arrête aussitôt
+        l'envoi, même si aucune trame n'est due. Sans changement pendant `WS_KEEPALIVE` secondes,
+        une trame vide (`{}`) est envoyée.
+
+        :param websocket: connexion WebSocket du client.
+        :param topics: sujets demandés, séparés par des virgules (None pour tous).
+        :param max_rate: rythme maximal en trames par seconde.
+        :param encoding: encodage des trames (`json`, `msgpack`, `cbor`); None : négocié via `Accept`.
+        :param player: nom du joueur suivi (joueur par défaut si None).
+        :return: None
+        :except: Aucun; une demande invalide ferme la connexion avec le code 1008.
         """
+        await websocket.accept()
         try:
-            async with AsyncClient(timeout=5.0) as client:
-                response = await client.get(self.API_WAR_THUNDER_MAP_INFO)
-                response.raise_for_status()
-                data = response.json()
-                return MapInfoModel(**data)
-        except Exception as exc:
-            raise HTTPException(status_code=502, detail=f"Upstream service unreachable: {exc}")
-
-    async def _get_map_objects(self) -> list[MapObjectModel]:
+            if player is not None and player not in self.squad.players:
+                raise ValueError(f"Unknown player {player!r}")
+            poller = self.squad.get(player).poller
+            selected = parse_topics(topics)
+            rate = parse_rate(max_rate)
+            if encoding is None:
+                media_type = negotiate(websocket.headers.get("accept"))
+            elif NAMES.get(encoding) in ENCODERS:
+                media_type = NAMES[encoding]
+            else:
+                raise ValueError(f"Unknown or unavailable encoding {encoding!r}. "
+                                 f"Available encodings: {', '.join(n for n, t in NAMES.items() if t in ENCODERS)}")
+        except ValueError as exc:
+            await websocket.close(code=1008, reason=str(exc))
+            return
+
+        async def send() -> None:
+            frames = iter_changes(poller, selected, rate)
+            async with aclosing(iter_keepalive(frames, WS_KEEPALIVE)) as items:
+                async for frame in items:
+                    frame = {} if frame is None else frame
+                    if media_type == JSON:
+                        await websocket.send_json(frame)
+                    else:
+                        await websocket.send_bytes(encode(media_type, frame))
+
+        async def receive() -> None:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        self.metrics.stream_subscribers.inc("websocket")
+        tasks = (asyncio.create_task(send()), asyncio.create_task(receive()))
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.metrics.stream_subscribers.dec("websocket")
+        await asyncio.wait(tasks)
+        for task in tasks:
+            error = None if task.cancelled() else task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+
+    def _stream_sse(
+            self,
+            topics: Optional[str],
+            max_rate: float,
+            keyframe_interval: float,
+            player: Optional[str] = None
+    ) -> StreamingResponse:
         """
-        Récupère la liste des objets présents sur la carte depuis l'upstream.
+        Construit la réponse Server-Sent Events d'un abonné.
 
-        :param: None
-        :return: liste d'objets `MapObjectModel`.
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        :param topics: sujets demandés, séparés par des virgules (None pour tous).
+        :param max_rate: rythme maximal en trames par seconde.
+        :param keyframe_interval: intervalle en secondes entre deux keyframes.
+        :param player: nom du joueur suivi (joueur par défaut si None).
+        :return: `StreamingResponse` de type text/event-stream.
+        :except: HTTPException(400) si les sujets, le rythme ou l'intervalle sont invalides;
+            HTTPException(404) si le joueur est inconnu.
         """
+        poller = self._player(player).poller
         try:
-            async with AsyncClient(timeout=5.0) as client:
-                response = await client.get(self.API_WAR_THUNDER_MAP_OBJ)
-                response.raise_for_status()
-                data = response.json()
-                res: list[MapObjectModel] = []
-                for item in data:
-                    res.append(MapObjectModel(
-                        type=MapObjectType(item.get("type")),
-                        icon=MapObjectIcon(item.get("icon")) if item.get("icon") else None,
-                        icon_bg=MapObjectIconBg(item.get("icon_bg")) if item.get(
-                            "icon_bg") else None,
-                        color_hex=item.get("color"),
-                        color_rgb=item.get("color[]"),
-                        blink=item.get("blink"),
-                        x=item.get("x"),
-                        y=item.get("y"),
-                        dx=item.get("dx"),
-                        dy=item.get("dy"),
-                        sx=item.get("sx"),
-                        sy=item.get("sy"),
-                        ex=item.get("ex"),
-                        ey=item.get("ey")
-                    ))
-                return res
-
-        except Exception as exc:
-            raise HTTPException(status_code=502, detail=f"Upstream service unreachable: {exc}")
-
-    async def _get_map_img(self, as_base64: bool = False):
+            selected = parse_topics(topics)
+            rate = parse_rate(max_rate)
+            if keyframe_interval <= 0:
+                raise ValueError("keyframe_interval must be strictly positive")
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+        return StreamingResponse(
+            track_subscriber(iter_sse(poller, selected, rate, keyframe_interval),
+                             self.metrics.stream_subscribers, "sse"),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    def _player(self, name: Optional[str]) -> Player:
         """
-        Récupère l'image de la carte depuis le serveur War Thunder et la renvoie telle quelle.
-        Si `as_base64=true` est passé en querystring, renvoie un JSON {"content": "<base64>", "content_type": "..."}.
+        Renvoie le joueur demandé par une route `/players/{name}/...`.
 
-        :param as_base64: bool indiquant si la réponse doit être encodée en base64.
-        :return: Response avec le contenu binaire de l'image ou dict avec base64.
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        :param name: nom du joueur (joueur par défaut si None).
+        :return: le `Player` correspondant.
+        :except: HTTPException(404) si aucun joueur ne porte ce nom.
         """
         try:
-            async with AsyncClient(timeout=10.0) as client:
-                resp = await client.get(self.API_WAR_THUNDER_MAP_IMG)
-                resp.raise_for_status()
-                content_type = resp.headers.get("content-type", "application/octet-stream")
-                if as_base64:
-                    b64 = base64.b64encode(resp.content).decode("ascii")
-                    return {"content": b64, "content_type": content_type}
-                return Response(content=resp.content, media_type=content_type)
-        except Exception as exc:
-            raise HTTPException(status_code=502, detail=f"Upstream service unreachable: {exc}")
+            return self.squad.get(name)
+        except KeyError:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown player {name!r}. Available players: {', '.join(self.squad.players)}"
+            )
 
-    async def get_state(self) -> StateModel:
+    @staticmethod
+    def _media_type(request: Request) -> str:
         """
-        Récupère l'état du joueur/véhicule depuis le serveur War Thunder.
+        Négocie le format de la réponse d'après l'en-tête `Accept` de la requête.
 
-        :param: None
-        :return: `StateModel` représentant l'état actuel (contrôles, moteurs, etc.).
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        :param request: requête HTTP.
+        :return: type MIME retenu (JSON par défaut).
+        :except: HTTPException(406) si seuls des formats non installés sont acceptés.
         """
         try:
-            async with AsyncClient(timeout=5.0) as client:
-                response = await client.get(self.API_WAR_THUNDER_STATE)
-                response.raise_for_status()
-                data = response.json()
-                return StateModel(
-                    valid=data.get("valid", False),
-                    aileron=data.get("aileron, %"),
-                    elevator=data.get("elevator, %"),
-                    rudder=data.get("rudder, %"),
-                    flaps=data.get("flaps, %"),
-                    gear=data.get("gear, %"),
-                    airbrake=data.get("airbrake, %"),
-                    H_m=data.get("H, m"),
-                    TAS_kmh=data.get("TAS, km/h"),
-                    IAS_kmh=data.get("IAS, km/h"),
-                    M=data.get("M"),
-                    AoA_deg=data.get("AoA, deg"),
-                    AoS_deg=data.get("AoS, deg"),
-                    Ny=data.get("Ny"),
-                    Vy_ms=data.get("Vy, m/s"),
-                    Wx_deg_s=data.get("Wx, deg/s"),
-                    Mfuel_kg=data.get("Mfuel, kg"),
-                    Mfuel0_kg=data.get("Mfuel0, kg"),
-                    throttle1_percent=data.get("throttle 1, %"),
-                    RPM_throttle1_percent=data.get("RPM throttle 1, %"),
-                    mixture1_percent=data.get("mixture 1, %"),
-                    radiator1_percent=data.get("radiator 1, %"),
-                    compressor_stage1=data.get("compressor stage 1"),
-                    magneto1=data.get("magneto 1"),
-                    power1_hp=data.get("power 1, hp"),
-                    RPM1=data.get("RPM 1"),
-                    manifold_pressure1_atm=data.get("manifold pressure 1, atm"),
-                    oil_temp1_C=data.get("oil temp 1, C"),
-                    pitch1_deg=data.get("pitch 1, deg"),
-                    thrust1_kg=data.get("thrust 1, kgs"),
-                    efficiency1_percent=data.get("efficiency 1, %")
-                )
-        except Exception as exc:
-            raise HTTPException(status_code=502, detail=f"Upstream service unreachable: {exc}")
+            return negotiate(request.headers.get("accept"))
+        except ValueError as exc:
+            raise HTTPException(status_code=406, detail=str(exc))
 
-    async def _get_gyroscope(self) -> GyroscopeModel:
+    async def _serve(
+            self,
+            request: Request,
+            topic: str,
+            fresh: bool = False,
+            player: Optional[str] = None,
+            max_stale: Optional[float] = None
+    ) -> Response:
         """
-        Récupère les données du gyroscope depuis le serveur War Thunder.
+        Sert un document de l'instantané courant, dans le format négocié.
 
-        :param: None
-        :return: `GyroscopeModel` représentant les données du gyroscope.
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        Le corps est encodé une seule fois par instantané et par format, puis partagé par
+        toutes les requêtes du tick; les modèles, déjà validés à l'ingestion, ne repassent
+        pas par la validation du `response_model`. Une source en échec lors du tick est
+        remplacée par sa dernière valeur valide si elle date de moins de `max_stale` secondes.
+
+        :param request: requête HTTP (l'en-tête `Accept` choisit le format de la réponse).
+        :param topic: document parmi `TelemetrySnapshot.DOCUMENTS`.
+        :param fresh: force un tick immédiat (regroupé avec les appels concurrents).
+        :param player: nom du joueur (joueur par défaut si None).
+        :param max_stale: ancienneté maximale acceptée, en secondes (`MAX_STALE` de l'application si None).
+        :return: Response portant le corps encodé et les en-têtes d'ancienneté (voir `_age_headers`).
+        :except: HTTPException(404) si le joueur est inconnu; HTTPException(406) si le format demandé
+            n'est pas disponible; HTTPException(502) si la source du document était en échec lors du tick
+            et que sa dernière valeur valide est trop ancienne.
         """
-        indicators: IndicatorsModel = await self._get_indicators()
-        return GyroscopeModel(
-            pitch=indicators.aviahorizon_roll,
-            roll=indicators.aviahorizon_pitch,
-            yaw=indicators.bank,
-            turn=indicators.turn
-        )
+        poller = self._player(player).poller
+        media_type = self._media_type(request)
+        coding = self._coding(request)
+        snapshot = await self._snapshot(poller, fresh, max_stale)
+        with serializing():
+            content = snapshot.body(topic, media_type)
+            if compressible(len(content), coding):
+                content = snapshot.body(topic, media_type, coding)
+            else:
+                coding = None
+        return self._response(content, media_type, coding, self._age_headers(snapshot, topic))
+
+    async def _snapshot(
+            self,
+            poller: TelemetryPoller,
+            fresh: bool = False,
+            max_stale: Optional[float] = None
+    ) -> TelemetrySnapshot:
+        """
+        Renvoie l'instantané courant d'un poller, dont les sources en échec reprennent leur dernière
+        valeur valide dans la limite de `max_stale`.
+
+        :param poller: poller du joueur.
+        :param fresh: force un tick immédiat (regroupé avec les appels concurrents).
+        :param max_stale: ancienneté maximale acceptée, en secondes (`MAX_STALE` de l'application si None).
+        :return: `TelemetrySnapshot` (ou sa vue `TelemetrySnapshot.within`).
+        :except: Aucun; les erreurs upstream sont portées par l'instantané.
+        """
+        snapshot: TelemetrySnapshot = await (poller.refresh() if fresh else poller.snapshot())
+        return snapshot.within(self.max_stale if max_stale is None else max_stale)
+
+    @staticmethod
+    def _age_headers(snapshot: TelemetrySnapshot, topic: str) -> dict[str, str]:
+        """
+        En-têtes d'ancienneté d'un document : `Age` (secondes), `X-Data-Age-Ms` et `X-Data-Stale`.
 
-    async def _get_compass(self) -> CompassModel:
+        :param snapshot: instantané servi.
+        :param topic: document parmi `TelemetrySnapshot.DOCUMENTS`.
+        :return: en-têtes à ajouter à la réponse (sans âge avant la première récupération).
+        :except: Aucun.
         """
-        Récupère les données de la boussole depuis le serveur War Thunder.
+        headers = {"X-Data-Stale": "true" if snapshot.is_stale(topic) else "false"}
+        age = snapshot.age(topic)
+        if age is not None:
+            headers["Age"] = str(int(age))
+            headers["X-Data-Age-Ms"] = str(round(age * 1000))
+        return headers
+
+    @staticmethod
+    def _coding(request: Request) -> Optional[str]:
+        """
+        Négocie la compression de la réponse d'après l'en-tête `Accept-Encoding` de la requête.
+
+        :param request: requête HTTP.
+        :return: encodage de contenu retenu (`gzip`, `br`), ou None pour une réponse non compressée.
+        :except: Aucun.
+        """
+        return negotiate_coding(request.headers.get("accept-encoding"))
+
+    @staticmethod
+    def _response(
+            content: bytes,
+            media_type: str,
+            coding: Optional[str],
+            extra_headers: Optional[dict[str, str]] = None
+    ) -> Response:
+        """
+        Construit la réponse d'un corps négocié, compressé ou non.
+
+        :param content: corps de la réponse, déjà compressé si `coding` est donné.
+        :param media_type: type MIME négocié.
+        :param coding: encodage de contenu appliqué au corps (None : aucun).
+        :param extra_headers: en-têtes supplémentaires (optionnel).
+        :return: Response portant le corps et les en-têtes `Vary` et `Content-Encoding`.
+        :except: Aucun.
+        """
+        headers = {"Vary": "Accept, Accept-Encoding", **(extra_headers or {})}
+        if coding is not None:
+            headers["Content-Encoding"] = coding
+        return Response(content=content, media_type=media_type, headers=headers)
+
+    def _encoded(
+            self,
+            media_type: str,
+            value,
+            coding: Optional[str] = None,
+            extra_headers: Optional[dict[str, str]] = None
+    ) -> Response:
+        """
+        Encode une valeur de réponse dans le format négocié, puis la compresse si elle est assez grande.
+
+        :param media_type: type MIME négocié.
+        :param value: valeur renvoyée par l'endpoint (modèle, liste ou types natifs).
+        :param coding: encodage de contenu négocié (None : aucun).
+        :param extra_headers: en-têtes supplémentaires (optionnel).
+        :return: Response portant le corps encodé.
+        :except: Aucun.
+        """
+        with serializing():
+            content = encode(media_type, value)
+            if compressible(len(content), coding):
+                content = compress(coding, content)
+            else:
+                coding = None
+        return self._response(content, media_type, coding, extra_headers)
+
+    def _negotiated(self, request: Request, value):
+        """
+        Encode la valeur dans le format et l'encodage de contenu négociés, y compris en JSON non
+        compressé : la réponse porte toujours `Vary: Accept, Accept-Encoding` pour les caches.
+
+        :param request: requête HTTP.
+        :param value: valeur renvoyée par l'endpoint.
+        :return: Response encodée en JSON, MessagePack ou CBOR, compressée si demandé.
+        :except: HTTPException(406) si seuls des formats non installés sont acceptés.
+        """
+        return self._encoded(self._media_type(request), value, self._coding(request))
+
+    def _get_metrics(self) -> PlainTextResponse:
+        """
+        Produit la page texte Prometheus du registre de l'application.
 
         :param: None
-        :return: `CompassModel` représentant les données de la boussole.
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        :return: PlainTextResponse au format d'exposition Prometheus 0.0.4.
+        :except: Aucun.
         """
-        indicators: IndicatorsModel = await self._get_indicators()
-        return CompassModel(heading=indicators.compass)
+        return PlainTextResponse(self.metrics.render(), media_type=Metrics.CONTENT_TYPE)
 
-    async def _get_speed(self) -> float:
+    def _status(self) -> Status:
         """
-        Récupère la vitesse depuis le serveur War Thunder.
+        Endpoint de vérification de l'état de l'API et des disjoncteurs upstream de chaque joueur.
 
         :param: None
-        :return: vitesse en km/h.
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        :return: `Status` : `ok` si tous les disjoncteurs sont fermés, `degraded` sinon.
+        :except: Aucun; opération locale, sans requête upstream.
+        """
+        upstreams = {
+            player.name: {source: breaker.describe() for source, breaker in player.client.breakers.items()}
+            for player in self.squad
+        }
+        failing = [
+            f"{name}/{source}"
+            for name, breakers in upstreams.items()
+            for source, breaker in breakers.items()
+            if breaker.state == CircuitBreaker.OPEN
+        ]
+        if not failing:
+            return Status(status="ok", message="API is running smoothly", upstreams=upstreams)
+        return Status(
+            status="degraded",
+            message=f"Upstream unreachable, failing fast: {', '.join(failing)}",
+            upstreams=upstreams
+        )
+
+    async def _get_map_objects(
+            self,
+            request: Request,
+            output_format: str = ROWS,
+            player: Optional[str] = None,
+            query: Optional[MapQuery] = None,
+            max_stale: Optional[float] = None
+    ) -> Response:
+        """
+        Sert les objets de la carte relevés par le poller, en lignes ou en colonnes.
+
+        Sans filtre, le corps est encodé une seule fois par tick ; avec un filtre, seul le
+        sous-ensemble retenu par l'index spatial de l'instantané est converti et encodé.
+
+        :param request: requête HTTP (l'en-tête `Accept` choisit l'encodage de la réponse).
+        :param output_format: `ROWS` (liste d'objets) ou `COLUMNAR` (une colonne par champ).
+        :param player: nom du joueur (joueur par défaut si None).
+        :param query: filtre de voisinage (optionnel).
+        :param max_stale: ancienneté maximale acceptée, en secondes (`MAX_STALE` de l'application si None).
+        :return: Response portant le corps encodé.
+        :except: HTTPException(400) si le format est inconnu; HTTPException(404) si le joueur est inconnu
+            ou absent de la carte pour `near=player`; HTTPException(406) si l'encodage demandé n'est pas
+            disponible; HTTPException(502) si l'upstream était injoignable lors du dernier tick.
+        """
+        if output_format not in FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown format {output_format!r}. Available formats: {', '.join(FORMATS)}"
+            )
+        if query is None:
+            columnar = output_format == COLUMNAR
+            topic = TelemetrySnapshot.MAP_OBJECTS_COLUMNAR if columnar else WarThunderClient.MAP_OBJECTS
+            return await self._serve(request, topic, player=player, max_stale=max_stale)
+        media_type = self._media_type(request)
+        snapshot = await self._snapshot(self._player(player).poller, max_stale=max_stale)
+        selected = snapshot.map_objects.take(self._select(snapshot, query))
+        return self._encoded(
+            media_type, selected.columnar if output_format == COLUMNAR else selected.rows, self._coding(request),
+            self._age_headers(snapshot, WarThunderClient.MAP_OBJECTS)
+        )
+
+    async def _get_map_tracks(
+            self,
+            request: Request,
+            player: Optional[str] = None,
+            query: Optional[MapQuery] = None,
+            max_stale: Optional[float] = None
+    ) -> Response:
+        """
+        Sert les objets de la carte suivis (identifiant, vitesse et cap), éventuellement filtrés.
+
+        :param request: requête HTTP (l'en-tête `Accept` choisit l'encodage de la réponse).
+        :param player: nom du joueur (joueur par défaut si None).
+        :param query: filtre de voisinage (optionnel).
+        :param max_stale: ancienneté maximale acceptée, en secondes (`MAX_STALE` de l'application si None).
+        :return: Response portant le corps encodé.
+        :except: HTTPException(404) si le joueur est inconnu ou absent de la carte pour `near=player`;
+            HTTPException(406) si l'encodage demandé n'est pas disponible;
+            HTTPException(502) si l'upstream était injoignable lors du dernier tick.
+        """
+        if query is None:
+            return await self._serve(request, TelemetrySnapshot.MAP_TRACKS, player=player, max_stale=max_stale)
+        media_type = self._media_type(request)
+        snapshot = await self._snapshot(self._player(player).poller, max_stale=max_stale)
+        indices = self._select(snapshot, query)
+        rows = snapshot.map_tracks.take(indices).rows if snapshot.map_tracks is not None else []
+        return self._encoded(
+            media_type, rows, self._coding(request), self._age_headers(snapshot, TelemetrySnapshot.MAP_TRACKS)
+        )
+
+    @staticmethod
+    def _select(snapshot: TelemetrySnapshot, query: MapQuery) -> list[int]:
+        """
+        Applique un filtre de voisinage à l'index spatial partagé de l'instantané.
+
+        :param snapshot: instantané servi.
+        :param query: filtre de voisinage.
+        :return: indices des objets retenus.
+        :except: HTTPException(404) si `near=player` alors que le joueur n'est pas sur la carte;
+            HTTPException(502) si les objets de la carte étaient en échec lors de ce tick.
+        """
+        try:
+            return snapshot.spatial_index.query(query)
+        except LookupError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    async def _get_map_img(
+            self,
+            as_base64: bool = False,
+            if_none_match: Optional[str] = None,
+            accept_encoding: Optional[str] = None,
+            player: Optional[str] = None
+    ) -> Response:
         """
-        state: StateModel = await self.get_state()
-        return state.TAS_kmh
+        Renvoie l'image de la carte depuis le cache, téléchargée une fois par génération de carte.
+        Si `as_base64=true` est passé en querystring, renvoie un JSON {"content": "<base64>", "content_type": "..."},
+        envoyé par tranches du tampon base64 mis en cache (aucune copie de l'image par requête), ou
+        compressé une seule fois par génération et par encodage si le client l'accepte (l'image
+        binaire, déjà compressée, est servie telle quelle).
 
-    async def _get_altitude(self) -> float:
+        :param as_base64: bool indiquant si la réponse doit être encodée en base64.
+        :param if_none_match: valeur de l'en-tête `If-None-Match` de la requête (optionnel).
+        :param accept_encoding: valeur de l'en-tête `Accept-Encoding` de la requête (optionnel).
+        :param player: nom du joueur (joueur par défaut si None).
+        :return: Response avec le contenu binaire de l'image, le JSON base64, ou un 304 vide.
+        :except: HTTPException(404) si le joueur est inconnu; HTTPException(502) si l'upstream
+            est injoignable ou répond mal.
         """
-        Récupère l'altitude depuis le serveur War Thunder.
+        selected = self._player(player)
+        snapshot = await selected.poller.snapshot()
+        generation = snapshot.map_info.map_generation if snapshot.map_info is not None else None
+        image = await selected.map_image.get(generation)
+
+        if not as_base64:
+            headers = {"ETag": image.etag, "Cache-Control": "no-cache"}
+            if etag_matches(if_none_match, image.etag):
+                return Response(status_code=304, headers=headers)
+            return Response(content=image.content, media_type=image.content_type, headers=headers)
+
+        coding = negotiate_coding(accept_encoding)
+        if not compressible(image.base64_length, coding):
+            coding = None
+        etag = variant_etag(image.base64_etag, coding)
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        if coding is not None:
+            headers["Content-Encoding"] = coding
+            content = await selected.map_image.base64_body(image, coding)
+            return Response(content=content, media_type="application/json", headers=headers)
+        headers["Content-Length"] = str(image.base64_length)
+        return StreamingResponse(image.base64_stream(), media_type="application/json", headers=headers)
+
+    async def _get_map_render(
+            self,
+            output_format: str = PNG,
+            size: int = DEFAULT_SIZE,
+            if_none_match: Optional[str] = None,
+            player: Optional[str] = None
+    ) -> Response:
+        """
+        Renvoie la carte composée (image, grille, aérodromes et objets) du dernier tick.
+
+        L'image est rendue au plus une fois par tick, format et taille, dans un thread de travail,
+        et réutilisée (même ETag) tant que la scène ne change pas. Si les objets de la carte sont
+        en échec, seules l'image et la grille sont dessinées.
+
+        :param output_format: `png` ou `webp`.
+        :param size: côté de l'image en pixels (arrondi au multiple de 64 le plus proche).
+        :param if_none_match: valeur de l'en-tête `If-None-Match` de la requête (optionnel).
+        :param player: nom du joueur (joueur par défaut si None).
+        :return: Response avec l'image composée, ou un 304 vide.
+        :except: HTTPException(400) si le format est inconnu; HTTPException(404) si le joueur est inconnu;
+            HTTPException(501) si Pillow n'est pas installé; HTTPException(502) si l'image de la carte
+            est injoignable ou illisible.
+        """
+        if output_format not in MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown format {output_format!r}. Available formats: {', '.join(MEDIA_TYPES)}"
+            )
+        selected = self._player(player)
+        snapshot = await selected.poller.snapshot()
+        generation = snapshot.map_info.map_generation if snapshot.map_info is not None else None
+        image = await selected.map_image.get(generation)
+        objects = None if WarThunderClient.MAP_OBJECTS in snapshot.errors else snapshot.map_objects
+        frame = await selected.renderer.render(
+            snapshot.seq, image, snapshot.map_info, objects, snap_size(size), output_format
+        )
+
+        headers = {"ETag": frame.etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, frame.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=frame.content, media_type=frame.media_type, headers=headers)
+
+    async def _pyramid(self, player: Optional[str] = None) -> TilePyramid:
+        """
+        Renvoie la pyramide de tuiles de l'image de carte courante d'un joueur.
+
+        :param player: nom du joueur (joueur par défaut si None).
+        :return: `TilePyramid` de l'image courante.
+        :except: HTTPException(404) si le joueur est inconnu; HTTPException(501) si Pillow n'est pas
+            installé; HTTPException(502) si l'image de la carte est injoignable ou illisible;
+            HTTPException(503) si le processus de découpe s'est arrêté.
+        """
+        selected = self._player(player)
+        snapshot = await selected.poller.snapshot()
+        generation = snapshot.map_info.map_generation if snapshot.map_info is not None else None
+        image = await selected.map_image.get(generation)
+        return await self.tiles.get(image)
+
+    async def _get_map_tiles(self, player: Optional[str] = None) -> MapTilesModel:
+        """
+        Décrit la pyramide de tuiles de la carte courante (taille, niveaux, mémoire, durée de génération).
+
+        :param player: nom du joueur (joueur par défaut si None).
+        :return: `MapTilesModel` de la pyramide.
+        :except: HTTPException(404) si le joueur est inconnu; HTTPException(501) si Pillow n'est pas
+            installé; HTTPException(502) si l'image de la carte est injoignable ou illisible;
+            HTTPException(503) si le processus de découpe s'est arrêté.
+        """
+        return (await self._pyramid(player)).describe()
+
+    async def _get_map_tile(
+            self,
+            z: int,
+            x: int,
+            y: int,
+            if_none_match: Optional[str] = None,
+            player: Optional[str] = None
+    ) -> Response:
+        """
+        Renvoie une tuile de la carte courante, découpée une fois par image dans le pool de processus.
+
+        :param z: niveau de zoom.
+        :param x: colonne de la tuile.
+        :param y: ligne de la tuile.
+        :param if_none_match: valeur de l'en-tête `If-None-Match` de la requête (optionnel).
+        :param player: nom du joueur (joueur par défaut si None).
+        :return: Response avec la tuile, ou un 304 vide.
+        :except: HTTPException(404) si le joueur ou la tuile est inconnu; HTTPException(501) si Pillow
+            n'est pas installé; HTTPException(502) si l'image de la carte est injoignable ou illisible;
+            HTTPException(503) si le processus de découpe s'est arrêté.
+        """
+        pyramid = await self._pyramid(player)
+        content = pyramid.tile(z, x, y)
+        etag = pyramid.etag(z, x, y)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=content, media_type=pyramid.media_type, headers=headers)
+
+    async def get_state(self) -> StateModel:
+        """
+        Renvoie le dernier état du joueur/véhicule relevé par le poller.
 
         :param: None
-        :return: altitude en mètres.
-        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        :return: `StateModel` représentant l'état actuel (contrôles, moteurs, etc.).
+        :except: HTTPException(502) si l'upstream était injoignable lors du dernier tick.
         """
-        state: StateModel = await self.get_state()
-        return state.H_m
+        return await self.poller.get(WarThunderClient.STATE)
+
+    def _get_history(
+            self,
+            field: str,
+            since: Optional[float] = None,
+            until: Optional[float] = None,
+            max_points: int = DEFAULT_MAX_POINTS,
+            player: Optional[str] = None
+    ) -> HistoryModel:
+        """
+        Lit la fenêtre demandée dans l'historique en mémoire et la sous-échantillonne.
+
+        :param field: nom du champ.
+        :param since: début de la fenêtre (epoch, ou relatif à maintenant si négatif).
+        :param until: fin de la fenêtre (epoch).
+        :param max_points: nombre maximal de points renvoyés.
+        :param player: nom du joueur (joueur par défaut si None).
+        :return: `HistoryModel` de la fenêtre.
+        :except: HTTPException(404) si le joueur ou le champ est inconnu.
+        """
+        history = self._player(player).history
+        if field not in history.sources:
+            raise HTTPException(status_code=404, detail=f"Unknown history field {field!r}")
+        return history.query(field, since=since, until=until, max_points=max_points)
+
@@ -0,0 +1,196 @@
+"""
+Disjoncteur (circuit breaker) par source upstream, pour un jeu fermé ou injoignable.
+
+Sans disjoncteur, chaque requête vers un jeu fermé attend le timeout complet de sa source
+(5 s, 10 s pour l'image de la carte) avant d'échouer, et les widgets qui interrogent le
+backend en boucle accumulent des requêtes en attente. Après `threshold` échecs réseau
+consécutifs, le disjoncteur s'ouvre : les appels échouent immédiatement avec la dernière
+erreur relevée, pendant que `WarThunderClient` sonde la source en tâche de fond (intervalle
+doublé à chaque échec, jusqu'à `max_backoff`) et referme le disjoncteur dès qu'elle répond.
+
+Seuls les échecs de transport (connexion refusée, timeout...) comptent : un statut HTTP en
+erreur prouve que le jeu répond, et vite.
+"""
+
+import time
+from typing import Optional
+
+from .schemas import CircuitBreakerModel
+
+#: Nombre d'échecs réseau consécutifs qui ouvrent le disjoncteur.
+DEFAULT_THRESHOLD: int = 3
+
+#: Délai (secondes) avant la première sonde, puis délai maximal entre deux sondes.
+DEFAULT_BACKOFF: float = 1.0
+DEFAULT_MAX_BACKOFF: float = 10.0
+
+
+class CircuitOpenError(Exception):
+    """
+    Levée à la place d'une requête upstream tant que le disjoncteur de sa source est ouvert.
+
+    :param source: nom de la source upstream.
+    :type source: str
+    :param error: dernière erreur relevée sur la source.
+    :type error: str
+    :param retry_in: délai (secondes) avant la prochaine sonde.
+    :type retry_in: float
+    :return: instance de CircuitOpenError
+    :except: Aucun
+    """
+
+    def __init__(self, source: str, error: str, retry_in: float):
+        super().__init__(f"{error} (circuit open, next probe in {retry_in:.1f} s)")
+        self.source = source
+        self.error = error
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'une source upstream : fermé (requêtes normales) ou ouvert (échec immédiat).
+
+    :param source: nom de la source upstream.
+    :type source: str
+    :param threshold: nombre d'échecs réseau consécutifs qui ouvrent le disjoncteur.
+    :type threshold: int
+    :param backoff: délai (secondes) avant la première sonde une fois ouvert.
+    :type backoff: float
+    :param max_backoff: délai maximal (secondes) entre deux sondes.
+    :type max_backoff: float
+    :return: instance de CircuitBreaker
+    :except: ValueError si `threshold` < 1, si `backoff` n'est pas strictement positif ou si
+             `max_backoff` est inférieur à `backoff`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(
+            self,
+            source: str,
+            threshold: int = DEFAULT_THRESHOLD,
+            backoff: float = DEFAULT_BACKOFF,
+            max_backoff: float = DEFAULT_MAX_BACKOFF
+    ):
+        if threshold < 1:
+            raise ValueError(f"Circuit breaker threshold must be at least 1, got {threshold}")
+        if backoff <= 0 or max_backoff < backoff:
+            raise ValueError(
+                f"Circuit breaker backoff must satisfy 0 < backoff <= max_backoff, got {backoff} and {max_backoff}"
+            )
+        self.source = source
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.opened_at: Optional[float] = None
+        self._delay = backoff
+        self._next_probe = 0.0
+
+    @property
+    def open(self) -> bool:
+        """
+        Indique si le disjoncteur est ouvert.
+
+        :param: None
+        :return: True si les appels échouent immédiatement.
+        :except: Aucun.
+        """
+        return self.opened_at is not None
+
+    @property
+    def state(self) -> str:
+        """
+        État du disjoncteur.
+
+        :param: None
+        :return: `CLOSED` ou `OPEN`.
+        :except: Aucun.
+        """
+        return self.OPEN if self.open else self.CLOSED
+
+    @property
+    def retry_in(self) -> float:
+        """
+        Délai avant la prochaine sonde.
+
+        :param: None
+        :return: délai en secondes (0 si le disjoncteur est fermé ou la sonde due).
+        :except: Aucun.
+        """
+        if not self.open:
+            return 0.0
+        return max(0.0, self._next_probe - time.monotonic())
+
+    def check(self) -> None:
+        """
+        Autorise un appel upstream, ou échoue immédiatement si le disjoncteur est ouvert.
+
+        :param: None
+        :return: None
+        :except: CircuitOpenError si le disjoncteur est ouvert.
+        """
+        if self.open:
+            raise CircuitOpenError(self.source, self.last_error or "Upstream unreachable", self.retry_in)
+
+    def success(self) -> bool:
+        """
+        Enregistre une réponse de la source : remet à zéro les échecs et referme le disjoncteur.
+
+        :param: None
+        :return: True si le disjoncteur vient de se refermer.
+        :except: Aucun.
+        """
+        closed = self.open
+        self.failures = 0
+        self.opened_at = None
+        self._delay = self.backoff
+        return closed
+
+    def failure(self, error: str) -> bool:
+        """
+        Enregistre un échec réseau, et ouvre le disjoncteur au `threshold`-ième échec consécutif.
+
+        :param error: message de l'erreur, renvoyé tel quel par les appels refusés.
+        :return: True si le disjoncteur vient de s'ouvrir.
+        :except: Aucun.
+        """
+        self.failures += 1
+        self.last_error = error
+        if self.open or self.failures < self.threshold:
+            return False
+        self.opened_at = time.time()
+        self._delay = self.backoff
+        self._next_probe = time.monotonic() + self._delay
+        return True
+
+    def probe_failed(self, error: str) -> None:
+        """
+        Enregistre l'échec d'une sonde et double le délai avant la suivante (jusqu'à `max_backoff`).
+
+        :param error: message de l'erreur de la sonde.
+        :return: None
+        :except: Aucun.
+        """
+        self.failures += 1
+        self.last_error = error
+        self._delay = min(self._delay * 2, self.max_backoff)
+        self._next_probe = time.monotonic() + self._delay
+
+    def describe(self) -> CircuitBreakerModel:
+        """
+        Décrit le disjoncteur pour la route `/status`.
+
+        :param: None
+        :return: `CircuitBreakerModel` du disjoncteur.
+        :except: Aucun.
+        """
+        return CircuitBreakerModel(
+            state=self.state,
+            failures=self.failures,
+            last_error=self.last_error,
+            opened_at=self.opened_at,
+            next_probe_in=self.retry_in if self.open else None
+        )
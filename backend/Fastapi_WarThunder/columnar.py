@@ -0,0 +1,297 @@
+"""
+Représentation en colonnes des objets de la carte War Thunder (/map_obj.json).
+
+Les coordonnées et vecteurs sont stockés dans des tableaux contigus (`array('d')`, NaN si
+absent) et les colonnes énumérées sont encodées par dictionnaire (codes entiers, -1 si absent).
+Une trame est ainsi analysée en une seule passe, sans créer de modèle Pydantic par objet ;
+les lignes (au format de `MapObjectModel`) ne sont reconstruites qu'à la demande.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Optional
+
+from pydantic_core import from_json
+
+from .schemas import MapObjectIcon, MapObjectIconBg, MapObjectType
+
+#: Colonnes numériques : clé upstream -> champ de `MapObjectModel`.
+FLOAT_FIELDS: tuple[str, ...] = ("x", "y", "dx", "dy", "sx", "sy", "ex", "ey")
+
+#: Dictionnaires fixes des colonnes énumérées (le code d'une valeur est son index).
+TYPES: tuple[str, ...] = tuple(item.value for item in MapObjectType)
+ICONS: tuple[str, ...] = tuple(item.value for item in MapObjectIcon)
+ICON_BGS: tuple[str, ...] = tuple(item.value for item in MapObjectIconBg)
+
+_TYPE_CODES = {value: code for code, value in enumerate(TYPES)}
+_ICON_CODES = {value: code for code, value in enumerate(ICONS)}
+_ICON_BG_CODES = {value: code for code, value in enumerate(ICON_BGS)}
+
+#: Formats de sortie de /map_objects : une entrée par objet, ou une colonne par champ.
+ROWS: str = "rows"
+COLUMNAR: str = "columnar"
+FORMATS: tuple[str, ...] = (ROWS, COLUMNAR)
+
+#: Code d'une valeur absente dans une colonne encodée par dictionnaire.
+MISSING: int = -1
+
+
+def _enum_code(codes: dict[str, int], value: Any, enum: type) -> int:
+    """
+    Encode une valeur énumérée optionnelle (une valeur vide vaut `MISSING`).
+
+    :param codes: dictionnaire valeur -> code.
+    :param value: valeur brute de l'upstream.
+    :param enum: énumération de référence, pour le message d'erreur.
+    :return: code entier de la valeur.
+    :except: ValueError si la valeur n'appartient pas à l'énumération.
+    """
+    if not value:
+        return MISSING
+    try:
+        return codes[value]
+    except (KeyError, TypeError):
+        raise ValueError(f"{value!r} is not a valid {enum.__name__}") from None
+
+
+def _nullable(values: array, missing: Any) -> list:
+    """
+    Convertit une colonne en liste JSON, la valeur sentinelle devenant null.
+
+    :param values: colonne contiguë.
+    :param missing: valeur sentinelle (`MISSING`, ou None pour tester NaN).
+    :return: liste de valeurs ou None.
+    :except: Aucun.
+    """
+    if missing is None:
+        return [None if value != value else value for value in values]
+    return [None if value == missing else value for value in values]
+
+
+@dataclass(frozen=True)
+class MapObjectColumns:
+    """
+    Objets de la carte stockés colonne par colonne.
+
+    :param count: nombre d'objets.
+    :type count: int
+    :param type: codes dans `TYPES`.
+    :type type: array
+    :param icon: codes dans `ICONS` (`MISSING` si absent).
+    :type icon: array
+    :param icon_bg: codes dans `ICON_BGS` (`MISSING` si absent).
+    :type icon_bg: array
+    :param color: codes dans `colors` (`MISSING` si absent).
+    :type color: array
+    :param colors: dictionnaire des couleurs de la trame, tuples (hexadécimal, [r, g, b]).
+    :type colors: tuple[tuple[Optional[str], Optional[tuple[int, ...]]], ...]
+    :param blink: indicateur clignotant (`MISSING` si absent).
+    :type blink: array
+    :param floats: colonnes numériques de `FLOAT_FIELDS` (NaN si absent).
+    :type floats: dict[str, array]
+    :return: instance de MapObjectColumns
+    :except: Aucun
+    """
+
+    count: int
+    type: array
+    icon: array
+    icon_bg: array
+    color: array
+    colors: tuple[tuple[Optional[str], Optional[tuple[int, ...]]], ...]
+    blink: array
+    floats: dict[str, array]
+
+    @classmethod
+    def from_items(cls, items: list[dict[str, Any]]) -> "MapObjectColumns":
+        """
+        Construit les colonnes à partir de la liste JSON décodée de /map_obj.json.
+
+        :param items: objets au format de l'upstream.
+        :return: `MapObjectColumns` de la trame.
+        :except: ValueError/TypeError/KeyError si un objet est invalide.
+        """
+        type_codes = array("b")
+        icon_codes = array("b")
+        icon_bg_codes = array("b")
+        color_codes = array("h")
+        blink = array("h")
+        floats = {name: array("d") for name in FLOAT_FIELDS}
+        float_columns = tuple((name, floats[name].append) for name in FLOAT_FIELDS)
+        color_index: dict[tuple, int] = {}
+        nan = math.nan
+
+        for item in items:
+            get = item.get
+            kind = get("type")
+            if kind not in _TYPE_CODES:
+                raise ValueError(f"{kind!r} is not a valid {MapObjectType.__name__}")
+            type_codes.append(_TYPE_CODES[kind])
+            icon_codes.append(_enum_code(_ICON_CODES, get("icon"), MapObjectIcon))
+            icon_bg_codes.append(_enum_code(_ICON_BG_CODES, get("icon_bg"), MapObjectIconBg))
+
+            color_hex, color_rgb = get("color"), get("color[]")
+            if color_hex is None and color_rgb is None:
+                color_codes.append(MISSING)
+            else:
+                key = (color_hex, tuple(color_rgb) if color_rgb is not None else None)
+                code = color_index.get(key)
+                if code is None:
+                    code = color_index[key] = len(color_index)
+                color_codes.append(code)
+
+            value = get("blink")
+            blink.append(MISSING if value is None else value)
+            for name, append in float_columns:
+                value = get(name)
+                append(nan if value is None else value)
+
+        return cls(
+            count=len(type_codes),
+            type=type_codes,
+            icon=icon_codes,
+            icon_bg=icon_bg_codes,
+            color=color_codes,
+            colors=tuple(color_index),
+            blink=blink,
+            floats=floats
+        )
+
+    @classmethod
+    def from_json(cls, content: bytes) -> "MapObjectColumns":
+        """
+        Décode une réponse /map_obj.json brute et la convertit en colonnes.
+
+        :param content: corps brut de la réponse upstream.
+        :return: `MapObjectColumns` de la trame.
+        :except: ValueError si le JSON ou un objet est invalide.
+        """
+        return cls.from_items(from_json(content))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @cached_property
+    def positions(self) -> tuple[array, array]:
+        """
+        Position de chaque objet : `(x, y)`, ou le milieu de `(sx, sy)`-`(ex, ey)` pour un aérodrome.
+
+        :param: None
+        :return: tuple de colonnes (x, y), NaN si l'objet n'a pas de position.
+        :except: Aucun.
+        """
+        floats = self.floats
+        xs, ys = array("d", floats["x"]), array("d", floats["y"])
+        sx, sy, ex, ey = floats["sx"], floats["sy"], floats["ex"], floats["ey"]
+        for i in range(self.count):
+            if xs[i] != xs[i] or ys[i] != ys[i]:
+                xs[i], ys[i] = (sx[i] + ex[i]) / 2, (sy[i] + ey[i]) / 2
+        return xs, ys
+
+    def take(self, indices: list[int]) -> "MapObjectColumns":
+        """
+        Extrait un sous-ensemble des objets, dans l'ordre des indices donnés.
+
+        :param indices: indices des objets conservés.
+        :return: `MapObjectColumns` du sous-ensemble (mêmes dictionnaires de couleurs).
+        :except: IndexError si un indice est hors bornes.
+        """
+        def pick(values: array) -> array:
+            return array(values.typecode, [values[i] for i in indices])
+
+        return MapObjectColumns(
+            count=len(indices),
+            type=pick(self.type),
+            icon=pick(self.icon),
+            icon_bg=pick(self.icon_bg),
+            color=pick(self.color),
+            colors=self.colors,
+            blink=pick(self.blink),
+            floats={name: pick(values) for name, values in self.floats.items()}
+        )
+
+    @cached_property
+    def columnar(self) -> dict[str, Any]:
+        """
+        Forme JSON en colonnes : dictionnaires des colonnes encodées puis colonnes.
+
+        :param: None
+        :return: dict `{"count", "dictionaries", "columns"}` sérialisable en JSON.
+        :except: Aucun.
+        """
+        columns: dict[str, Any] = {
+            "type": self.type.tolist(),
+            "icon": _nullable(self.icon, MISSING),
+            "icon_bg": _nullable(self.icon_bg, MISSING),
+            "color": _nullable(self.color, MISSING),
+            "blink": _nullable(self.blink, MISSING),
+        }
+        for name, values in self.floats.items():
+            columns[name] = _nullable(values, None)
+        return {
+            "count": self.count,
+            "dictionaries": {
+                "type": list(TYPES),
+                "icon": list(ICONS),
+                "icon_bg": list(ICON_BGS),
+                "color": [
+                    {"hex": color_hex, "rgb": list(color_rgb) if color_rgb is not None else None}
+                    for color_hex, color_rgb in self.colors
+                ],
+            },
+            "columns": columns,
+        }
+
+    @cached_property
+    def rows(self) -> list[dict[str, Any]]:
+        """
+        Forme JSON ligne par ligne, identique à `MapObjectModel.model_dump(mode="json")`.
+
+        :param: None
+        :return: liste de dicts, un par objet.
+        :except: Aucun.
+        """
+        colors = self.colors
+        no_color = (None, None)
+        floats = [_nullable(self.floats[name], None) for name in FLOAT_FIELDS]
+        rows = []
+        for i in range(self.count):
+            icon, icon_bg, color, blink = self.icon[i], self.icon_bg[i], self.color[i], self.blink[i]
+            color_hex, color_rgb = colors[color] if color != MISSING else no_color
+            row = {
+                "type": TYPES[self.type[i]],
+                "icon": ICONS[icon] if icon != MISSING else None,
+                "icon_bg": ICON_BGS[icon_bg] if icon_bg != MISSING else None,
+                "color_hex": color_hex,
+                "color_rgb": list(color_rgb) if color_rgb is not None else None,
+                "blink": blink if blink != MISSING else None,
+            }
+            for name, values in zip(FLOAT_FIELDS, floats):
+                row[name] = values[i]
+            rows.append(row)
+        return rows
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Expose les colonnes sous forme de tableaux NumPy, sans copie.
+
+        :param: None
+        :return: dict colonne -> `numpy.ndarray` (vues sur les tableaux contigus).
+        :except: ImportError si NumPy n'est pas installé.
+        """
+        import numpy
+
+        columns = {
+            "type": self.type,
+            "icon": self.icon,
+            "icon_bg": self.icon_bg,
+            "color": self.color,
+            "blink": self.blink,
+            **self.floats,
+        }
+        return {
+            name: numpy.frombuffer(values, dtype=numpy.dtype(values.typecode))
+            for name, values in columns.items()
+        }
@@ -0,0 +1,152 @@
+"""
+Compression des réponses HTTP : gzip et brotli, négociés via l'en-tête `Accept-Encoding`.
+
+Seuls les corps d'au moins `MIN_SIZE` octets sont compressés : en dessous, l'en-tête
+`Content-Encoding` et le coût CPU dépassent le gain. brotli (`brotli`) est une dépendance
+optionnelle : il n'est proposé que si sa bibliothèque est installée.
+
+Les niveaux sont volontairement rapides : les corps servis (JSON, base64 d'images déjà
+compressées) gagnent peu aux niveaux élevés, qui coûtent jusqu'à vingt fois plus de CPU.
+"""
+
+import zlib
+from typing import Callable, Iterable, Optional, Union
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+#: Taille minimale (octets) d'un corps compressé.
+MIN_SIZE: int = 1024
+
+#: Niveaux de compression gzip (1-9) et brotli (0-11).
+GZIP_LEVEL: int = 5
+BROTLI_QUALITY: int = 4
+
+
+#: Morceau de corps accepté par les compresseurs (un `memoryview` évite de copier une tranche).
+Chunk = Union[bytes, memoryview]
+
+
+def _gzip(chunks: Iterable[Chunk]) -> bytes:
+    """
+    Compresse en gzip, morceau par morceau (en-tête sans horodatage : deux compressions du même
+    corps sont identiques).
+
+    :param chunks: morceaux successifs du corps.
+    :return: corps compressé.
+    :except: Aucun.
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    parts = [compressor.compress(chunk) for chunk in chunks]
+    parts.append(compressor.flush())
+    return b"".join(parts)
+
+
+def _brotli(chunks: Iterable[Chunk]) -> bytes:
+    """
+    Compresse en brotli, morceau par morceau.
+
+    :param chunks: morceaux successifs du corps.
+    :return: corps compressé.
+    :except: Aucun.
+    """
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    parts = [compressor.process(chunk) for chunk in chunks]
+    parts.append(compressor.finish())
+    return b"".join(parts)
+
+
+#: Compresseurs disponibles, par ordre de préférence du serveur à facteur `q` égal.
+COMPRESSORS: dict[str, Callable[[Iterable[Chunk]], bytes]] = {}
+if brotli is not None:
+    COMPRESSORS[BROTLI] = _brotli
+COMPRESSORS[GZIP] = _gzip
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Choisit l'encodage de contenu d'une réponse d'après un en-tête `Accept-Encoding`.
+
+    L'encodage de plus grand facteur `q` l'emporte ; à égalité, brotli passe avant gzip.
+    `*` désigne tout encodage disponible que l'en-tête ne cite pas explicitement.
+
+    :param accept_encoding: valeur de l'en-tête `Accept-Encoding` (None si absent).
+    :return: encodage présent dans `COMPRESSORS`, ou None pour une réponse non compressée.
+    :except: Aucun.
+    """
+    if not accept_encoding:
+        return None
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in COMPRESSORS:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compressible(size: int, coding: Optional[str]) -> bool:
+    """
+    Indique si un corps doit être compressé avec l'encodage négocié.
+
+    :param size: taille du corps non compressé, en octets.
+    :param coding: encodage négocié (None : aucun).
+    :return: True si un encodage est négocié et si le corps atteint `MIN_SIZE`.
+    :except: Aucun.
+    """
+    return coding is not None and size >= MIN_SIZE
+
+
+def compress(coding: str, content: bytes) -> bytes:
+    """
+    Compresse un corps de réponse.
+
+    :param coding: encodage renvoyé par `negotiate`.
+    :param content: corps non compressé.
+    :return: corps compressé.
+    :except: KeyError si l'encodage n'est pas disponible.
+    """
+    return COMPRESSORS[coding]((content,))
+
+
+def compress_chunks(coding: str, chunks: Iterable[Chunk]) -> bytes:
+    """
+    Compresse un corps fourni par morceaux, sans jamais le reconstituer en entier.
+
+    :param coding: encodage renvoyé par `negotiate`.
+    :param chunks: morceaux successifs du corps non compressé.
+    :return: corps compressé.
+    :except: KeyError si l'encodage n'est pas disponible.
+    """
+    return COMPRESSORS[coding](chunks)
+
+
+def variant_etag(etag: str, coding: Optional[str]) -> str:
+    """
+    ETag fort d'une variante compressée : chaque encodage est une représentation distincte.
+
+    :param etag: ETag (entre guillemets) du corps non compressé.
+    :param coding: encodage appliqué (None : aucun).
+    :return: ETag de la variante.
+    :except: Aucun.
+    """
+    if coding is None:
+        return etag
+    return f'{etag[:-1]}-{coding}"'
@@ -0,0 +1,136 @@
+"""
+Négociation du format des réponses de télémétrie : JSON (par défaut), MessagePack ou CBOR.
+
+Le client choisit le format via l'en-tête `Accept` (ex: `Accept: application/msgpack`).
+MessagePack (`msgpack`) et CBOR (`cbor2`) sont des dépendances optionnelles : un format
+binaire n'est proposé que si sa bibliothèque est installée. JSON est encodé par `orjson`
+s'il est installé, par le module `json` standard sinon.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+
+#: Types MIME binaires reconnus, installés ou non.
+BINARY_MEDIA_TYPES: tuple[str, ...] = (MSGPACK, CBOR)
+
+#: Autres noms courants des types reconnus.
+ALIASES: dict[str, str] = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+#: Noms courts des formats (paramètre `encoding` des flux WebSocket).
+NAMES: dict[str, str] = {"json": JSON, "msgpack": MSGPACK, "cbor": CBOR}
+
+_WILDCARDS = ("*/*", "application/*")
+
+
+def _dumps_json(value: Any) -> bytes:
+    """
+    Encode une valeur en JSON compact (UTF-8) avec le module standard.
+
+    :param value: valeur composée de types natifs.
+    :return: octets JSON.
+    :except: TypeError si la valeur n'est pas sérialisable.
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+#: Encodeurs disponibles, par type MIME.
+ENCODERS: dict[str, Callable[[Any], bytes]] = {JSON: orjson.dumps if orjson is not None else _dumps_json}
+if msgpack is not None:
+    ENCODERS[MSGPACK] = msgpack.packb
+if cbor2 is not None:
+    ENCODERS[CBOR] = cbor2.dumps
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Choisit le type MIME de la réponse d'après un en-tête `Accept`.
+
+    Le type de plus grand facteur `q` l'emporte ; à égalité, un type explicite passe avant
+    un joker (`*/*`, `application/*`), qui désigne JSON. Un en-tête absent ou ne citant
+    aucun type connu conserve le comportement historique (JSON).
+
+    :param accept: valeur de l'en-tête `Accept` (None si absent).
+    :return: type MIME présent dans `ENCODERS`.
+    :except: ValueError si seuls des formats binaires non installés sont acceptés.
+    """
+    if not accept:
+        return JSON
+    best, best_rank = None, (0.0, 0)
+    unavailable = False
+    for part in accept.split(","):
+        media_type, *params = (item.strip() for item in part.split(";"))
+        media_type = media_type.lower()
+        media_type = ALIASES.get(media_type, media_type)
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in _WILDCARDS:
+            candidate, specific = JSON, 0
+        elif media_type in ENCODERS:
+            candidate, specific = media_type, 1
+        else:
+            unavailable = unavailable or (media_type in BINARY_MEDIA_TYPES and quality > 0)
+            continue
+        if quality > 0 and (quality, specific) > best_rank:
+            best, best_rank = candidate, (quality, specific)
+    if best is None:
+        if unavailable:
+            raise ValueError(f"Not acceptable. Available media types: {', '.join(ENCODERS)}")
+        return JSON
+    return best
+
+
+def to_builtin(value: Any) -> Any:
+    """
+    Convertit une valeur de réponse (modèles Pydantic, listes) en types natifs, comme sa forme JSON.
+
+    :param value: valeur renvoyée par un endpoint.
+    :return: valeur composée de dict, list, str, int, float, bool et None.
+    :except: Aucun.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list) and value and isinstance(value[0], BaseModel):
+        return [item.model_dump(mode="json") for item in value]
+    return value
+
+
+def encode(media_type: str, value: Any) -> bytes:
+    """
+    Encode une valeur de réponse dans le format négocié.
+
+    :param media_type: type MIME renvoyé par `negotiate`.
+    :param value: valeur renvoyée par un endpoint.
+    :return: corps de la réponse.
+    :except: KeyError si le format n'est pas disponible; TypeError si la valeur n'est pas sérialisable.
+    """
+    return ENCODERS[media_type](to_builtin(value))
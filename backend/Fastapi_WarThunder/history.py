@@ -0,0 +1,292 @@
+"""
+Historique en mémoire des champs numériques des indicateurs et de l'état du véhicule.
+
+Chaque source dispose d'un tampon circulaire de capacité fixe, fait de tableaux `array`
+préalloués : une colonne d'horodatages partagée et une colonne de valeurs par champ.
+La mémoire ne dépend donc pas de la durée de la session, et une requête ne copie que
+la fenêtre demandée (recherche dichotomique sur les horodatages) avant de la réduire
+par LTTB (Largest-Triangle-Three-Buckets) au nombre de points voulu.
+"""
+
+import math
+import time
+from array import array
+from typing import Optional, get_args
+
+from pydantic import BaseModel
+
+from .schemas import HistoryModel, IndicatorsModel, StateModel
+from .upstream import WarThunderClient
+
+#: Nombre de points conservés par source : 30 minutes au rythme de polling par défaut (0.2 s).
+DEFAULT_CAPACITY: int = 9000
+#: Nombre de points renvoyés par défaut par une requête.
+DEFAULT_MAX_POINTS: int = 300
+#: Nombre minimal de points d'un sous-échantillonnage LTTB (premier, dernier et au moins un bucket).
+MIN_POINTS: int = 3
+#: Nombre maximal de points renvoyés par une requête.
+MAX_POINTS: int = 5000
+
+
+def numeric_fields(model: type[BaseModel]) -> tuple[str, ...]:
+    """
+    Liste les champs numériques (int ou float, éventuellement optionnels) d'un modèle.
+
+    Les booléens, énumérations, chaînes et listes (ex: `StateModel.engines`) sont exclus.
+
+    :param model: classe de modèle Pydantic.
+    :return: noms des champs numériques, dans l'ordre de déclaration.
+    :except: Aucun.
+    """
+    fields = []
+    for name, info in model.model_fields.items():
+        types = get_args(info.annotation) or (info.annotation,)
+        if bool not in types and any(kind in (int, float) for kind in types):
+            fields.append(name)
+    return tuple(fields)
+
+
+def lttb(timestamps, values, threshold: int) -> tuple[list[float], list[float]]:
+    """
+    Réduit une série à `threshold` points par l'algorithme Largest-Triangle-Three-Buckets.
+
+    Le premier et le dernier point sont conservés ; chaque bucket intermédiaire garde le point
+    formant le plus grand triangle avec le point retenu précédent et la moyenne du bucket suivant,
+    ce qui préserve les pics et la forme visuelle de la courbe.
+
+    :param timestamps: horodatages croissants.
+    :param values: valeurs alignées sur `timestamps`.
+    :param threshold: nombre de points voulu (au moins `MIN_POINTS`).
+    :return: tuple (horodatages, valeurs) réduits; la série est renvoyée telle quelle si elle est plus courte.
+    :except: Aucun.
+    """
+    size = len(timestamps)
+    if threshold >= size or threshold < MIN_POINTS:
+        return list(timestamps), list(values)
+
+    every = (size - 2) / (threshold - 2)
+    sampled_t, sampled_v = [timestamps[0]], [values[0]]
+    selected = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, size)
+        next_count = next_end - end
+        avg_t = sum(timestamps[end:next_end]) / next_count
+        avg_v = sum(values[end:next_end]) / next_count
+
+        point_t, point_v = timestamps[selected], values[selected]
+        best_area, best = -1.0, start
+        for index in range(start, end):
+            area = abs(
+                (point_t - avg_t) * (values[index] - point_v)
+                - (point_t - timestamps[index]) * (avg_v - point_v)
+            )
+            if area > best_area:
+                best_area, best = area, index
+        sampled_t.append(timestamps[best])
+        sampled_v.append(values[best])
+        selected = best
+
+    sampled_t.append(timestamps[-1])
+    sampled_v.append(values[-1])
+    return sampled_t, sampled_v
+
+
+class RingBuffer:
+    """
+    Tampon circulaire à capacité fixe des champs numériques d'une source.
+
+    Les horodatages doivent être ajoutés dans l'ordre croissant ; une valeur absente
+    (`None`) est stockée sous forme de NaN et ignorée à la lecture.
+
+    :param fields: noms des champs conservés.
+    :type fields: tuple[str, ...]
+    :param capacity: nombre de points conservés; les plus anciens sont écrasés.
+    :type capacity: int
+    :return: instance de RingBuffer
+    :except: ValueError si `capacity` n'est pas strictement positive.
+    """
+
+    def __init__(self, fields: tuple[str, ...], capacity: int):
+        if capacity <= 0:
+            raise ValueError("History capacity must be strictly positive")
+        self.fields = fields
+        self.capacity = capacity
+        self.size = 0
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.columns = {field: array("d", bytes(8 * capacity)) for field in fields}
+        self._head = 0
+
+    def append(self, timestamp: float, model: BaseModel) -> None:
+        """
+        Ajoute les valeurs des champs d'un modèle, en écrasant le point le plus ancien si le tampon est plein.
+
+        :param timestamp: horodatage epoch (secondes) de la réponse upstream.
+        :param model: modèle dont les champs sont lus.
+        :return: None
+        :except: Aucun.
+        """
+        index = self._head
+        self.timestamps[index] = timestamp
+        for field, column in self.columns.items():
+            value = getattr(model, field)
+            column[index] = math.nan if value is None else value
+        self._head = (index + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def _physical(self, position: int) -> int:
+        """
+        Convertit une position logique (0 = point le plus ancien) en indice dans les tableaux.
+
+        :param position: position logique.
+        :return: indice physique.
+        :except: Aucun.
+        """
+        return (self._head - self.size + position) % self.capacity
+
+    def _bisect(self, timestamp: float, right: bool = False) -> int:
+        """
+        Recherche dichotomique d'un horodatage parmi les points conservés.
+
+        :param timestamp: horodatage recherché.
+        :param right: renvoie la position après les points égaux (comme `bisect_right`).
+        :return: position logique d'insertion.
+        :except: Aucun.
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            current = self.timestamps[self._physical(middle)]
+            if current < timestamp or (right and current == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _slice(self, column: array, start: int, stop: int) -> array:
+        """
+        Copie les positions logiques [start, stop[ d'une colonne (au plus deux tranches contiguës).
+
+        :param column: colonne du tampon.
+        :param start: position logique de début.
+        :param stop: position logique de fin (exclue).
+        :return: copie de la fenêtre.
+        :except: Aucun.
+        """
+        if start >= stop:
+            return array("d")
+        first = self._physical(start)
+        last = first + (stop - start)
+        if last <= self.capacity:
+            return column[first:last]
+        return column[first:] + column[:last - self.capacity]
+
+    def window(self, field: str, since: float, until: float) -> tuple[array, array]:
+        """
+        Renvoie les points d'un champ compris entre deux horodatages (inclus), sans les valeurs absentes.
+
+        :param field: nom du champ.
+        :param since: début de la fenêtre.
+        :param until: fin de la fenêtre.
+        :return: tuple (horodatages, valeurs).
+        :except: KeyError si le champ n'est pas conservé.
+        """
+        column = self.columns[field]
+        start, stop = self._bisect(since), self._bisect(until, right=True)
+        timestamps, values = self._slice(self.timestamps, start, stop), self._slice(column, start, stop)
+        if any(math.isnan(value) for value in values):
+            kept = [index for index, value in enumerate(values) if not math.isnan(value)]
+            timestamps = array("d", (timestamps[index] for index in kept))
+            values = array("d", (values[index] for index in kept))
+        return timestamps, values
+
+
+class TelemetryHistory:
+    """
+    Historique des champs numériques de `IndicatorsModel` et `StateModel`, alimenté par le poller.
+
+    Les noms de champs sont ceux des modèles (ex: `speed`, `H_m`, `TAS_kmh`) ; ils sont uniques
+    d'une source à l'autre. Seules les réponses valides (`valid` vrai) sont conservées.
+
+    :param capacity: nombre de points conservés par source.
+    :type capacity: int
+    :return: instance de TelemetryHistory
+    :except: ValueError si `capacity` n'est pas strictement positive.
+    """
+
+    MODELS: dict[str, type[BaseModel]] = {
+        WarThunderClient.INDICATORS: IndicatorsModel,
+        WarThunderClient.STATE: StateModel,
+    }
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.buffers = {source: RingBuffer(numeric_fields(model), capacity) for source, model in self.MODELS.items()}
+        self.sources = {field: source for source, buffer in self.buffers.items() for field in buffer.fields}
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """
+        Noms des champs disponibles.
+
+        :param: None
+        :return: tuple des noms de champs.
+        :except: Aucun.
+        """
+        return tuple(self.sources)
+
+    def record(self, source: str, timestamp: float, model: Optional[BaseModel]) -> None:
+        """
+        Ajoute une réponse upstream à l'historique de sa source.
+
+        :param source: nom de la source.
+        :param timestamp: horodatage epoch (secondes) de la réponse.
+        :param model: modèle validé de la réponse.
+        :return: None
+        :except: Aucun; les sources sans historique et les réponses invalides sont ignorées.
+        """
+        buffer = self.buffers.get(source)
+        if buffer is None or model is None or not model.valid:
+            return
+        buffer.append(timestamp, model)
+
+    def query(
+            self,
+            field: str,
+            since: Optional[float] = None,
+            until: Optional[float] = None,
+            max_points: int = DEFAULT_MAX_POINTS
+    ) -> HistoryModel:
+        """
+        Renvoie l'historique d'un champ sur une fenêtre, réduit à `max_points` points par LTTB.
+
+        :param field: nom du champ.
+        :param since: début de la fenêtre (epoch, secondes); négatif : relatif à maintenant
+            (ex: -1800 pour les 30 dernières minutes); None : depuis le plus ancien point.
+        :param until: fin de la fenêtre (epoch, secondes); None : maintenant.
+        :param max_points: nombre maximal de points renvoyés.
+        :return: `HistoryModel` de la fenêtre.
+        :except: KeyError si le champ est inconnu; ValueError si `max_points` est hors bornes.
+        """
+        if not MIN_POINTS <= max_points <= MAX_POINTS:
+            raise ValueError(f"max_points must be between {MIN_POINTS} and {MAX_POINTS}")
+        source = self.sources[field]
+        now = time.time()
+        until = now if until is None else until
+        if since is None:
+            since = 0.0
+        elif since < 0:
+            since += now
+        timestamps, values = self.buffers[source].window(field, since, until)
+        sampled_t, sampled_v = lttb(timestamps, values, max_points)
+        return HistoryModel(
+            field=field,
+            source=source,
+            since=since,
+            until=until,
+            count=len(timestamps),
+            timestamps=sampled_t,
+            values=sampled_v
+        )
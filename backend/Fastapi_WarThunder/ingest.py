@@ -0,0 +1,207 @@
+"""
+Conversion des réponses brutes de l'upstream War Thunder en modèles Pydantic.
+
+Les clés de l'endpoint /state ("H, m", "TAS, km/h", "throttle 1, %"...) sont décrites par
+des tables déclaratives, compilées une seule fois en analyseurs spécialisés.
+Les moteurs 1..N sont regroupés dans `StateModel.engines`.
+"""
+
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel, Field, create_model
+from pydantic_core import from_json
+
+from .schemas import EngineModel, StateModel
+
+#: Correspondance clé upstream -> champ de `StateModel`, hors moteurs.
+STATE_FIELDS: tuple[tuple[str, str], ...] = (
+    ("valid", "valid"),
+    ("aileron, %", "aileron"),
+    ("elevator, %", "elevator"),
+    ("rudder, %", "rudder"),
+    ("flaps, %", "flaps"),
+    ("gear, %", "gear"),
+    ("airbrake, %", "airbrake"),
+    ("H, m", "H_m"),
+    ("TAS, km/h", "TAS_kmh"),
+    ("IAS, km/h", "IAS_kmh"),
+    ("M", "M"),
+    ("AoA, deg", "AoA_deg"),
+    ("AoS, deg", "AoS_deg"),
+    ("Ny", "Ny"),
+    ("Vy, m/s", "Vy_ms"),
+    ("Wx, deg/s", "Wx_deg_s"),
+    ("Mfuel, kg", "Mfuel_kg"),
+    ("Mfuel0, kg", "Mfuel0_kg"),
+)
+
+#: Correspondance clé upstream (gabarit, `{n}` = numéro du moteur) -> champ de `EngineModel`
+#: -> champ "moteur 1" historique de `StateModel`, conservé pour compatibilité.
+ENGINE_FIELDS: tuple[tuple[str, str, str], ...] = (
+    ("throttle {n}, %", "throttle_percent", "throttle1_percent"),
+    ("RPM throttle {n}, %", "RPM_throttle_percent", "RPM_throttle1_percent"),
+    ("mixture {n}, %", "mixture_percent", "mixture1_percent"),
+    ("radiator {n}, %", "radiator_percent", "radiator1_percent"),
+    ("compressor stage {n}", "compressor_stage", "compressor_stage1"),
+    ("magneto {n}", "magneto", "magneto1"),
+    ("power {n}, hp", "power_hp", "power1_hp"),
+    ("RPM {n}", "RPM", "RPM1"),
+    ("manifold pressure {n}, atm", "manifold_pressure_atm", "manifold_pressure1_atm"),
+    ("oil temp {n}, C", "oil_temp_C", "oil_temp1_C"),
+    ("pitch {n}, deg", "pitch_deg", "pitch1_deg"),
+    ("thrust {n}, kgs", "thrust_kg", "thrust1_kg"),
+    ("efficiency {n}, %", "efficiency_percent", "efficiency1_percent"),
+)
+
+#: Nombre maximal de moteurs recherchés dans une réponse /state.
+MAX_ENGINES: int = 16
+
+
+def _aliased_model(
+        base: type[BaseModel],
+        name: str,
+        aliases: dict[str, str],
+        defaults: Optional[dict[str, Any]] = None
+) -> type[BaseModel]:
+    """
+    Dérive un modèle dont les champs sont lus sous les clés upstream (validation_alias).
+
+    La correspondance des clés est ainsi faite par pydantic-core, sans boucle Python ;
+    une clé absente de la réponse donne la valeur par défaut du champ (None sauf mention).
+
+    :param base: modèle public dont on hérite (les instances restent des `base`).
+    :param name: nom du modèle dérivé.
+    :param aliases: correspondance champ -> clé upstream.
+    :param defaults: valeurs par défaut spécifiques, par champ (optionnel).
+    :return: sous-classe de `base` validant directement le dict de l'upstream.
+    :except: KeyError si un champ de `aliases` n'existe pas dans `base`.
+    """
+    defaults = defaults or {}
+    fields = {
+        field: (base.model_fields[field].annotation, Field(default=defaults.get(field), validation_alias=key))
+        for field, key in aliases.items()
+    }
+    return create_model(name, __base__=base, **fields)
+
+
+def _compile_constructor(max_engines: int) -> Callable[[dict[str, Any]], StateModel]:
+    """
+    Génère le constructeur du chemin de confiance : un accès direct par clé, sans validation.
+
+    Les instances sont créées comme le fait `BaseModel.model_construct`, sans la résolution
+    des valeurs par défaut champ par champ qui rend cette dernière plus lente que la validation.
+
+    :param max_engines: nombre maximal de moteurs lus.
+    :return: fonction `construct(data) -> StateModel`.
+    :except: Aucun.
+    """
+    engine_names = [name for _, name, _ in ENGINE_FIELDS]
+    lines = [
+        "def construct(data):",
+        "    get = data.get",
+        "    engines = []",
+    ]
+    for n in range(1, max_engines + 1):
+        keys = [template.format(n=n) for template, _, _ in ENGINE_FIELDS]
+        values = ", ".join(f"{name!r}: get({key!r})" for key, name in zip(keys, engine_names))
+        lines += [
+            f"    if {keys[0]!r} not in data:",
+            "        return build(get, engines)",
+            f"    engines.append(new(EngineModel, {{{values}}}, ENGINE_FIELDS_SET))",
+        ]
+    lines += ["    return build(get, engines)", ""]
+
+    state_values = [f"{name!r}: get({key!r})" for key, name in STATE_FIELDS if name != "valid"]
+    state_values += [f"{state_name!r}: first[{name!r}]" for _, name, state_name in ENGINE_FIELDS]
+    lines += [
+        "def build(get, engines):",
+        "    first = engines[0].__dict__ if engines else EMPTY_ENGINE",
+        f"    return new(StateModel, {{'valid': get('valid', False), {', '.join(state_values)}, "
+        "'engines': engines}, STATE_FIELDS_SET)",
+    ]
+
+    def new(model: type[BaseModel], values: dict[str, Any], fields_set: frozenset) -> BaseModel:
+        instance = model.__new__(model)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", set(fields_set))
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    namespace: dict[str, Any] = {
+        "new": new,
+        "EngineModel": EngineModel,
+        "StateModel": StateModel,
+        "ENGINE_FIELDS_SET": frozenset(engine_names),
+        "STATE_FIELDS_SET": frozenset(StateModel.model_fields),
+        "EMPTY_ENGINE": dict.fromkeys(engine_names),
+    }
+    exec(compile("\n".join(lines), "<state_constructor>", "exec"), namespace)
+    return namespace["construct"]
+
+
+class StateParser:
+    """
+    Analyseur compilé de la réponse /state de War Thunder.
+
+    Les tables `STATE_FIELDS` et `ENGINE_FIELDS` sont compilées une seule fois :
+    - chemin validé : en modèles dérivés dont les alias de validation sont les clés upstream,
+      validés par pydantic-core ;
+    - chemin de confiance (`trusted=True`) : en une fonction générée qui construit les modèles
+      sans validation. Les types renvoyés par l'upstream sont alors conservés tels quels.
+
+    :param trusted: active le chemin de confiance.
+    :type trusted: bool
+    :param max_engines: nombre maximal de moteurs lus.
+    :type max_engines: int
+    :return: instance de StateParser, appelable sur le dict JSON de l'upstream.
+    :except: ValueError si `max_engines` est inférieur à 1.
+    """
+
+    def __init__(self, trusted: bool = False, max_engines: int = MAX_ENGINES):
+        if max_engines < 1:
+            raise ValueError("max_engines must be at least 1")
+        self.trusted = trusted
+        self._probes = tuple(ENGINE_FIELDS[0][0].format(n=n) for n in range(1, max_engines + 1))
+        if trusted:
+            self._construct = _compile_constructor(max_engines)
+            return
+
+        state_aliases = {name: key for key, name in STATE_FIELDS}
+        state_aliases.update({state_name: template.format(n=1) for template, _, state_name in ENGINE_FIELDS})
+        self._state_model = _aliased_model(StateModel, "StateIngestModel", state_aliases, {"valid": False})
+        self._engine_models = tuple(
+            _aliased_model(
+                EngineModel,
+                f"Engine{n}IngestModel",
+                {name: template.format(n=n) for template, name, _ in ENGINE_FIELDS}
+            )
+            for n in range(1, max_engines + 1)
+        )
+
+    def __call__(self, data: dict[str, Any]) -> StateModel:
+        """
+        Convertit le dict JSON de l'endpoint /state en `StateModel`.
+
+        :param data: réponse JSON décodée de l'upstream (non modifiée).
+        :return: `StateModel` incluant la liste `engines`.
+        :except: ValidationError si le chemin validé rejette les données.
+        """
+        if self.trusted:
+            return self._construct(data)
+        engines = []
+        for probe, engine_model in zip(self._probes, self._engine_models):
+            if probe not in data:
+                break
+            engines.append(engine_model.model_validate(data))
+        return self._state_model.model_validate({**data, "engines": engines})
+
+    def parse_json(self, content: bytes) -> StateModel:
+        """
+        Décode (via pydantic-core, plus rapide que `json.loads`) puis convertit une réponse /state brute.
+
+        :param content: corps brut de la réponse upstream.
+        :return: `StateModel` incluant la liste `engines`.
+        :except: ValueError si le JSON est invalide; ValidationError si les données sont rejetées.
+        """
+        return self(from_json(content))
@@ -0,0 +1,240 @@
+"""
+Cache de l'image de la carte War Thunder, indexé par génération de carte.
+
+L'image ne change que lorsque `MapInfoModel.map_generation` change : ce module conserve
+les octets, le type de contenu, la forme base64 et un ETag fort pour la génération courante,
+afin de ne solliciter l'upstream qu'au changement de carte.
+
+La forme JSON base64 n'est jamais reconstituée en entier : l'enveloppe {"content": ...} est
+envoyée par morceaux, tranches d'un unique tampon base64 partagé par toutes les requêtes.
+Une requête ne copie donc rien de l'image, et une génération ne conserve que deux copies
+(l'image et sa forme base64) au lieu de quatre.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import AsyncIterator, Iterator, Optional
+
+from fastapi import HTTPException
+
+from .compression import Chunk, compress_chunks
+from .upstream import WarThunderClient
+
+#: Taille des tranches du tampon base64 envoyées une à une (multiple de 4 : caractères base64 entiers).
+CHUNK_SIZE: int = 64 * 1024
+
+
+@dataclass(frozen=True)
+class MapImage:
+    """
+    Image de carte mise en cache pour une génération donnée.
+
+    :param generation: génération de carte (`MapInfoModel.map_generation`) de l'image.
+    :type generation: Optional[int]
+    :param content: octets bruts de l'image.
+    :type content: bytes
+    :param content_type: type MIME renvoyé par l'upstream.
+    :type content_type: str
+    :return: instance de MapImage
+    :except: Aucun
+    """
+
+    generation: Optional[int]
+    content: bytes
+    content_type: str
+    #: Variantes compressées du corps JSON base64, par encodage de contenu.
+    variants: dict[str, bytes] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @cached_property
+    def digest(self) -> str:
+        """
+        Empreinte SHA-1 du contenu de l'image.
+
+        :param: None
+        :return: empreinte hexadécimale.
+        :except: Aucun.
+        """
+        return hashlib.sha1(self.content).hexdigest()
+
+    @property
+    def etag(self) -> str:
+        """
+        ETag fort de l'image binaire.
+
+        :param: None
+        :return: ETag entre guillemets.
+        :except: Aucun.
+        """
+        return f'"{self.digest}"'
+
+    @property
+    def base64_etag(self) -> str:
+        """
+        ETag fort de la représentation JSON base64 de l'image.
+
+        :param: None
+        :return: ETag entre guillemets.
+        :except: Aucun.
+        """
+        return f'"{self.digest}-b64"'
+
+    @cached_property
+    def base64(self) -> bytes:
+        """
+        Contenu de l'image encodé en base64, calculé une seule fois par génération.
+
+        :param: None
+        :return: octets base64 ASCII (sans échappement JSON nécessaire).
+        :except: Aucun.
+        """
+        return base64.b64encode(self.content)
+
+    @cached_property
+    def base64_envelope(self) -> tuple[bytes, bytes]:
+        """
+        Début et fin du corps JSON {"content": "<base64>", "content_type": "..."}, autour du base64.
+
+        :param: None
+        :return: tuple (préfixe, suffixe) en UTF-8.
+        :except: Aucun.
+        """
+        return b'{"content":"', b'","content_type":' + json.dumps(self.content_type).encode("utf-8") + b"}"
+
+    @property
+    def base64_length(self) -> int:
+        """
+        Taille du corps JSON base64, pour l'en-tête `Content-Length`.
+
+        :param: None
+        :return: taille en octets.
+        :except: Aucun.
+        """
+        prefix, suffix = self.base64_envelope
+        return len(prefix) + len(self.base64) + len(suffix)
+
+    def base64_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Chunk]:
+        """
+        Parcourt le corps JSON base64 par morceaux, sans copier le tampon base64.
+
+        :param chunk_size: taille des tranches du tampon base64.
+        :return: itérateur du préfixe, des tranches (`memoryview`) puis du suffixe.
+        :except: Aucun.
+        """
+        prefix, suffix = self.base64_envelope
+        yield prefix
+        view = memoryview(self.base64)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+        yield suffix
+
+    async def base64_stream(self, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[Chunk]:
+        """
+        Version asynchrone de `base64_chunks`, pour `StreamingResponse` (sans passer par un thread).
+
+        :param chunk_size: taille des tranches du tampon base64.
+        :return: itérateur asynchrone des morceaux du corps.
+        :except: Aucun.
+        """
+        for chunk in self.base64_chunks(chunk_size):
+            yield chunk
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indique si l'en-tête `If-None-Match` d'une requête correspond à un ETag.
+
+    :param if_none_match: valeur brute de l'en-tête (None si absent).
+    :param etag: ETag courant de la ressource.
+    :return: True si le client possède déjà cette version.
+    :except: Aucun.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class MapImageCache:
+    """
+    Cache de l'image de carte pour la génération courante.
+
+    Les requêtes concurrentes lors d'un changement de génération sont regroupées :
+    une seule récupération upstream est effectuée. De même, la forme base64 n'est
+    compressée qu'une fois par génération et par encodage.
+
+    :param client: client upstream partagé.
+    :type client: WarThunderClient
+    :return: instance de MapImageCache
+    :except: Aucun
+    """
+
+    CACHE = "map_image"
+    VARIANTS = "map_image_compressed"
+
+    def __init__(self, client: WarThunderClient):
+        self.client = client
+        self.image: Optional[MapImage] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, generation: Optional[int]) -> MapImage:
+        """
+        Renvoie l'image de la génération demandée, en la téléchargeant si nécessaire.
+
+        Une génération inconnue (None) invalide toujours le cache.
+
+        :param generation: génération de carte courante (`MapInfoModel.map_generation`).
+        :return: `MapImage` de la génération demandée.
+        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        """
+        image = self.image
+        if image is not None and generation is not None and image.generation == generation:
+            self.client.metrics.cache_hit(self.CACHE, True)
+            return image
+
+        async with self._lock:
+            image = self.image
+            if image is not None and generation is not None and image.generation == generation:
+                self.client.metrics.cache_hit(self.CACHE, True)
+                return image
+            self.client.metrics.cache_hit(self.CACHE, False)
+            try:
+                resp = await self.client.fetch(WarThunderClient.MAP_IMG)
+            except Exception as exc:
+                raise HTTPException(status_code=502, detail=f"Upstream service unreachable: {exc}")
+            self.image = MapImage(
+                generation=generation,
+                content=resp.content,
+                content_type=resp.headers.get("content-type", "application/octet-stream")
+            )
+            return self.image
+
+    async def base64_body(self, image: MapImage, coding: str) -> bytes:
+        """
+        Renvoie le corps JSON base64 d'une image, compressé une seule fois par génération et par encodage.
+
+        La compression (plusieurs Mo pour une grande carte) s'exécute dans un thread de travail,
+        à partir des morceaux de `MapImage.base64_chunks` ; les requêtes concurrentes attendent
+        la compression en cours.
+
+        :param image: image renvoyée par `get`.
+        :param coding: encodage de contenu de `compression.COMPRESSORS`.
+        :return: corps de réponse compressé.
+        :except: Aucun.
+        """
+        body = image.variants.get(coding)
+        if body is not None:
+            self.client.metrics.cache_hit(self.VARIANTS, True)
+            return body
+        async with self._lock:
+            body = image.variants.get(coding)
+            if body is None:
+                self.client.metrics.cache_hit(self.VARIANTS, False)
+                body = await asyncio.to_thread(compress_chunks, coding, image.base64_chunks())
+                image.variants[coding] = body
+            else:
+                self.client.metrics.cache_hit(self.VARIANTS, True)
+            return body
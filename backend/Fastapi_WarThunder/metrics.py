@@ -0,0 +1,433 @@
+"""
+Métriques de l'application au format texte Prometheus (exposées sur /metrics).
+
+Ce module fournit des compteurs, jauges et histogrammes minimaux, sans dépendance externe :
+une observation coûte une recherche dichotomique et quelques additions, ce qui permet
+d'instrumenter les chemins chauds (récupération upstream, analyse, sérialisation).
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+#: Bornes (secondes) des histogrammes de durée : de 50 µs à 10 s.
+DURATION_BUCKETS: tuple[float, ...] = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    """
+    Échappe une valeur de label selon le format texte Prometheus.
+
+    :param value: valeur brute.
+    :return: valeur échappée.
+    :except: Aucun.
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    """
+    Formate un ensemble de labels (`{a="x",b="y"}`).
+
+    :param names: noms des labels.
+    :param values: valeurs des labels.
+    :param extra: label supplémentaire déjà formaté (ex: `le="0.1"`).
+    :return: bloc de labels, vide s'il n'y en a aucun.
+    :except: Aucun.
+    """
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    """
+    Formate une valeur numérique (`+Inf`, entiers sans décimale).
+
+    :param value: valeur.
+    :return: représentation texte Prometheus.
+    :except: Aucun.
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """
+    Base commune des métriques : nom, aide, labels et rendu de l'en-tête.
+
+    :param name: nom Prometheus de la métrique.
+    :type name: str
+    :param documentation: texte d'aide (`# HELP`).
+    :type documentation: str
+    :param labelnames: noms des labels.
+    :type labelnames: tuple[str, ...]
+    :return: instance de Metric
+    :except: Aucun
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def render(self) -> Iterator[str]:
+        """
+        Produit les lignes texte de la métrique.
+
+        :param: None
+        :return: itérateur de lignes.
+        :except: Aucun.
+        """
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self.samples()
+
+    def samples(self) -> Iterator[str]:
+        """
+        Produit les lignes d'échantillons (à définir par les sous-classes).
+
+        :param: None
+        :return: itérateur de lignes.
+        :except: Aucun.
+        """
+        return iter(())
+
+
+class Counter(Metric):
+    """
+    Compteur monotone, par combinaison de labels.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        """
+        Incrémente le compteur.
+
+        :param labels: valeurs des labels, dans l'ordre de `labelnames`.
+        :param amount: incrément (positif).
+        :return: None
+        :except: Aucun.
+        """
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def get(self, *labels) -> float:
+        """
+        Valeur courante du compteur.
+
+        :param labels: valeurs des labels.
+        :return: valeur (0 si jamais incrémenté).
+        :except: Aucun.
+        """
+        return self.values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in self.values.items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Gauge(Counter):
+    """
+    Jauge pouvant monter et descendre, par combinaison de labels.
+    """
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        """
+        Décrémente la jauge.
+
+        :param labels: valeurs des labels.
+        :param amount: décrément.
+        :return: None
+        :except: Aucun.
+        """
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        """
+        Fixe la valeur de la jauge.
+
+        :param labels: valeurs des labels.
+        :param value: nouvelle valeur.
+        :return: None
+        :except: Aucun.
+        """
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    """
+    Histogramme à bornes fixes, par combinaison de labels.
+
+    Les effectifs sont stockés par intervalle et cumulés uniquement au rendu.
+
+    :param buckets: bornes supérieures croissantes des intervalles (+Inf est implicite).
+    :type buckets: tuple[float, ...]
+    """
+
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DURATION_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        """
+        Enregistre une observation.
+
+        :param value: valeur observée (en secondes pour une durée).
+        :param labels: valeurs des labels.
+        :return: None
+        :except: Aucun.
+        """
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *labels) -> int:
+        """
+        Nombre d'observations enregistrées.
+
+        :param labels: valeurs des labels.
+        :return: nombre d'observations.
+        :except: Aucun.
+        """
+        series = self.series.get(labels)
+        return series[2] if series is not None else 0
+
+    def samples(self) -> Iterator[str]:
+        for labels, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {count}"
+
+
+class Metrics:
+    """
+    Registre des métriques de l'application War Thunder.
+
+    :param: None
+    :return: instance de Metrics
+    :except: Aucun
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self.upstream_fetch_seconds = Histogram(
+            "wt_upstream_fetch_seconds", "Duration of upstream War Thunder requests.", ("source",))
+        self.upstream_errors = Counter(
+            "wt_upstream_errors_total", "Failed upstream requests, by stage (fetch, parse or circuit).",
+            ("source", "stage"))
+        self.upstream_circuit_open = Gauge(
+            "wt_upstream_circuit_open", "Open upstream circuit breakers (failing fast), by source.", ("source",))
+        self.parse_seconds = Histogram(
+            "wt_parse_seconds", "Duration of decoding and validating an upstream response.", ("source",))
+        self.poll_tick_seconds = Histogram(
+            "wt_poll_tick_seconds", "Duration of a polling tick (all polled sources).")
+        self.poller_active = Gauge(
+            "wt_poller_active", "1 while a battle is in progress (fast polling), 0 when idle or unreachable.")
+        self.request_seconds = Histogram(
+            "wt_http_request_seconds", "Duration of HTTP requests, by route.", ("route",))
+        self.serialization_seconds = Histogram(
+            "wt_http_serialization_seconds",
+            "Time spent outside the endpoint body (response validation and encoding), by route.", ("route",))
+        self.http_errors = Counter(
+            "wt_http_errors_total", "HTTP error responses (4xx/5xx), by route and status.", ("route", "status"))
+        self.cache_requests = Counter(
+            "wt_cache_requests_total", "Cache lookups, by cache and result (hit or miss).", ("cache", "result"))
+        self.cache_hit_ratio = Gauge(
+            "wt_cache_hit_ratio", "Share of cache lookups served from the cache.", ("cache",))
+        self.render_seconds = Histogram(
+            "wt_map_render_seconds", "Duration of compositing and encoding a /map_render frame, by format.",
+            ("format",))
+        self.tiles_build_seconds = Histogram(
+            "wt_map_tiles_build_seconds", "Duration of cutting the map image into a /map_tiles pyramid.")
+        self.tiles_bytes = Gauge(
+            "wt_map_tiles_bytes", "Memory held by the cached /map_tiles pyramids, in bytes.")
+        self.stream_subscribers = Gauge(
+            "wt_stream_subscribers", "Connected streaming subscribers, by transport.", ("transport",))
+
+    def cache_hit(self, cache: str, hit: bool) -> None:
+        """
+        Enregistre une consultation de cache.
+
+        :param cache: nom du cache.
+        :param hit: True si la valeur était en cache.
+        :return: None
+        :except: Aucun.
+        """
+        self.cache_requests.inc(cache, "hit" if hit else "miss")
+
+    def render(self) -> str:
+        """
+        Produit la page texte Prometheus de toutes les métriques.
+
+        :param: None
+        :return: texte au format d'exposition Prometheus 0.0.4.
+        :except: Aucun.
+        """
+        caches = {cache for cache, _ in self.cache_requests.values}
+        for cache in caches:
+            hits = self.cache_requests.get(cache, "hit")
+            total = hits + self.cache_requests.get(cache, "miss")
+            self.cache_hit_ratio.set(cache, value=hits / total if total else 0.0)
+
+        lines = []
+        for metric in vars(self).values():
+            if isinstance(metric, Metric):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_endpoint_seconds: ContextVar[float] = ContextVar("wt_endpoint_seconds", default=0.0)
+_serializing_seconds: ContextVar[float] = ContextVar("wt_serializing_seconds", default=0.0)
+
+
+@contextmanager
+def serializing() -> Iterator[None]:
+    """
+    Compte la durée du bloc comme de la sérialisation de la réponse, et non comme du corps de l'endpoint.
+
+    À utiliser par les endpoints qui encodent eux-mêmes leur réponse (ex: MessagePack),
+    pour que `wt_http_serialization_seconds` reste comparable d'un format à l'autre.
+
+    :param: None
+    :return: context manager.
+    :except: Aucun.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _serializing_seconds.set(_serializing_seconds.get() + time.perf_counter() - started)
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    """
+    Enveloppe un endpoint asynchrone pour mesurer la durée de son corps.
+
+    La signature est conservée (`functools.wraps`), FastAPI en déduit donc les mêmes paramètres.
+
+    :param endpoint: endpoint asynchrone d'origine.
+    :return: endpoint instrumenté.
+    :except: Aucun.
+    """
+
+    @wraps(endpoint)
+    async def timed(*args, **kwargs):
+        _serializing_seconds.set(0.0)
+        started = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            _endpoint_seconds.set(time.perf_counter() - started - _serializing_seconds.get())
+
+    return timed
+
+
+def instrumented_route(metrics: Metrics) -> type[APIRoute]:
+    """
+    Construit une classe de route FastAPI qui alimente `metrics` à chaque requête.
+
+    Sont mesurés, par route : la durée totale de la requête, la part passée hors du corps de
+    l'endpoint (validation du `response_model` et encodage JSON, plus les blocs `serializing`)
+    et les réponses en erreur, par statut (422 pour des paramètres invalides, 500 pour une
+    exception non gérée). Une requête annulée (client déconnecté) n'est comptée qu'en durée.
+
+    :param metrics: registre à alimenter.
+    :return: sous-classe de `APIRoute` à affecter à `router.route_class`.
+    :except: Aucun.
+    """
+
+    class InstrumentedRoute(APIRoute):
+        def __init__(self, path: str, endpoint: Callable, **kwargs: Any):
+            if iscoroutinefunction(endpoint):
+                endpoint = _timed_endpoint(endpoint)
+            super().__init__(path, endpoint, **kwargs)
+
+        def get_route_handler(self) -> Callable:
+            handler = super().get_route_handler()
+            route = self.path
+
+            async def instrumented_handler(request: Request):
+                token = _endpoint_seconds.set(0.0)
+                started = time.perf_counter()
+                status: Optional[int] = None
+                try:
+                    response = await handler(request)
+                    status = response.status_code
+                    return response
+                except HTTPException as exc:
+                    status = exc.status_code
+                    raise
+                except RequestValidationError:
+                    status = 422
+                    raise
+                except Exception:
+                    status = 500
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - started
+                    metrics.request_seconds.observe(elapsed, route)
+                    if status is not None and status < 400:
+                        metrics.serialization_seconds.observe(max(0.0, elapsed - _endpoint_seconds.get()), route)
+                    elif status is not None:
+                        metrics.http_errors.inc(route, str(status))
+                    _endpoint_seconds.reset(token)
+
+            return instrumented_handler
+
+    return InstrumentedRoute
+
+
+async def track_subscriber(stream: AsyncIterator, gauge: Gauge, *labels) -> AsyncIterator:
+    """
+    Relaie un flux asynchrone en comptant son abonné dans une jauge tant qu'il est consommé.
+
+    :param stream: flux d'origine.
+    :param gauge: jauge des abonnés connectés.
+    :param labels: valeurs des labels de la jauge.
+    :return: itérateur asynchrone produisant les mêmes éléments que `stream`.
+    :except: asyncio.CancelledError si l'abonné se déconnecte.
+    """
+    gauge.inc(*labels)
+    try:
+        async for item in stream:
+            yield item
+    finally:
+        gauge.dec(*labels)
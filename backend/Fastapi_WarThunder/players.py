@@ -0,0 +1,236 @@
+"""
+Suivi de plusieurs joueurs (clients War Thunder) par un seul backend.
+
+Chaque `Player` possède son client upstream (et donc son pool de connexions), son poller,
+son historique et son cache d'image de carte ; tous partagent l'event loop et le registre
+de métriques du processus. `Squad` regroupe les joueurs et construit la vue agrégée de
+l'escouade, sérialisée une seule fois par combinaison d'instantanés.
+"""
+
+import asyncio
+import re
+from enum import Enum
+from typing import Any, Iterator, Optional
+
+from .compression import compress
+from .encoding import encode
+from .history import DEFAULT_CAPACITY, TelemetryHistory
+from .map_image import MapImageCache
+from .recorder import SessionRecorder
+from .rendering import MapRenderer
+from .schemas import PlayerModel
+from .telemetry import TelemetryPoller, TelemetrySnapshot
+from .upstream import WarThunderClient
+
+#: Nom du joueur unique lorsque aucun joueur n'est déclaré.
+DEFAULT_PLAYER: str = "default"
+
+_NAME = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+
+class PlayerDocument(str, Enum):
+    """
+    Documents servis par `/players/{name}/{document}`, et leur sujet dans `TelemetrySnapshot`.
+    """
+    INDICATORS = "indicators"
+    STATE = "state"
+    MAP_INFO = "map_info"
+    MAP_OBJECTS = "map_objects"
+    MAP_TRACKS = "map_tracks"
+    GYROSCOPE = "gyroscope"
+    COMPASS = "compass"
+    SPEED = "speed"
+    ALTITUDE = "altitude"
+    SNAPSHOT = "snapshot"
+
+
+class Player:
+    """
+    Joueur suivi : client upstream, poller, historique, cache d'image et rendu de carte qui lui sont propres.
+
+    :param name: nom du joueur (lettres, chiffres, `_` et `-`, 32 caractères au plus).
+    :type name: str
+    :param client: client upstream du jeu de ce joueur.
+    :type client: WarThunderClient
+    :param recorder: enregistreur de session du joueur (optionnel).
+    :type recorder: Optional[SessionRecorder]
+    :param poll_interval: durée d'un tick en bataille, en secondes.
+    :type poll_interval: float
+    :param idle_poll_interval: durée d'un tick au hangar ou jeu injoignable, en secondes.
+    :type idle_poll_interval: float
+    :param adaptive_polling: adapte le rythme et les sources interrogées à l'état du jeu.
+    :type adaptive_polling: bool
+    :param history_capacity: nombre de points d'historique conservés par source.
+    :type history_capacity: int
+    :return: instance de Player
+    :except: ValueError si le nom est invalide ou si un paramètre de polling est hors bornes.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            client: WarThunderClient,
+            recorder: Optional[SessionRecorder] = None,
+            poll_interval: float = 0.2,
+            idle_poll_interval: float = 2.0,
+            adaptive_polling: bool = True,
+            history_capacity: int = DEFAULT_CAPACITY
+    ):
+        if not _NAME.match(name):
+            raise ValueError(f"Invalid player name {name!r}: use 1-32 letters, digits, '_' or '-'")
+        self.name = name
+        self.client = client
+        self.recorder = recorder
+        self.history = TelemetryHistory(history_capacity)
+        self.poller = TelemetryPoller(
+            client,
+            interval=poll_interval,
+            recorder=recorder,
+            idle_interval=idle_poll_interval,
+            adaptive=adaptive_polling,
+            history=self.history
+        )
+        self.map_image = MapImageCache(client)
+        self.renderer = MapRenderer(client.metrics)
+
+    async def start(self) -> None:
+        """
+        Ouvre le pool de connexions, démarre l'enregistrement éventuel puis le polling.
+
+        :param: None
+        :return: None
+        :except: OSError si le dossier d'enregistrement ne peut pas être créé.
+        """
+        await self.client.start()
+        if self.recorder is not None:
+            self.recorder.start()
+        await self.poller.start()
+
+    async def stop(self) -> None:
+        """
+        Arrête le polling, termine l'enregistrement puis ferme le pool de connexions.
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        await self.poller.stop()
+        if self.recorder is not None:
+            await asyncio.to_thread(self.recorder.close)
+        await self.client.close()
+
+    def describe(self) -> PlayerModel:
+        """
+        Décrit le joueur pour la route `/players`.
+
+        :param: None
+        :return: `PlayerModel` du joueur.
+        :except: Aucun.
+        """
+        latest = self.poller.latest
+        return PlayerModel(
+            name=self.name,
+            upstream=self.client.base_url,
+            active=self.poller.active,
+            seq=latest.seq if latest is not None else None
+        )
+
+
+class Squad:
+    """
+    Ensemble ordonné des joueurs suivis ; le premier est le joueur par défaut des routes historiques.
+
+    :param players: joueurs, dans l'ordre de déclaration.
+    :type players: list[Player]
+    :return: instance de Squad
+    :except: ValueError si la liste est vide ou contient deux fois le même nom.
+    """
+
+    def __init__(self, players: list[Player]):
+        if not players:
+            raise ValueError("At least one player is required")
+        self.players = {player.name: player for player in players}
+        if len(self.players) != len(players):
+            raise ValueError("Player names must be unique")
+        self._bodies: dict[tuple[str, Optional[str]], bytes] = {}
+        self._seqs: tuple[int, ...] = ()
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self.players.values())
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    @property
+    def default(self) -> Player:
+        """
+        Joueur servi par les routes non préfixées (`/state`, `/indicators`, ...).
+
+        :param: None
+        :return: premier joueur déclaré.
+        :except: Aucun.
+        """
+        return next(iter(self.players.values()))
+
+    def get(self, name: Optional[str]) -> Player:
+        """
+        Renvoie un joueur par son nom (le joueur par défaut si None).
+
+        :param name: nom du joueur.
+        :return: le `Player` correspondant.
+        :except: KeyError si aucun joueur ne porte ce nom.
+        """
+        if name is None:
+            return self.default
+        return self.players[name]
+
+    async def start(self) -> None:
+        """
+        Démarre tous les joueurs : leurs pollers tournent en parallèle sur la même event loop.
+
+        :param: None
+        :return: None
+        :except: OSError si un dossier d'enregistrement ne peut pas être créé.
+        """
+        for player in self:
+            await player.start()
+
+    async def stop(self) -> None:
+        """
+        Arrête tous les joueurs, dans l'ordre inverse du démarrage.
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        for player in reversed(list(self)):
+            await player.stop()
+
+    async def body(self, media_type: str, coding: Optional[str] = None) -> bytes:
+        """
+        Renvoie la vue d'escouade encodée (format `SquadModel`).
+
+        Le corps, et chacune de ses variantes compressées, est recalculé seulement lorsqu'un
+        joueur a publié un nouvel instantané ; les documents par joueur sont eux-mêmes mis en
+        cache dans chaque instantané.
+
+        :param media_type: type MIME disponible dans `encoding.ENCODERS`.
+        :param coding: encodage de contenu de `compression.COMPRESSORS` (None : corps non compressé).
+        :return: corps de réponse encodé.
+        :except: Aucun; les échecs par source sont rapportés dans chaque joueur.
+        """
+        snapshots: list[TelemetrySnapshot] = await asyncio.gather(*(player.poller.snapshot() for player in self))
+        seqs = tuple(snapshot.seq for snapshot in snapshots)
+        if seqs != self._seqs:
+            self._seqs, self._bodies = seqs, {}
+        if (media_type, None) not in self._bodies:
+            document: dict[str, Any] = {
+                "players": {
+                    name: snapshot.payload(TelemetrySnapshot.SQUAD_MEMBER)
+                    for name, snapshot in zip(self.players, snapshots)
+                }
+            }
+            self._bodies[(media_type, None)] = encode(media_type, document)
+        if (media_type, coding) not in self._bodies:
+            self._bodies[(media_type, coding)] = compress(coding, self._bodies[(media_type, None)])
+        return self._bodies[(media_type, coding)]
@@ -0,0 +1,263 @@
+"""
+Enregistrement binaire, en ajout seul, des réponses upstream de War Thunder.
+
+Chaque réponse brute est écrite telle quelle, précédée d'un en-tête fixe
+(horodatage, source, longueur), dans un fichier par partie (`map_generation`).
+Les trames d'un tick sont regroupées en un seul bloc écrit par un thread dédié :
+l'event loop ne fait jamais d'entrée/sortie disque.
+
+Format d'un fichier `.wtrec` :
+    MAGIC | longueur de l'en-tête JSON (uint32 LE) | en-tête JSON
+    puis, par trame : horodatage (float64 LE) | id de source (uint8) | longueur (uint32 LE) | corps
+"""
+
+import json
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from .upstream import WarThunderClient
+
+MAGIC: bytes = b"WTREC\x01"
+FRAME_HEADER = struct.Struct("<dBI")
+_LENGTH = struct.Struct("<I")
+
+#: Sources enregistrées par défaut (map_info permet de rejouer la grille de la carte).
+DEFAULT_SOURCES: tuple[str, ...] = (
+    WarThunderClient.INDICATORS,
+    WarThunderClient.STATE,
+    WarThunderClient.MAP_INFO,
+    WarThunderClient.MAP_OBJECTS,
+    WarThunderClient.MAP_IMG,
+)
+
+
+class RecordedFrame(NamedTuple):
+    """
+    Trame lue depuis un enregistrement.
+
+    :param timestamp: horodatage epoch (secondes) de réception de la réponse.
+    :param source: nom de la source (ex: `WarThunderClient.STATE`).
+    :param body: corps brut de la réponse upstream.
+    """
+
+    timestamp: float
+    source: str
+    body: bytes
+
+
+class SessionRecorder:
+    """
+    Enregistreur de session : un fichier `.wtrec` par partie, écrit par un thread dédié.
+
+    `record` ne fait qu'empiler l'en-tête et le corps de la trame ; `commit`, appelé une fois
+    par tick, les regroupe en un bloc transmis au thread d'écriture via une file bornée.
+    Si le disque ne suit pas, les blocs en excès sont abandonnés (et comptés) plutôt que
+    de bloquer l'event loop ou de faire croître la mémoire.
+
+    :param directory: dossier où créer les enregistrements.
+    :type directory: str | Path
+    :param sources: sources enregistrées.
+    :type sources: tuple[str, ...]
+    :param max_pending_batches: nombre maximal de blocs en attente d'écriture.
+    :type max_pending_batches: int
+    :param flush_interval: délai (secondes) d'inactivité avant vidage du tampon fichier.
+    :type flush_interval: float
+    :return: instance de SessionRecorder
+    :except: ValueError si une source est inconnue.
+    """
+
+    def __init__(
+            self,
+            directory,
+            sources: tuple[str, ...] = DEFAULT_SOURCES,
+            max_pending_batches: int = 256,
+            flush_interval: float = 1.0
+    ):
+        unknown = set(sources) - set(WarThunderClient.PATHS)
+        if unknown:
+            raise ValueError(f"Unknown upstream source(s): {', '.join(sorted(unknown))}")
+        self.directory = Path(directory)
+        self.sources = tuple(sources)
+        self.flush_interval = flush_interval
+        self.generation: Optional[int] = None
+        self.path: Optional[Path] = None
+        self.frames_recorded = 0
+        self.bytes_recorded = 0
+        self.batches_dropped = 0
+        self._source_ids = {source: index for index, source in enumerate(self.sources)}
+        self._frames: list[bytes] = []
+        self._header = b""
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """
+        Indique si le thread d'écriture est actif.
+
+        :param: None
+        :return: True si l'enregistrement est démarré.
+        :except: Aucun.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Crée le dossier d'enregistrement et démarre le thread d'écriture.
+
+        :param: None
+        :return: None
+        :except: OSError si le dossier ne peut pas être créé.
+        """
+        if self.running:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._write_loop, name="war-thunder-recorder", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Écrit les trames en attente, puis arrête le thread d'écriture (bloquant).
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        if not self.running:
+            return
+        self.commit(self.generation)
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def record(self, source: str, timestamp: float, body: bytes) -> None:
+        """
+        Ajoute une réponse upstream au bloc du tick courant.
+
+        :param source: nom de la source.
+        :param timestamp: horodatage epoch (secondes) de réception.
+        :param body: corps brut de la réponse.
+        :return: None
+        :except: Aucun; les sources non enregistrées sont ignorées.
+        """
+        source_id = self._source_ids.get(source)
+        if source_id is None or self._thread is None:
+            return
+        self._frames += (FRAME_HEADER.pack(timestamp, source_id, len(body)), body)
+
+    def commit(self, generation: Optional[int]) -> None:
+        """
+        Transmet les trames du tick au thread d'écriture, en changeant de fichier si la partie a changé.
+
+        :param generation: génération de carte courante (None si inconnue : le fichier courant est conservé).
+        :return: None
+        :except: Aucun; un bloc refusé par la file pleine est compté dans `batches_dropped`.
+        """
+        if self._thread is None:
+            return
+        if self.path is None or (generation is not None and generation != self.generation):
+            self._rotate(generation)
+        if not self._frames:
+            return
+        frames, self._frames = self._frames, []
+        data = b"".join(frames)
+        try:
+            self._queue.put_nowait((self.path, self._header, data))
+        except queue.Full:
+            self.batches_dropped += 1
+            return
+        self.frames_recorded += len(frames) // 2
+        self.bytes_recorded += len(data)
+
+    def _rotate(self, generation: Optional[int]) -> None:
+        """
+        Choisit le fichier de la nouvelle partie et prépare son en-tête.
+
+        :param generation: génération de carte de la partie.
+        :return: None
+        :except: Aucun.
+        """
+        started_at = time.time()
+        self.generation = generation
+        self.path = self.directory / f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(started_at))}" \
+                                     f"-gen{generation if generation is not None else 'unknown'}.wtrec"
+        meta = json.dumps({
+            "sources": list(self.sources),
+            "generation": generation,
+            "started_at": started_at,
+        }).encode("utf-8")
+        self._header = MAGIC + _LENGTH.pack(len(meta)) + meta
+
+    def _write_loop(self) -> None:
+        """
+        Boucle du thread d'écriture : ajoute chaque bloc au fichier de sa partie.
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        current: Optional[Path] = None
+        file = None
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    if file is not None:
+                        file.flush()
+                    continue
+                if item is None:
+                    break
+                path, header, data = item
+                if path != current:
+                    if file is not None:
+                        file.close()
+                    file = open(path, "ab")
+                    if file.tell() == 0:
+                        file.write(header)
+                    current = path
+                file.write(data)
+        finally:
+            if file is not None:
+                file.close()
+
+
+def read_header(file) -> dict:
+    """
+    Lit l'en-tête d'un enregistrement ouvert en binaire.
+
+    :param file: fichier positionné au début de l'enregistrement.
+    :return: dict de l'en-tête (`sources`, `generation`, `started_at`).
+    :except: ValueError si le fichier n'est pas un enregistrement `.wtrec`.
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{getattr(file, 'name', file)} is not a War Thunder recording")
+    (length,) = _LENGTH.unpack(file.read(_LENGTH.size))
+    return json.loads(file.read(length))
+
+
+def iter_records(path) -> Iterator[RecordedFrame]:
+    """
+    Itère sur les trames d'un enregistrement, dans l'ordre d'écriture.
+
+    Une trame finale tronquée (arrêt brutal pendant l'écriture) est ignorée.
+
+    :param path: chemin du fichier `.wtrec`.
+    :return: itérateur de `RecordedFrame`.
+    :except: ValueError si le fichier n'est pas un enregistrement `.wtrec`.
+    """
+    with open(path, "rb") as file:
+        sources = read_header(file)["sources"]
+        while True:
+            header = file.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                return
+            timestamp, source_id, length = FRAME_HEADER.unpack(header)
+            body = file.read(length)
+            if len(body) < length:
+                return
+            yield RecordedFrame(timestamp, sources[source_id], body)
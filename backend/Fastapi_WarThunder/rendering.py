@@ -0,0 +1,318 @@
+"""
+Rendu côté serveur de la carte : image de la carte, grille, aérodromes et objets en une seule image.
+
+Destiné aux clients peu puissants, qui affichent alors une simple image au lieu de redessiner
+la carte et des dizaines de marqueurs. Le rendu (Pillow, dépendance optionnelle) s'exécute dans
+un thread de travail pour ne pas bloquer l'event loop. Une image est produite au plus une fois
+par tick, format et taille, puis partagée par tous les clients ; elle est réutilisée telle quelle
+(même ETag) tant qu'aucun objet n'a bougé d'un pixel.
+"""
+
+import asyncio
+import hashlib
+import io
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException
+
+from .columnar import ICONS, MISSING, TYPES, MapObjectColumns
+from .map_image import MapImage
+from .metrics import Metrics
+from .schemas import MapInfoModel
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = ImageDraw = None
+
+PNG = "png"
+WEBP = "webp"
+#: Formats de sortie de /map_render, et leur type MIME.
+MEDIA_TYPES: dict[str, str] = {PNG: "image/png", WEBP: "image/webp"}
+
+#: Bornes de la taille (côté, en pixels) de l'image rendue ; la taille demandée est arrondie à `SIZE_STEP`.
+MIN_SIZE: int = 64
+MAX_SIZE: int = 2048
+SIZE_STEP: int = 64
+#: Taille par défaut de l'image rendue.
+DEFAULT_SIZE: int = 1024
+#: Nombre d'images (couples format, taille) conservées ; les moins récemment rendues sont évincées.
+MAX_FRAMES: int = 8
+
+#: Couleur des objets sans couleur, et des lignes de la grille (RGBA).
+DEFAULT_COLOR: tuple[int, int, int] = (255, 255, 0)
+GRID_COLOR: tuple[int, int, int, int] = (255, 255, 255, 60)
+
+_PLAYER_ICON = ICONS.index("Player")
+_AIRFIELD = TYPES.index("airfield")
+_AIRCRAFT = TYPES.index("aircraft")
+
+
+@dataclass(frozen=True)
+class RenderedMap:
+    """
+    Image composée pour un tick, partagée par tous les clients.
+
+    :param seq: numéro de l'instantané le plus récent servi par cette image.
+    :type seq: int
+    :param scene: clé de la scène dessinée (image de fond, grille et objets au pixel près).
+    :type scene: tuple
+    :param content: octets de l'image encodée.
+    :type content: bytes
+    :param media_type: type MIME de l'image.
+    :type media_type: str
+    :return: instance de RenderedMap
+    :except: Aucun
+    """
+
+    seq: int
+    scene: tuple
+    content: bytes
+    media_type: str
+
+    @property
+    def etag(self) -> str:
+        """
+        ETag fort de l'image, identique tant que la scène ne change pas.
+
+        :param: None
+        :return: ETag entre guillemets.
+        :except: Aucun.
+        """
+        return f'"{hashlib.sha1(repr(self.scene).encode("utf-8")).hexdigest()}"'
+
+
+def _rgb(columns: MapObjectColumns, code: int) -> tuple[int, int, int]:
+    """
+    Couleur d'un objet, d'après le dictionnaire de couleurs de la trame.
+
+    :param columns: objets de la trame.
+    :param code: code de couleur de l'objet.
+    :return: couleur (r, g, b).
+    :except: Aucun.
+    """
+    if code == MISSING:
+        return DEFAULT_COLOR
+    color_hex, color_rgb = columns.colors[code]
+    if color_rgb is not None and len(color_rgb) >= 3:
+        return tuple(color_rgb[:3])
+    if color_hex and len(color_hex) == 7:
+        return tuple(int(color_hex[i:i + 2], 16) for i in (1, 3, 5))
+    return DEFAULT_COLOR
+
+
+def _grid_lines(map_info: Optional[MapInfoModel]) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    """
+    Positions normalisées des lignes de la grille de la carte.
+
+    :param map_info: informations de carte (optionnel).
+    :return: tuple (abscisses des lignes verticales, ordonnées des lignes horizontales).
+    :except: Aucun; une carte inconnue ou dégénérée n'a pas de grille.
+    """
+    if map_info is None or not map_info.valid:
+        return (), ()
+    try:
+        (min_x, min_y), (max_x, max_y) = map_info.map_min[:2], map_info.map_max[:2]
+        (step_x, step_y), (zero_x, zero_y) = map_info.grid_steps[:2], map_info.grid_zero[:2]
+    except ValueError:
+        return (), ()
+    width, height = max_x - min_x, max_y - min_y
+    if width <= 0 or height <= 0 or step_x <= 0 or step_y <= 0:
+        return (), ()
+    # Les coordonnées monde croissent vers le nord ; l'image, vers le bas.
+    columns = tuple(
+        (zero_x + k * step_x - min_x) / width
+        for k in range(math.ceil((min_x - zero_x) / step_x), math.floor((max_x - zero_x) / step_x) + 1)
+    )
+    rows = tuple(
+        (max_y - (zero_y - k * step_y)) / height
+        for k in range(math.ceil((zero_y - max_y) / step_y), math.floor((zero_y - min_y) / step_y) + 1)
+    )
+    return columns, rows
+
+
+def scene_of(
+        image: MapImage,
+        map_info: Optional[MapInfoModel],
+        objects: Optional[MapObjectColumns],
+        size: int,
+        output_format: str
+) -> tuple:
+    """
+    Clé de la scène à dessiner : deux ticks de même clé produisent la même image.
+
+    Les positions sont arrondies au pixel de l'image de sortie et les directions au degré.
+
+    :param image: image de carte de fond.
+    :param map_info: informations de carte du tick (optionnel).
+    :param objects: objets de la carte du tick (optionnel).
+    :param size: côté de l'image de sortie, en pixels.
+    :param output_format: `PNG` ou `WEBP`.
+    :return: tuple hachable décrivant la scène.
+    :except: Aucun.
+    """
+    items = []
+    if objects is not None:
+        floats = objects.floats
+        xs, ys = objects.positions
+        for i in range(objects.count):
+            x, y = xs[i], ys[i]
+            if x != x or y != y:
+                continue
+            dx, dy = floats["dx"][i], floats["dy"][i]
+            heading = round(math.degrees(math.atan2(dx, -dy))) if dx == dx and dy == dy else None
+            extent = None
+            if objects.type[i] == _AIRFIELD:
+                extent = tuple(round(floats[name][i] * size) for name in ("sx", "sy", "ex", "ey"))
+            items.append((
+                objects.type[i], objects.icon[i], _rgb(objects, objects.color[i]),
+                round(x * size), round(y * size), heading, extent
+            ))
+    return image.digest, _grid_lines(map_info), size, output_format, tuple(items)
+
+
+def render_map(image: MapImage, scene: tuple, size: int, output_format: str) -> bytes:
+    """
+    Compose et encode l'image de la carte (appel bloquant, exécuté dans un thread de travail).
+
+    :param image: image de carte de fond.
+    :param scene: clé de la scène (voir `scene_of`).
+    :param size: côté de l'image de sortie, en pixels.
+    :param output_format: `PNG` ou `WEBP`.
+    :return: octets de l'image encodée.
+    :except: OSError si l'image de fond ne peut pas être décodée.
+    """
+    _digest, (grid_x, grid_y), _size, _format, items = scene
+    with Image.open(io.BytesIO(image.content)) as source:
+        frame = source.convert("RGBA").resize((size, size), Image.BILINEAR)
+    overlay = Image.new("RGBA", frame.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    for x in grid_x:
+        draw.line([(x * size, 0), (x * size, size)], fill=GRID_COLOR, width=1)
+    for y in grid_y:
+        draw.line([(0, y * size), (size, y * size)], fill=GRID_COLOR, width=1)
+
+    radius = max(2.0, size / 160)
+    for kind, icon, rgb, x, y, heading, extent in items:
+        if extent is not None:
+            draw.line([extent[:2], extent[2:]], fill=rgb + (255,), width=max(2, round(radius)))
+            continue
+        if heading is not None and (icon == _PLAYER_ICON or kind == _AIRCRAFT):
+            scale = radius * (2.0 if icon == _PLAYER_ICON else 1.5)
+            angle = math.radians(heading)
+            points = [
+                (x + scale * math.sin(angle + offset) * length, y - scale * math.cos(angle + offset) * length)
+                for offset, length in ((0.0, 1.4), (2.5, 1.0), (-2.5, 1.0))
+            ]
+            draw.polygon(points, fill=rgb + (255,), outline=(0, 0, 0, 255))
+        else:
+            draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=rgb + (255,), outline=(0, 0, 0, 255))
+
+    frame.alpha_composite(overlay)
+    buffer = io.BytesIO()
+    if output_format == WEBP:
+        frame.convert("RGB").save(buffer, format="WEBP", quality=80, method=2)
+    else:
+        frame.convert("RGB").save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def snap_size(size: int) -> int:
+    """
+    Arrondit une taille demandée au multiple de `SIZE_STEP` le plus proche, dans les bornes.
+
+    Limiter les tailles possibles permet à des clients aux écrans voisins de partager la même image.
+
+    :param size: côté demandé, en pixels.
+    :return: côté effectivement rendu.
+    :except: Aucun.
+    """
+    return min(MAX_SIZE, max(MIN_SIZE, round(size / SIZE_STEP) * SIZE_STEP))
+
+
+class MapRenderer:
+    """
+    Rendu partagé de la carte composée : au plus un rendu par tick, format et taille.
+
+    Les requêtes concurrentes d'un même tick attendent le rendu en cours au lieu d'en lancer
+    un autre ; un tick dont la scène est identique à la précédente réutilise l'image déjà encodée.
+
+    :param metrics: registre de métriques (durée des rendus, taux de réutilisation).
+    :type metrics: Metrics
+    :return: instance de MapRenderer
+    :except: Aucun
+    """
+
+    CACHE = "map_render"
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self.frames: dict[tuple[str, int], RenderedMap] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Indique si Pillow est installé.
+
+        :param: None
+        :return: True si le rendu est possible.
+        :except: Aucun.
+        """
+        return Image is not None
+
+    async def render(
+            self,
+            seq: int,
+            image: MapImage,
+            map_info: Optional[MapInfoModel],
+            objects: Optional[MapObjectColumns],
+            size: int,
+            output_format: str = PNG
+    ) -> RenderedMap:
+        """
+        Renvoie l'image composée d'un tick, en la rendant dans un thread de travail si nécessaire.
+
+        :param seq: numéro de l'instantané servi.
+        :param image: image de carte de fond.
+        :param map_info: informations de carte du tick (optionnel).
+        :param objects: objets de la carte du tick (optionnel).
+        :param size: côté de l'image de sortie, en pixels.
+        :param output_format: `PNG` ou `WEBP`.
+        :return: `RenderedMap` du tick.
+        :except: HTTPException(501) si Pillow n'est pas installé; HTTPException(502) si l'image
+            de la carte ne peut pas être décodée.
+        """
+        if not self.available():
+            raise HTTPException(status_code=501, detail="Map rendering requires Pillow (pip install pillow)")
+        key = (output_format, size)
+        frame = self.frames.get(key)
+        if frame is not None and frame.seq >= seq:
+            self.metrics.cache_hit(self.CACHE, True)
+            return frame
+        async with self._lock:
+            frame = self.frames.get(key)
+            if frame is not None and frame.seq >= seq:
+                self.metrics.cache_hit(self.CACHE, True)
+                return frame
+            scene = scene_of(image, map_info, objects, size, output_format)
+            if frame is not None and frame.scene == scene:
+                self.metrics.cache_hit(self.CACHE, True)
+                frame = RenderedMap(seq=seq, scene=scene, content=frame.content, media_type=frame.media_type)
+            else:
+                self.metrics.cache_hit(self.CACHE, False)
+                started = time.perf_counter()
+                try:
+                    content = await asyncio.to_thread(render_map, image, scene, size, output_format)
+                except OSError as exc:
+                    raise HTTPException(status_code=502, detail=f"Cannot decode the map image: {exc}")
+                self.metrics.render_seconds.observe(time.perf_counter() - started, output_format)
+                frame = RenderedMap(seq=seq, scene=scene, content=content, media_type=MEDIA_TYPES[output_format])
+            self.frames.pop(key, None)
+            self.frames[key] = frame
+            while len(self.frames) > MAX_FRAMES:
+                del self.frames[next(iter(self.frames))]
+            return frame
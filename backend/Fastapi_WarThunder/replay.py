@@ -0,0 +1,245 @@
+"""
+Serveur local remplaçant War Thunder, qui rejoue une session enregistrée (`.wtrec`).
+
+Il expose les mêmes chemins que le serveur web intégré du jeu (/indicators, /state,
+/map_info.json, /map_obj.json, /map.img) : le backend peut y être pointé via
+`--war-thunder-ip`/`--war-thunder-port` pour les tests de charge et de non-régression.
+"""
+
+import asyncio
+import mmap
+import random
+import time
+from array import array
+from bisect import bisect_right
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Response
+
+from .recorder import FRAME_HEADER, read_header
+from .upstream import WarThunderClient
+
+#: Délai (secondes) de fermeture d'une connexion keep-alive inactive, à servir par Uvicorn.
+#: Il doit dépasser le `keepalive_expiry` du client (30 s par défaut) : sinon le serveur ferme
+#: des connexions que le pool réutilise au même moment, et les requêtes échouent en ReadError.
+KEEPALIVE_TIMEOUT: int = 60
+
+
+def sniff_content_type(body: bytes, source: str) -> str:
+    """
+    Devine le type MIME d'une trame enregistrée (le type d'origine n'est pas conservé).
+
+    :param body: corps brut de la trame.
+    :param source: nom de la source.
+    :return: type MIME.
+    :except: Aucun.
+    """
+    if source != WarThunderClient.MAP_IMG:
+        return "application/json"
+    if body.startswith(b"\x89PNG"):
+        return "image/png"
+    if body.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    return "application/octet-stream"
+
+
+class Recording:
+    """
+    Enregistrement `.wtrec` projeté en mémoire (mmap), indexé par source et par horodatage.
+
+    Seul l'index (horodatage, position, longueur) est chargé : la mémoire utilisée ne dépend
+    pas de la durée de l'enregistrement.
+
+    :param path: chemin du fichier `.wtrec`.
+    :type path: str
+    :return: instance de Recording
+    :except: ValueError si le fichier n'est pas un enregistrement ou ne contient aucune trame.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self.header = read_header(file)
+            data_start = file.tell()
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        sources = self.header["sources"]
+        self._timestamps = {source: array("d") for source in sources}
+        self._offsets = {source: array("q") for source in sources}
+        self._lengths = {source: array("I") for source in sources}
+        position, size = data_start, len(self._mmap)
+        while position + FRAME_HEADER.size <= size:
+            timestamp, source_id, length = FRAME_HEADER.unpack_from(self._mmap, position)
+            position += FRAME_HEADER.size
+            if position + length > size:
+                break
+            source = sources[source_id]
+            self._timestamps[source].append(timestamp)
+            self._offsets[source].append(position)
+            self._lengths[source].append(length)
+            position += length
+
+        starts = [timestamps[0] for timestamps in self._timestamps.values() if timestamps]
+        if not starts:
+            raise ValueError(f"{path} contains no frame")
+        self.start = min(starts)
+        self.end = max(timestamps[-1] for timestamps in self._timestamps.values() if timestamps)
+
+    @property
+    def duration(self) -> float:
+        """
+        Durée couverte par l'enregistrement.
+
+        :param: None
+        :return: durée en secondes.
+        :except: Aucun.
+        """
+        return self.end - self.start
+
+    def frame_at(self, source: str, timestamp: float) -> Optional[bytes]:
+        """
+        Renvoie la dernière trame d'une source reçue à `timestamp` (la première si aucune ne l'a été).
+
+        :param source: nom de la source.
+        :param timestamp: horodatage epoch dans le temps de l'enregistrement.
+        :return: corps brut de la trame, ou None si la source n'a jamais été enregistrée.
+        :except: Aucun.
+        """
+        timestamps = self._timestamps.get(source)
+        if not timestamps:
+            return None
+        index = max(bisect_right(timestamps, timestamp) - 1, 0)
+        offset = self._offsets[source][index]
+        return self._mmap[offset:offset + self._lengths[source][index]]
+
+    def close(self) -> None:
+        """
+        Libère la projection mémoire du fichier.
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        self._mmap.close()
+
+
+class ReplayApp(FastAPI):
+    """
+    Application FastAPI imitant le serveur web de War Thunder à partir d'un enregistrement.
+
+    :param RECORDING_PATH: chemin du fichier `.wtrec` à rejouer.
+    :type RECORDING_PATH: str
+    :param SPEED: vitesse de lecture (1.0 = temps réel).
+    :type SPEED: float
+    :param LOOP: reprend la lecture au début une fois l'enregistrement terminé.
+    :type LOOP: bool
+    :param LATENCY: latence ajoutée à chaque réponse, en secondes.
+    :type LATENCY: float
+    :param JITTER: variation aléatoire maximale (±) de la latence, en secondes.
+    :type JITTER: float
+    :return: instance de `ReplayApp` prête à être lancée par Uvicorn.
+    :except: ValueError si l'enregistrement est invalide ou si un paramètre est hors bornes.
+    """
+
+    def __init__(
+            self,
+            RECORDING_PATH: str,
+            SPEED: float = 1.0,
+            LOOP: bool = False,
+            LATENCY: float = 0.0,
+            JITTER: float = 0.0
+    ):
+        if SPEED <= 0:
+            raise ValueError("Playback speed must be strictly positive")
+        if LATENCY < 0 or JITTER < 0:
+            raise ValueError("Latency and jitter must be positive")
+        self.recording = Recording(RECORDING_PATH)
+        self.speed = SPEED
+        self.loop = LOOP
+        self.latency = LATENCY
+        self.jitter = JITTER
+        self.started_at = time.monotonic()
+
+        super().__init__(lifespan=self._lifespan)
+        self.title = "War Thunder Replay"
+        self.version = "1.0.0"
+        self.description = "Stand-in for the War Thunder web server, serving a recorded session"
+        self.add_routes()
+
+    @asynccontextmanager
+    async def _lifespan(self, _app: FastAPI):
+        """
+        Démarre l'horloge de lecture au lancement du serveur et ferme l'enregistrement à l'arrêt.
+
+        :param _app: instance FastAPI (elle-même), imposée par la signature de lifespan.
+        :return: générateur asynchrone utilisé comme context manager par Starlette.
+        :except: Aucun.
+        """
+        self.started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.recording.close()
+
+    def position(self) -> float:
+        """
+        Position de lecture courante, dans le temps de l'enregistrement.
+
+        :param: None
+        :return: horodatage epoch de l'enregistrement correspondant à l'instant présent.
+        :except: Aucun.
+        """
+        elapsed = (time.monotonic() - self.started_at) * self.speed
+        duration = self.recording.duration
+        if self.loop and duration > 0:
+            elapsed %= duration
+        return self.recording.start + min(elapsed, duration)
+
+    def add_routes(self):
+        """
+        Enregistre une route par chemin upstream de War Thunder.
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        for source, path in WarThunderClient.PATHS.items():
+            self.add_api_route(
+                path=f"/{path}",
+                endpoint=self._endpoint(source),
+                methods=["GET"],
+                tags=["Replay"],
+                summary=f"Replay {path}"
+            )
+
+    def _endpoint(self, source: str):
+        """
+        Construit l'endpoint servant la trame courante d'une source.
+
+        :param source: nom de la source.
+        :return: coroutine d'endpoint FastAPI.
+        :except: Aucun.
+        """
+
+        async def endpoint() -> Response:
+            return await self._serve(source)
+
+        endpoint.__name__ = f"replay_{source}"
+        return endpoint
+
+    async def _serve(self, source: str) -> Response:
+        """
+        Renvoie la trame de la source à la position de lecture, après la latence configurée.
+
+        :param source: nom de la source.
+        :return: Response contenant la trame brute.
+        :except: HTTPException(404) si la source n'a pas été enregistrée.
+        """
+        delay = self.latency + (random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        body = self.recording.frame_at(source, self.position())
+        if body is None:
+            raise HTTPException(status_code=404, detail=f"No '{source}' frame in this recording")
+        return Response(content=body, media_type=sniff_content_type(body, source))
@@ -8,6 +8,7 @@ from .Enum import (
     MapObjectType,
     MapObjectIconBg,
 )
+from .engine import EngineModel
 from .indicators import IndicatorsModel
 from .map_info import MapInfoModel
 from .map_object import MapObjectModel
@@ -18,6 +19,7 @@ __all__ = [
     "MapObjectIcon",
     "MapObjectType",
     "MapObjectIconBg",
+    "EngineModel",
     "IndicatorsModel",
     "MapInfoModel",
     "MapObjectModel",
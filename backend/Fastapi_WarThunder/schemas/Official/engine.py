@@ -0,0 +1,56 @@
+"""
+Modèle Pydantic pour représenter l'état d'un moteur du véhicule (endpoint /state, clés "... N").
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class EngineModel(BaseModel):
+    """
+    Modèle représentant l'état d'un moteur (clés "throttle N, %", "RPM N", ... de l'upstream).
+
+    :param throttle_percent: position de la manette des gaz en pourcentage (optionnel).
+    :type throttle_percent: Optional[float]
+    :param RPM_throttle_percent: position de la manette des RPM en pourcentage (optionnel).
+    :type RPM_throttle_percent: Optional[float]
+    :param mixture_percent: position de la manette de mélange en pourcentage (optionnel).
+    :type mixture_percent: Optional[float]
+    :param radiator_percent: position du radiateur en pourcentage (optionnel).
+    :type radiator_percent: Optional[float]
+    :param compressor_stage: étage du compresseur (optionnel).
+    :type compressor_stage: Optional[int]
+    :param magneto: position de l'allumage (optionnel).
+    :type magneto: Optional[int]
+    :param power_hp: puissance en chevaux (optionnel).
+    :type power_hp: Optional[float]
+    :param RPM: régime moteur en tours/minute (optionnel).
+    :type RPM: Optional[float]
+    :param manifold_pressure_atm: pression du collecteur en atmosphères (optionnel).
+    :type manifold_pressure_atm: Optional[float]
+    :param oil_temp_C: température d'huile en degrés Celsius (optionnel).
+    :type oil_temp_C: Optional[float]
+    :param pitch_deg: pas de l'hélice en degrés (optionnel).
+    :type pitch_deg: Optional[float]
+    :param thrust_kg: poussée en kg (optionnel).
+    :type thrust_kg: Optional[float]
+    :param efficiency_percent: efficacité en pourcentage (optionnel).
+    :type efficiency_percent: Optional[float]
+
+    :return: EngineModel
+    :except: ValidationError si les données ne correspondent pas au modèle Pydantic.
+    """
+    throttle_percent: Optional[float]
+    RPM_throttle_percent: Optional[float]
+    mixture_percent: Optional[float]
+    radiator_percent: Optional[float]
+    compressor_stage: Optional[int]
+    magneto: Optional[int]
+    power_hp: Optional[float]
+    RPM: Optional[float]
+    manifold_pressure_atm: Optional[float]
+    oil_temp_C: Optional[float]
+    pitch_deg: Optional[float]
+    thrust_kg: Optional[float]
+    efficiency_percent: Optional[float]
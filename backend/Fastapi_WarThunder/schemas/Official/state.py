@@ -2,9 +2,11 @@
 Modèle Pydantic pour représenter l'état du véhicule/joueur (contrôles, capteurs, moteurs...).
 """
 
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from .engine import EngineModel
 
 
 class StateModel(BaseModel):
@@ -73,6 +75,8 @@ class StateModel(BaseModel):
     :type thrust1_kg: Optional[float]
     :param efficiency1_percent: efficacité moteur 1 en pourcentage (optionnel).
     :type efficiency1_percent: Optional[float]
+    :param engines: état de chaque moteur, dans l'ordre 1..N (vide si aucun moteur).
+    :type engines: List[EngineModel]
 
     :return: StateModel
     :except: ValidationError si les données ne correspondent pas au modèle Pydantic.
@@ -108,3 +112,4 @@ class StateModel(BaseModel):
     pitch1_deg: Optional[float]
     thrust1_kg: Optional[float]
     efficiency1_percent: Optional[float]
+    engines: List[EngineModel] = Field(default_factory=list)
@@ -8,6 +8,7 @@ from .Official import (
     MapObjectIcon,
     MapObjectType,
     MapObjectIconBg,
+    EngineModel,
     IndicatorsModel,
     MapInfoModel,
     MapObjectModel,
@@ -15,13 +16,19 @@ from .Official import (
 )
 from .compass import CompassDirection, CompassModel
 from .gyroscope import GyroscopeModel
-from .status import Status
+from .history import HistoryModel
+from .map_tiles import MapTilesModel
+from .map_track import MapTrackModel
+from .snapshot import SnapshotModel, SourceStatusModel
+from .squad import PlayerModel, SquadMemberModel, SquadModel
+from .status import CircuitBreakerModel, Status
 
 __all__ = [
     "ArmyEnum",
     "MapObjectIcon",
     "MapObjectType",
     "MapObjectIconBg",
+    "EngineModel",
     "IndicatorsModel",
     "MapInfoModel",
     "MapObjectModel",
@@ -32,5 +39,14 @@ __all__ = [
     "CompassDirection",
     "CompassModel",
     "GyroscopeModel",
+    "HistoryModel",
+    "MapTilesModel",
+    "MapTrackModel",
+    "SnapshotModel",
+    "SourceStatusModel",
+    "PlayerModel",
+    "SquadMemberModel",
+    "SquadModel",
+    "CircuitBreakerModel",
     "Status"
 ]
@@ -0,0 +1,39 @@
+"""
+Module de schéma pour représenter l'historique sous-échantillonné d'un champ numérique.
+"""
+
+from typing import List
+
+from pydantic import BaseModel
+
+
+class HistoryModel(BaseModel):
+    """
+    Représente l'historique d'un champ numérique sur une fenêtre de temps, en colonnes.
+
+    :param field: nom du champ (ex: `H_m`, `speed`).
+    :type field: str
+    :param source: source upstream du champ (`indicators` ou `state`).
+    :type source: str
+    :param since: début de la fenêtre (epoch, secondes).
+    :type since: float
+    :param until: fin de la fenêtre (epoch, secondes).
+    :type until: float
+    :param count: nombre de points de la fenêtre avant sous-échantillonnage.
+    :type count: int
+    :param timestamps: horodatages (epoch, secondes) des points renvoyés.
+    :type timestamps: List[float]
+    :param values: valeurs des points renvoyés, alignées sur `timestamps`.
+    :type values: List[float]
+
+    :return: instance de HistoryModel
+    :except: Aucun
+    """
+
+    field: str
+    source: str
+    since: float
+    until: float
+    count: int
+    timestamps: List[float]
+    values: List[float]
@@ -0,0 +1,39 @@
+"""
+Module de schéma pour décrire la pyramide de tuiles de l'image de la carte.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class MapTilesModel(BaseModel):
+    """
+    Description de la pyramide de tuiles servie par `/map_tiles/{z}/{x}/{y}`.
+
+    :param generation: génération de carte (`MapInfoModel.map_generation`) de l'image découpée.
+    :type generation: Optional[int]
+    :param tile_size: côté d'une tuile, en pixels.
+    :type tile_size: int
+    :param max_zoom: niveau le plus détaillé; le niveau z compte 2^z x 2^z tuiles.
+    :type max_zoom: int
+    :param media_type: type MIME des tuiles.
+    :type media_type: str
+    :param tiles: nombre total de tuiles, tous niveaux confondus.
+    :type tiles: int
+    :param bytes: mémoire occupée par les tuiles encodées, en octets.
+    :type bytes: int
+    :param build_seconds: durée de génération de la pyramide, en secondes.
+    :type build_seconds: float
+
+    :return: instance de MapTilesModel
+    :except: ValidationError si les données ne correspondent pas au modèle Pydantic.
+    """
+
+    generation: Optional[int]
+    tile_size: int
+    max_zoom: int
+    media_type: str
+    tiles: int
+    bytes: int
+    build_seconds: float
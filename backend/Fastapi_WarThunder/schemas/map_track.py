@@ -0,0 +1,33 @@
+"""
+Module de schéma pour représenter un objet de la carte suivi d'une trame à l'autre.
+"""
+
+from typing import Optional
+
+from .Official import MapObjectModel
+
+
+class MapTrackModel(MapObjectModel):
+    """
+    Objet de la carte (voir `MapObjectModel`) complété par son identifiant de piste et sa vitesse estimée.
+
+    :param id: identifiant stable de l'objet tant qu'il reste visible (None si l'objet n'a pas de position).
+    :type id: Optional[int]
+    :param vx: vitesse estimée sur X, en unités de carte normalisées par seconde (None à la première trame).
+    :type vx: Optional[float]
+    :param vy: vitesse estimée sur Y, en unités de carte normalisées par seconde (None à la première trame).
+    :type vy: Optional[float]
+    :param speed: vitesse estimée en m/s (None si la taille de la carte est inconnue).
+    :type speed: Optional[float]
+    :param heading: cap estimé en degrés, 0 = nord, sens horaire (None si l'objet est immobile).
+    :type heading: Optional[float]
+
+    :return: instance de MapTrackModel
+    :except: ValidationError si les données ne correspondent pas au modèle Pydantic.
+    """
+
+    id: Optional[int]
+    vx: Optional[float]
+    vy: Optional[float]
+    speed: Optional[float]
+    heading: Optional[float]
@@ -0,0 +1,64 @@
+"""
+Module de schéma pour représenter un instantané agrégé de toutes les sources War Thunder.
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .Official import IndicatorsModel, MapInfoModel, MapObjectModel, StateModel
+
+
+class SourceStatusModel(BaseModel):
+    """
+    Représente l'état de récupération d'une source upstream dans un instantané.
+
+    :param ok: indique si la source a été récupérée avec succès.
+    :type ok: bool
+    :param fetched_at: horodatage (epoch, secondes) de la réponse ou de l'échec (optionnel).
+    :type fetched_at: Optional[float]
+    :param error: message d'erreur si la source est en échec (optionnel).
+    :type error: Optional[str]
+    :param stale: la source a échoué lors du tick, sa dernière valeur valide est servie à la place.
+    :type stale: bool
+
+    :return: instance de SourceStatusModel
+    :except: Aucun
+    """
+
+    ok: bool
+    fetched_at: Optional[float] = None
+    error: Optional[str] = None
+    stale: bool = False
+
+
+class SnapshotModel(BaseModel):
+    """
+    Représente un instantané cohérent de toutes les sources, récupérées lors d'un même tick.
+
+    :param seq: numéro de séquence de l'instantané.
+    :type seq: int
+    :param timestamp: horodatage (epoch, secondes) de la fin du tick.
+    :type timestamp: float
+    :param indicators: indicateurs (None si la source est en échec).
+    :type indicators: Optional[IndicatorsModel]
+    :param state: état du véhicule (None si la source est en échec).
+    :type state: Optional[StateModel]
+    :param map_info: informations de la carte (None si la source est en échec).
+    :type map_info: Optional[MapInfoModel]
+    :param map_objects: objets de la carte (None si la source est en échec).
+    :type map_objects: Optional[List[MapObjectModel]]
+    :param sources: état de récupération par source.
+    :type sources: Dict[str, SourceStatusModel]
+
+    :return: instance de SnapshotModel
+    :except: Aucun
+    """
+
+    seq: int
+    timestamp: float
+    indicators: Optional[IndicatorsModel] = None
+    state: Optional[StateModel] = None
+    map_info: Optional[MapInfoModel] = None
+    map_objects: Optional[List[MapObjectModel]] = None
+    sources: Dict[str, SourceStatusModel]
@@ -0,0 +1,76 @@
+"""
+Module de schéma pour représenter les joueurs suivis et la vue agrégée de l'escouade.
+"""
+
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+from .Official import IndicatorsModel, MapObjectModel, StateModel
+from .snapshot import SourceStatusModel
+
+
+class PlayerModel(BaseModel):
+    """
+    Représente un joueur (client War Thunder) suivi par le backend.
+
+    :param name: nom du joueur, utilisé dans les routes `/players/{name}/...`.
+    :type name: str
+    :param upstream: URL du serveur web du jeu de ce joueur.
+    :type upstream: str
+    :param active: indique si une bataille est en cours (polling rapide).
+    :type active: bool
+    :param seq: numéro de séquence du dernier instantané publié (None avant le premier tick).
+    :type seq: Optional[int]
+
+    :return: instance de PlayerModel
+    :except: Aucun
+    """
+
+    name: str
+    upstream: str
+    active: bool
+    seq: Optional[int] = None
+
+
+class SquadMemberModel(BaseModel):
+    """
+    Représente l'état d'un joueur dans la vue d'escouade.
+
+    :param seq: numéro de séquence de l'instantané du joueur.
+    :type seq: int
+    :param timestamp: horodatage (epoch, secondes) de la fin du tick.
+    :type timestamp: float
+    :param indicators: indicateurs (None si la source est en échec).
+    :type indicators: Optional[IndicatorsModel]
+    :param state: état du véhicule (None si la source est en échec).
+    :type state: Optional[StateModel]
+    :param position: objet `Player` de la carte du joueur (None si absent ou en échec).
+    :type position: Optional[MapObjectModel]
+    :param sources: état de récupération par source.
+    :type sources: Dict[str, SourceStatusModel]
+
+    :return: instance de SquadMemberModel
+    :except: Aucun
+    """
+
+    seq: int
+    timestamp: float
+    indicators: Optional[IndicatorsModel] = None
+    state: Optional[StateModel] = None
+    position: Optional[MapObjectModel] = None
+    sources: Dict[str, SourceStatusModel]
+
+
+class SquadModel(BaseModel):
+    """
+    Représente la vue agrégée de tous les joueurs suivis.
+
+    :param players: état de chaque joueur, par nom.
+    :type players: Dict[str, SquadMemberModel]
+
+    :return: instance de SquadModel
+    :except: Aucun
+    """
+
+    players: Dict[str, SquadMemberModel]
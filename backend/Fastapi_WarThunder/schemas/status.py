@@ -1,21 +1,52 @@
 """
-Module de schéma pour représenter l'état de l'API.
+Module de schéma pour représenter l'état de l'API et des disjoncteurs upstream.
 """
 
+from typing import Dict, Optional
+
 from pydantic import BaseModel
 
 
+class CircuitBreakerModel(BaseModel):
+    """
+    Représente l'état du disjoncteur d'une source upstream.
+
+    :param state: `closed` (requêtes normales) ou `open` (échec immédiat, sondes en tâche de fond).
+    :type state: str
+    :param failures: nombre d'échecs réseau consécutifs.
+    :type failures: int
+    :param last_error: dernière erreur réseau relevée (optionnel).
+    :type last_error: Optional[str]
+    :param opened_at: horodatage (epoch, secondes) de l'ouverture (None si fermé).
+    :type opened_at: Optional[float]
+    :param next_probe_in: délai (secondes) avant la prochaine sonde (None si fermé).
+    :type next_probe_in: Optional[float]
+
+    :return: instance de CircuitBreakerModel
+    :except: Aucun
+    """
+
+    state: str
+    failures: int = 0
+    last_error: Optional[str] = None
+    opened_at: Optional[float] = None
+    next_probe_in: Optional[float] = None
+
+
 class Status(BaseModel):
     """
     Représente l'état simple de l'API.
 
-    :param status: code texte de l'état (ex: 'ok').
+    :param status: code texte de l'état (`ok`, ou `degraded` si un disjoncteur est ouvert).
     :type status: str
     :param message: message lisible décrivant l'état.
     :type message: str
+    :param upstreams: disjoncteurs par joueur puis par source upstream.
+    :type upstreams: Dict[str, Dict[str, CircuitBreakerModel]]
     :return: instance de Status
     :except: Aucun
     """
 
     status: str
-    message: str
\ No newline at end of file
+    message: str
+    upstreams: Dict[str, Dict[str, CircuitBreakerModel]] = {}
@@ -0,0 +1,298 @@
+"""
+Index spatial des objets de la carte et requêtes de voisinage (`?bbox=`, `?near=&radius=`, `?k=`).
+
+`SpatialIndex` range les positions normalisées d'une trame dans une grille uniforme
+stockée de façon compacte (tri par comptage : un tableau de débuts de cases et un tableau
+d'indices). Il est construit une seule fois par instantané et partagé par toutes les
+requêtes, dont le coût ne dépend que des cases parcourues et du nombre de résultats.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from .columnar import ICONS, MISSING, MapObjectColumns
+
+#: Valeur de `near` désignant la position du joueur.
+PLAYER: str = "player"
+
+#: Camps filtrables par `side` : ennemis (rouge sur la carte) ou alliés (toute autre couleur, joueur exclu).
+ENEMY: str = "enemy"
+ALLY: str = "ally"
+SIDES: tuple[str, ...] = (ENEMY, ALLY)
+
+#: Nombre maximal de cases par côté de la grille.
+MAX_GRID: int = 64
+
+_PLAYER_ICON = ICONS.index("Player")
+
+
+def is_enemy(rgb: Optional[tuple[int, ...]]) -> bool:
+    """
+    Indique si une couleur d'objet est celle des ennemis (rouge dominant, ex: `#fa0C00`).
+
+    :param rgb: couleur [r, g, b] de l'objet (optionnel).
+    :return: True pour une couleur ennemie.
+    :except: Aucun.
+    """
+    if rgb is None or len(rgb) < 3:
+        return False
+    red, green, blue = rgb[:3]
+    return red >= 128 and red > 2 * green and red > 2 * blue
+
+
+def _floats(value: str, count: int, name: str) -> tuple[float, ...]:
+    """
+    Analyse une liste de nombres séparés par des virgules.
+
+    :param value: valeur brute du paramètre.
+    :param count: nombre de valeurs attendu.
+    :param name: nom du paramètre, pour le message d'erreur.
+    :return: tuple de nombres.
+    :except: ValueError si le nombre de valeurs ou l'une d'elles est invalide.
+    """
+    try:
+        numbers = tuple(float(item) for item in value.split(","))
+    except ValueError:
+        numbers = ()
+    if len(numbers) != count or not all(math.isfinite(number) for number in numbers):
+        raise ValueError(f"{name} expects {count} comma-separated numbers, got {value!r}")
+    return numbers
+
+
+@dataclass(frozen=True)
+class MapQuery:
+    """
+    Filtre de voisinage appliqué aux objets de la carte.
+
+    :param bbox: rectangle (x_min, y_min, x_max, y_max) en coordonnées normalisées (optionnel).
+    :type bbox: Optional[tuple[float, float, float, float]]
+    :param near: centre de la recherche : `PLAYER` ou un point (x, y) normalisé (optionnel).
+    :type near: Optional[Union[str, tuple[float, float]]]
+    :param radius: distance maximale au centre, en unités normalisées (optionnel).
+    :type radius: Optional[float]
+    :param k: nombre d'objets les plus proches du centre à renvoyer (optionnel).
+    :type k: Optional[int]
+    :param side: camp des objets renvoyés (`ENEMY`, `ALLY`; tous si None).
+    :type side: Optional[str]
+    :return: instance de MapQuery
+    :except: Aucun
+    """
+
+    bbox: Optional[tuple[float, float, float, float]] = None
+    near: Optional[Union[str, tuple[float, float]]] = None
+    radius: Optional[float] = None
+    k: Optional[int] = None
+    side: Optional[str] = None
+
+    @classmethod
+    def parse(
+            cls,
+            bbox: Optional[str] = None,
+            near: Optional[str] = None,
+            radius: Optional[float] = None,
+            k: Optional[int] = None,
+            side: Optional[str] = None
+    ) -> Optional["MapQuery"]:
+        """
+        Construit un filtre à partir des paramètres de requête.
+
+        :param bbox: `x_min,y_min,x_max,y_max`.
+        :param near: `player` ou `x,y`.
+        :param radius: distance maximale à `near`.
+        :param k: nombre de voisins de `near`.
+        :param side: `enemy` ou `ally`.
+        :return: `MapQuery`, ou None si aucun filtre n'est demandé.
+        :except: ValueError si un paramètre est invalide ou si `radius`/`k` est donné sans `near`.
+        """
+        if bbox is None and near is None and radius is None and k is None and side is None:
+            return None
+        box = None
+        if bbox is not None:
+            x_min, y_min, x_max, y_max = _floats(bbox, 4, "bbox")
+            if x_min > x_max or y_min > y_max:
+                raise ValueError("bbox expects x_min,y_min,x_max,y_max with min <= max")
+            box = (x_min, y_min, x_max, y_max)
+        center = None
+        if near is not None:
+            center = PLAYER if near == PLAYER else _floats(near, 2, "near")
+        elif radius is not None or k is not None:
+            raise ValueError("radius and k require near (player or x,y)")
+        if radius is not None and radius < 0:
+            raise ValueError("radius must be positive")
+        if k is not None and k <= 0:
+            raise ValueError("k must be strictly positive")
+        if side is not None and side not in SIDES:
+            raise ValueError(f"Unknown side {side!r}. Available sides: {', '.join(SIDES)}")
+        return cls(bbox=box, near=center, radius=radius, k=k, side=side)
+
+
+class SpatialIndex:
+    """
+    Grille uniforme sur les positions normalisées des objets d'une trame.
+
+    La grille compte environ un objet par case (au plus `MAX_GRID` cases par côté) ; les
+    positions hors de [0, 1] sont rangées dans les cases du bord. Les objets sans position
+    ne sont pas indexés.
+
+    :param objects: objets de la trame, en colonnes.
+    :type objects: MapObjectColumns
+    :return: instance de SpatialIndex
+    :except: Aucun
+    """
+
+    def __init__(self, objects: MapObjectColumns):
+        self.objects = objects
+        self.xs, self.ys = objects.positions
+        self.size = max(1, min(MAX_GRID, math.isqrt(objects.count)))
+        size, last = self.size, self.size - 1
+        cells = [-1] * objects.count
+        counts = [0] * (size * size + 1)
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            if x == x and y == y:
+                cx, cy = int(x * size), int(y * size)
+                cx = 0 if cx < 0 else last if cx > last else cx
+                cy = 0 if cy < 0 else last if cy > last else cy
+                cell = cy * size + cx
+                cells[i] = cell
+                counts[cell + 1] += 1
+        for cell in range(size * size):
+            counts[cell + 1] += counts[cell]
+        indices = [0] * counts[-1]
+        cursor = counts[:]
+        for i, cell in enumerate(cells):
+            if cell >= 0:
+                indices[cursor[cell]] = i
+                cursor[cell] += 1
+        self.starts = array("l", counts)
+        self.indices = array("l", indices)
+        enemy_colors = [is_enemy(rgb) for _hex, rgb in objects.colors]
+        self.enemy = [code != MISSING and enemy_colors[code] for code in objects.color]
+        self.player = next((i for i, icon in enumerate(objects.icon) if icon == _PLAYER_ICON), None)
+
+    def _cell(self, value: float) -> int:
+        """
+        Case de la grille contenant une coordonnée normalisée (bornée aux cases du bord).
+
+        :param value: coordonnée normalisée.
+        :return: numéro de case sur l'axe.
+        :except: Aucun.
+        """
+        return min(self.size - 1, max(0, int(value * self.size)))
+
+    def _candidates(self, x_min: float, y_min: float, x_max: float, y_max: float):
+        """
+        Parcourt les objets des cases recouvrant un rectangle.
+
+        :param x_min: bord gauche du rectangle.
+        :param y_min: bord haut du rectangle.
+        :param x_max: bord droit du rectangle.
+        :param y_max: bord bas du rectangle.
+        :return: itérateur d'indices d'objets (à filtrer par position exacte).
+        :except: Aucun.
+        """
+        size, starts, indices = self.size, self.starts, self.indices
+        for cy in range(self._cell(y_min), self._cell(y_max) + 1):
+            row = cy * size
+            for cx in range(self._cell(x_min), self._cell(x_max) + 1):
+                cell = row + cx
+                yield from indices[starts[cell]:starts[cell + 1]]
+
+    def _accepts(self, i: int, side: Optional[str]) -> bool:
+        """
+        Indique si un objet appartient au camp demandé.
+
+        :param i: indice de l'objet.
+        :param side: camp demandé (None : tous).
+        :return: True si l'objet est conservé.
+        :except: Aucun.
+        """
+        if side is None:
+            return True
+        if side == ENEMY:
+            return self.enemy[i]
+        return not self.enemy[i] and i != self.player
+
+    def _nearest(self, x: float, y: float, k: int, limit: float, box, side: Optional[str]) -> list[int]:
+        """
+        Recherche des `k` objets les plus proches d'un point, par anneaux de cases croissants.
+
+        :param x: abscisse du centre.
+        :param y: ordonnée du centre.
+        :param k: nombre de voisins.
+        :param limit: distance maximale (infinie si aucun rayon).
+        :param box: rectangle restreignant la recherche (optionnel).
+        :param side: camp demandé (optionnel).
+        :return: indices des voisins, du plus proche au plus lointain.
+        :except: Aucun.
+        """
+        size, starts, indices, xs, ys = self.size, self.starts, self.indices, self.xs, self.ys
+        cx, cy = self._cell(x), self._cell(y)
+        # Hors de la carte, les cases du bord ne bornent plus la distance : pas d'arrêt anticipé.
+        bounded = 0.0 <= x <= 1.0 and 0.0 <= y <= 1.0
+        found: list[tuple[float, int]] = []
+        for ring in range(size):
+            # Toute case de l'anneau `ring` est à au moins (ring - 1) largeurs de case du point.
+            reach = max(0.0, (ring - 1) / size)
+            if bounded and (reach > limit or (len(found) >= k and reach * reach > found[k - 1][0])):
+                break
+            for gy in range(cy - ring, cy + ring + 1):
+                if not 0 <= gy < size:
+                    continue
+                edge = gy in (cy - ring, cy + ring)
+                for gx in (range(cx - ring, cx + ring + 1) if edge else (cx - ring, cx + ring)):
+                    if not 0 <= gx < size:
+                        continue
+                    cell = gy * size + gx
+                    for i in indices[starts[cell]:starts[cell + 1]]:
+                        if i == self.player or not self._accepts(i, side):
+                            continue
+                        px, py = xs[i], ys[i]
+                        if box is not None and not (box[0] <= px <= box[2] and box[1] <= py <= box[3]):
+                            continue
+                        distance2 = (px - x) ** 2 + (py - y) ** 2
+                        if distance2 <= limit * limit:
+                            found.append((distance2, i))
+            found.sort()
+        return [i for _distance2, i in found[:k]]
+
+    def query(self, query: MapQuery) -> list[int]:
+        """
+        Applique un filtre de voisinage.
+
+        Sans `k`, les objets sont renvoyés dans l'ordre de la trame ; avec `k`, du plus proche
+        au plus lointain de `near` (le joueur lui-même est exclu).
+
+        :param query: filtre à appliquer.
+        :return: indices des objets retenus.
+        :except: LookupError si `near=player` alors que le joueur n'est pas sur la carte.
+        """
+        center = query.near
+        if center == PLAYER:
+            if self.player is None:
+                raise LookupError("Player is not on the map")
+            center = (self.xs[self.player], self.ys[self.player])
+        limit = query.radius if query.radius is not None else math.inf
+
+        if query.k is not None:
+            return self._nearest(center[0], center[1], query.k, limit, query.bbox, query.side)
+
+        everywhere = (-math.inf, -math.inf, math.inf, math.inf)
+        x_min, y_min, x_max, y_max = query.bbox if query.bbox is not None else everywhere
+        if center is not None and limit != math.inf:
+            x_min, y_min = max(x_min, center[0] - limit), max(y_min, center[1] - limit)
+            x_max, y_max = min(x_max, center[0] + limit), min(y_max, center[1] + limit)
+        if x_min > x_max or y_min > y_max:
+            return []
+        xs, ys = self.xs, self.ys
+        selected = []
+        for i in self._candidates(max(x_min, 0.0), max(y_min, 0.0), min(x_max, 1.0), min(y_max, 1.0)):
+            px, py = xs[i], ys[i]
+            if not (x_min <= px <= x_max and y_min <= py <= y_max) or not self._accepts(i, query.side):
+                continue
+            if center is not None and (px - center[0]) ** 2 + (py - center[1]) ** 2 > limit * limit:
+                continue
+            selected.append(i)
+        selected.sort()
+        return selected
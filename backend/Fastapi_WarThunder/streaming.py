@@ -0,0 +1,279 @@
+"""
+Diffusion en continu des instantanés de télémétrie vers les clients abonnés.
+
+Ce module transforme la suite des `TelemetrySnapshot` publiés par le poller en trames
+ne contenant que les sujets modifiés, au rythme maximal choisi par chaque abonné.
+"""
+
+import asyncio
+import contextlib
+import json
+from typing import Any, AsyncIterator, Iterable, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from .telemetry import TelemetryPoller, TelemetrySnapshot
+
+T = TypeVar("T")
+
+#: Rythme maximal accepté pour un abonné, en trames par seconde.
+MAX_RATE_LIMIT: float = 50.0
+
+#: Délai (secondes) au-delà duquel un commentaire SSE est envoyé pour garder la connexion ouverte.
+SSE_KEEPALIVE: float = 15.0
+
+#: Délai (secondes) au-delà duquel une trame WebSocket vide (`{}`) est envoyée : garde la connexion
+#: ouverte et révèle la déconnexion d'un client tant que les données ne changent pas (au hangar).
+WS_KEEPALIVE: float = 15.0
+
+SSE_KEYFRAME = "keyframe"
+SSE_DELTA = "delta"
+
+
+def parse_topics(raw: Optional[str]) -> tuple[str, ...]:
+    """
+    Convertit une liste de sujets séparés par des virgules en tuple validé.
+
+    :param raw: sujets demandés (ex: "indicators,compass"); None ou vide pour tous les sujets.
+    :return: tuple des sujets demandés, dans l'ordre de `TelemetrySnapshot.TOPICS`.
+    :except: ValueError si un sujet est inconnu.
+    """
+    if not raw:
+        return TelemetrySnapshot.TOPICS
+    requested = {topic.strip() for topic in raw.split(",") if topic.strip()}
+    unknown = requested - set(TelemetrySnapshot.TOPICS)
+    if unknown:
+        raise ValueError(
+            f"Unknown topic(s): {', '.join(sorted(unknown))}. "
+            f"Available topics: {', '.join(TelemetrySnapshot.TOPICS)}"
+        )
+    return tuple(topic for topic in TelemetrySnapshot.TOPICS if topic in requested)
+
+
+def parse_rate(max_rate: float) -> float:
+    """
+    Valide un rythme maximal de diffusion.
+
+    :param max_rate: rythme demandé, en trames par seconde.
+    :return: le rythme validé.
+    :except: ValueError si le rythme n'est pas dans ]0, MAX_RATE_LIMIT].
+    """
+    if not 0 < max_rate <= MAX_RATE_LIMIT:
+        raise ValueError(f"max_rate must be in ]0, {MAX_RATE_LIMIT:g}]")
+    return max_rate
+
+
+def snapshot_topics(snapshot: TelemetrySnapshot, topics: Iterable[str]) -> tuple[dict[str, Any], dict[str, str]]:
+    """
+    Extrait la forme JSON des sujets demandés d'un instantané.
+
+    :param snapshot: instantané source.
+    :param topics: sujets à extraire.
+    :return: tuple (données par sujet, erreur par sujet en échec).
+    :except: Aucun; les erreurs upstream sont renvoyées dans le second dict.
+    """
+    data: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    for topic in topics:
+        try:
+            data[topic] = snapshot.payload(topic)
+        except HTTPException as exc:
+            errors[topic] = exc.detail
+        except Exception as exc:
+            errors[topic] = str(exc)
+    return data, errors
+
+
+async def iter_snapshots(poller: TelemetryPoller, max_rate: float) -> AsyncIterator[TelemetrySnapshot]:
+    """
+    Itère sur les instantanés publiés, sans dépasser `max_rate` instantanés par seconde.
+
+    Les instantanés publiés entre deux envois sont sautés : l'abonné reçoit toujours le plus récent.
+
+    :param poller: poller dont on suit les publications.
+    :param max_rate: rythme maximal, en instantanés par seconde.
+    :return: itérateur asynchrone de `TelemetrySnapshot`.
+    :except: asyncio.CancelledError si l'abonné se déconnecte.
+    """
+    loop = asyncio.get_running_loop()
+    period = 1.0 / max_rate
+    seq = 0
+    while True:
+        snapshot = await poller.wait_next(seq)
+        started = loop.time()
+        seq = snapshot.seq
+        yield snapshot
+        await asyncio.sleep(max(0.0, period - (loop.time() - started)))
+
+
+async def iter_changes(
+        poller: TelemetryPoller,
+        topics: tuple[str, ...],
+        max_rate: float
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Produit des trames ne contenant que les sujets modifiés depuis la trame précédente.
+
+    Chaque trame a la forme `{"seq": int, "timestamp": float, "data": {...}, "errors": {...}}` ;
+    un sujet passé en erreur n'apparaît dans `errors` que lors du changement d'état.
+
+    :param poller: poller dont on suit les publications.
+    :param topics: sujets suivis par l'abonné.
+    :param max_rate: rythme maximal, en trames par seconde.
+    :return: itérateur asynchrone de trames (dict sérialisables en JSON).
+    :except: asyncio.CancelledError si l'abonné se déconnecte.
+    """
+    last_data: dict[str, Any] = {}
+    last_errors: dict[str, str] = {}
+    async for snapshot in iter_snapshots(poller, max_rate):
+        data, errors = snapshot_topics(snapshot, topics)
+        changed = {topic: value for topic, value in data.items() if last_data.get(topic) != value}
+        failed = {topic: detail for topic, detail in errors.items() if last_errors.get(topic) != detail}
+        for topic in errors:
+            last_data.pop(topic, None)
+        last_data.update(changed)
+        last_errors = errors
+        if changed or failed:
+            yield {"seq": snapshot.seq, "timestamp": snapshot.timestamp, "data": changed, "errors": failed}
+
+
+def diff_payload(previous: Any, current: Any) -> Any:
+    """
+    Calcule le delta d'un sujet entre deux trames.
+
+    Pour un objet (dict), seuls les champs modifiés sont renvoyés, à fusionner côté client
+    dans la valeur précédente ; pour une liste, la nouvelle liste complète est renvoyée.
+
+    :param previous: valeur JSON précédente (None si inconnue du client).
+    :param current: valeur JSON courante.
+    :return: delta à appliquer, ou None si rien n'a changé.
+    :except: Aucun.
+    """
+    if previous == current:
+        return None
+    if isinstance(previous, dict) and isinstance(current, dict):
+        return {key: value for key, value in current.items() if key not in previous or previous[key] != value}
+    return current
+
+
+async def iter_deltas(
+        poller: TelemetryPoller,
+        topics: tuple[str, ...],
+        max_rate: float,
+        keyframe_interval: float
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Produit des trames delta, précédées puis entrecoupées de keyframes complètes.
+
+    La première trame est une keyframe contenant la valeur complète de chaque sujet ;
+    les suivantes ne contiennent que les champs modifiés depuis la trame précédente.
+    Une keyframe est réémise toutes les `keyframe_interval` secondes pour resynchroniser
+    les clients arrivés en cours de route ou ayant perdu une trame.
+
+    :param poller: poller dont on suit les publications.
+    :param topics: sujets suivis par l'abonné.
+    :param max_rate: rythme maximal, en trames par seconde.
+    :param keyframe_interval: intervalle en secondes entre deux keyframes.
+    :return: itérateur asynchrone de tuples (type de trame, trame).
+    :except: asyncio.CancelledError si l'abonné se déconnecte.
+    """
+    loop = asyncio.get_running_loop()
+    last_data: dict[str, Any] = {}
+    last_errors: dict[str, str] = {}
+    next_keyframe = 0.0
+    async for snapshot in iter_snapshots(poller, max_rate):
+        data, errors = snapshot_topics(snapshot, topics)
+        now = loop.time()
+        if now >= next_keyframe:
+            next_keyframe = now + keyframe_interval
+            last_data, last_errors = data, errors
+            yield SSE_KEYFRAME, {"seq": snapshot.seq, "timestamp": snapshot.timestamp, "data": data, "errors": errors}
+            continue
+
+        deltas = {}
+        for topic, value in data.items():
+            delta = diff_payload(last_data.get(topic), value)
+            if delta is not None and (delta or topic not in last_data):
+                deltas[topic] = delta
+        failed = {topic: detail for topic, detail in errors.items() if last_errors.get(topic) != detail}
+        last_data, last_errors = data, errors
+        if deltas or failed:
+            yield SSE_DELTA, {"seq": snapshot.seq, "timestamp": snapshot.timestamp, "data": deltas, "errors": failed}
+
+
+def format_sse(event: str, frame: dict[str, Any]) -> str:
+    """
+    Formate une trame au format texte Server-Sent Events.
+
+    :param event: type d'évènement (`SSE_KEYFRAME` ou `SSE_DELTA`).
+    :param frame: trame JSON portant au moins `seq`.
+    :return: bloc SSE terminé par une ligne vide.
+    :except: TypeError si la trame n'est pas sérialisable en JSON.
+    """
+    data = json.dumps(frame, separators=(",", ":"))
+    return f"id: {frame['seq']}\nevent: {event}\ndata: {data}\n\n"
+
+
+async def iter_sse(
+        poller: TelemetryPoller,
+        topics: tuple[str, ...],
+        max_rate: float,
+        keyframe_interval: float
+) -> AsyncIterator[str]:
+    """
+    Produit le flux texte SSE complet : délai de reconnexion, trames et commentaires keep-alive.
+
+    :param poller: poller dont on suit les publications.
+    :param topics: sujets suivis par l'abonné.
+    :param max_rate: rythme maximal, en trames par seconde.
+    :param keyframe_interval: intervalle en secondes entre deux keyframes.
+    :return: itérateur asynchrone de blocs texte SSE.
+    :except: asyncio.CancelledError si l'abonné se déconnecte.
+    """
+    yield "retry: 1000\n\n"
+    frames = iter_deltas(poller, topics, max_rate, keyframe_interval)
+    async with contextlib.aclosing(iter_keepalive(frames, SSE_KEEPALIVE)) as items:
+        async for item in items:
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            event, frame = item
+            yield format_sse(event, frame)
+
+
+async def iter_keepalive(stream: AsyncIterator[T], interval: float) -> AsyncIterator[Optional[T]]:
+    """
+    Relaie un flux asynchrone en intercalant None chaque fois qu'aucun élément n'arrive pendant `interval`.
+
+    L'attente de l'élément suivant n'est pas interrompue par le keep-alive ; à la fermeture,
+    elle est annulée et terminée avant que le flux lui-même ne soit fermé.
+
+    :param stream: générateur asynchrone à relayer (fermé avec le relais).
+    :param interval: délai en secondes sans élément avant un keep-alive.
+    :return: itérateur asynchrone des éléments du flux, et de None pour chaque keep-alive.
+    :except: asyncio.CancelledError si l'abonné se déconnecte.
+    """
+    frames = stream.__aiter__()
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(frames.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield None
+                continue
+            try:
+                item = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                return
+            pending = None
+            yield item
+    finally:
+        if pending is not None:
+            # Le générateur ne peut être fermé qu'une fois son `__anext__` en cours terminé.
+            pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                await pending
+        await frames.aclose()
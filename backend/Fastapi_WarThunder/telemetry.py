@@ -0,0 +1,716 @@
+"""
+Polling en tâche de fond des sources War Thunder et cache du dernier instantané.
+
+Ce module définit `TelemetrySnapshot`, un instantané immuable et numéroté de toutes les
+sources upstream, et `TelemetryPoller`, la tâche asynchrone qui interroge le jeu une fois
+par tick et publie l'instantané lu par tous les endpoints.
+
+Une source en échec lors d'un tick garde sa dernière valeur valide (`last_good`) : une
+requête qui accepte des données un peu anciennes (`TelemetrySnapshot.within`) la reçoit,
+marquée `stale`, plutôt qu'une erreur 502.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Mapping, Optional
+
+from fastapi import HTTPException
+
+from .columnar import MapObjectColumns
+from .compression import compress
+from .encoding import JSON, encode
+from .history import TelemetryHistory
+from .recorder import SessionRecorder
+from .schemas import (
+    ArmyEnum,
+    IndicatorsModel,
+    MapInfoModel,
+    StateModel,
+    CompassModel,
+    GyroscopeModel
+)
+from .spatial import SpatialIndex
+from .tracking import MapObjectTracker, MapTracks
+from .upstream import WarThunderClient
+
+#: Ancienneté maximale (secondes) par défaut des données servies à la place d'une source en échec.
+DEFAULT_MAX_STALE: float = 1.0
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    """
+    Instantané immuable des sources upstream, produit une fois par tick.
+
+    :param seq: numéro de séquence croissant de l'instantané.
+    :type seq: int
+    :param timestamp: horodatage (epoch, secondes) de la fin du tick.
+    :type timestamp: float
+    :param indicators: indicateurs du tick (None si la source a échoué).
+    :type indicators: Optional[IndicatorsModel]
+    :param state: état du véhicule du tick (None si la source a échoué).
+    :type state: Optional[StateModel]
+    :param map_info: informations de carte du tick (None si la source a échoué).
+    :type map_info: Optional[MapInfoModel]
+    :param map_objects: objets de la carte du tick, en colonnes (None si la source a échoué).
+    :type map_objects: Optional[MapObjectColumns]
+    :param map_tracks: identifiants et vitesses estimées des objets de `map_objects` (optionnel).
+    :type map_tracks: Optional[MapTracks]
+    :param errors: message d'erreur par source en échec.
+    :type errors: Mapping[str, str]
+    :param fetched_at: horodatage (epoch, secondes) de la réponse (ou de l'échec) de chaque source.
+    :type fetched_at: Mapping[str, float]
+    :param last_good: pour chaque source en échec, horodatage et valeur de sa dernière réponse valide
+        (ainsi que `map_tracks` avec `map_objects`).
+    :type last_good: Mapping[str, tuple[float, Any]]
+    :param stale: sources servies depuis `last_good` malgré leur échec, avec l'erreur du tick
+        (renseigné par `within` uniquement).
+    :type stale: Mapping[str, str]
+    :return: instance de TelemetrySnapshot
+    :except: Aucun
+    """
+
+    seq: int
+    timestamp: float
+    indicators: Optional[IndicatorsModel] = None
+    state: Optional[StateModel] = None
+    map_info: Optional[MapInfoModel] = None
+    map_objects: Optional[MapObjectColumns] = None
+    map_tracks: Optional[MapTracks] = None
+    errors: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    fetched_at: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+    last_good: Mapping[str, tuple[float, Any]] = field(default_factory=lambda: MappingProxyType({}))
+    stale: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    _payloads: dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _bodies: dict[tuple[str, str, Optional[str]], bytes] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _views: dict[frozenset[str], "TelemetrySnapshot"] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    GYROSCOPE = "gyroscope"
+    COMPASS = "compass"
+    SPEED = "speed"
+    ALTITUDE = "altitude"
+    MAP_OBJECTS_COLUMNAR = "map_objects_columnar"
+    MAP_TRACKS = "map_tracks"
+    SNAPSHOT = "snapshot"
+    POSITION = "position"
+    SQUAD_MEMBER = "squad_member"
+
+    #: Sujets publiables : sources upstream et valeurs dérivées des indicateurs.
+    TOPICS = (
+        WarThunderClient.INDICATORS,
+        WarThunderClient.STATE,
+        GYROSCOPE,
+        COMPASS,
+        WarThunderClient.MAP_OBJECTS,
+    )
+
+    #: Sources reprises dans le document agrégé (`SNAPSHOT`).
+    SOURCES = (
+        WarThunderClient.INDICATORS,
+        WarThunderClient.STATE,
+        WarThunderClient.MAP_INFO,
+        WarThunderClient.MAP_OBJECTS,
+    )
+
+    #: Documents servis par les routes HTTP : sujets publiables et réponses sans sujet de flux.
+    DOCUMENTS = TOPICS + (
+        WarThunderClient.MAP_INFO, SPEED, ALTITUDE, MAP_OBJECTS_COLUMNAR, MAP_TRACKS, SNAPSHOT, POSITION,
+        SQUAD_MEMBER,
+    )
+
+    #: Sources upstream dont dépend chaque document (les autres documents sont leur propre source).
+    DEPENDENCIES = {
+        GYROSCOPE: (WarThunderClient.INDICATORS,),
+        COMPASS: (WarThunderClient.INDICATORS,),
+        SPEED: (WarThunderClient.STATE,),
+        ALTITUDE: (WarThunderClient.STATE,),
+        MAP_OBJECTS_COLUMNAR: (WarThunderClient.MAP_OBJECTS,),
+        MAP_TRACKS: (WarThunderClient.MAP_OBJECTS,),
+        POSITION: (WarThunderClient.MAP_OBJECTS,),
+        SNAPSHOT: SOURCES,
+        SQUAD_MEMBER: (WarThunderClient.INDICATORS, WarThunderClient.STATE, WarThunderClient.MAP_OBJECTS),
+    }
+
+    def get(self, source: str) -> Any:
+        """
+        Renvoie la valeur d'une source de l'instantané, ou lève l'erreur relevée pendant le tick.
+
+        :param source: nom de la source (ex: `WarThunderClient.STATE`).
+        :return: valeur validée de la source.
+        :except: HTTPException(502) si la source était en échec lors de ce tick.
+        """
+        if source in self.errors:
+            raise HTTPException(status_code=502, detail=self.errors[source])
+        return getattr(self, source)
+
+    def within(self, max_stale: Optional[float]) -> "TelemetrySnapshot":
+        """
+        Renvoie une vue de l'instantané où chaque source en échec reprend sa dernière valeur valide,
+        si celle-ci date de moins de `max_stale` secondes.
+
+        Les sources récupérées lors du tick restent servies telles quelles. Les vues sont calculées
+        une seule fois par instantané et par ensemble de sources reprises : leurs corps encodés sont
+        partagés comme ceux de l'instantané.
+
+        :param max_stale: ancienneté maximale acceptée, en secondes (None ou 0 : aucune reprise).
+        :return: l'instantané lui-même si aucune source n'est reprise, sinon la vue (`stale` renseigné).
+        :except: Aucun.
+        """
+        if not max_stale or not self.last_good:
+            return self
+        now = time.time()
+        sources = frozenset(
+            source for source in self.errors
+            if source in self.last_good and now - self.last_good[source][0] <= max_stale
+        )
+        if not sources:
+            return self
+        view = self._views.get(sources)
+        if view is None:
+            values = {source: self.last_good[source][1] for source in sources}
+            if WarThunderClient.MAP_OBJECTS in sources and self.MAP_TRACKS in self.last_good:
+                values[self.MAP_TRACKS] = self.last_good[self.MAP_TRACKS][1]
+            view = replace(
+                self,
+                errors=MappingProxyType({k: v for k, v in self.errors.items() if k not in sources}),
+                fetched_at=MappingProxyType({**self.fetched_at, **{s: self.last_good[s][0] for s in sources}}),
+                last_good=MappingProxyType({}),
+                stale=MappingProxyType({source: self.errors[source] for source in sources}),
+                **values
+            )
+            self._views[sources] = view
+        return view
+
+    def age(self, topic: str) -> Optional[float]:
+        """
+        Ancienneté des données d'un document : celle de la plus ancienne source dont il dépend.
+
+        :param topic: document parmi `TelemetrySnapshot.DOCUMENTS`.
+        :return: ancienneté en secondes, ou None si aucune de ses sources n'a encore été récupérée.
+        :except: Aucun.
+        """
+        times = [self.fetched_at[s] for s in self.DEPENDENCIES.get(topic, (topic,)) if s in self.fetched_at]
+        if not times:
+            return None
+        return max(0.0, time.time() - min(times))
+
+    def is_stale(self, topic: str) -> bool:
+        """
+        Indique si un document repose sur une source reprise de `last_good` (voir `within`).
+
+        :param topic: document parmi `TelemetrySnapshot.DOCUMENTS`.
+        :return: True si l'une de ses sources est périmée.
+        :except: Aucun.
+        """
+        return any(source in self.stale for source in self.DEPENDENCIES.get(topic, (topic,)))
+
+    @cached_property
+    def spatial_index(self) -> SpatialIndex:
+        """
+        Index spatial des objets de la carte, construit une seule fois par instantané.
+
+        :param: None
+        :return: `SpatialIndex` partagé par toutes les requêtes de voisinage du tick.
+        :except: HTTPException(502) si les objets de la carte étaient en échec lors de ce tick.
+        """
+        return SpatialIndex(self.get(WarThunderClient.MAP_OBJECTS))
+
+    def payload(self, topic: str) -> Any:
+        """
+        Renvoie la forme JSON d'un sujet, calculée une seule fois par instantané.
+
+        :param topic: sujet ou document parmi `TelemetrySnapshot.DOCUMENTS`.
+        :return: valeur sérialisable en JSON.
+        :except: HTTPException(502) si la source du sujet était en échec lors de ce tick.
+        """
+        if topic not in self._payloads:
+            self._payloads[topic] = self._build_payload(topic)
+        return self._payloads[topic]
+
+    def body(self, topic: str, media_type: str = JSON, coding: Optional[str] = None) -> bytes:
+        """
+        Renvoie le corps encodé d'un sujet, sérialisé une seule fois par instantané et par format.
+
+        Tous les clients servis pendant un même tick partagent ces octets : la sérialisation
+        ne dépend plus du nombre de requêtes. Il en va de même de chaque variante compressée.
+
+        :param topic: sujet ou document parmi `TelemetrySnapshot.DOCUMENTS`.
+        :param media_type: type MIME disponible dans `encoding.ENCODERS`.
+        :param coding: encodage de contenu de `compression.COMPRESSORS` (None : corps non compressé).
+        :return: corps de réponse encodé.
+        :except: HTTPException(502) si la source du sujet était en échec lors de ce tick.
+        """
+        key = (topic, media_type, coding)
+        if key not in self._bodies:
+            if coding is None:
+                self._bodies[key] = encode(media_type, self.payload(topic))
+            else:
+                self._bodies[key] = compress(coding, self.body(topic, media_type))
+        return self._bodies[key]
+
+    def _build_payload(self, topic: str) -> Any:
+        """
+        Construit la forme JSON d'un sujet (voir `payload`).
+
+        Les modèles ont été validés à l'ingestion : ils sont convertis directement, sans
+        seconde validation par un `response_model`.
+
+        :param topic: sujet ou document parmi `TelemetrySnapshot.DOCUMENTS`.
+        :return: valeur sérialisable en JSON.
+        :except: HTTPException(502) si la source du sujet était en échec lors de ce tick.
+        """
+        if topic == self.GYROSCOPE:
+            return gyroscope_from(self.get(WarThunderClient.INDICATORS)).model_dump(mode="json")
+        if topic == self.COMPASS:
+            return compass_from(self.get(WarThunderClient.INDICATORS)).model_dump(mode="json")
+        if topic == self.SPEED:
+            return self.get(WarThunderClient.STATE).TAS_kmh
+        if topic == self.ALTITUDE:
+            return self.get(WarThunderClient.STATE).H_m
+        if topic == WarThunderClient.MAP_OBJECTS:
+            return self.get(topic).rows
+        if topic == self.MAP_OBJECTS_COLUMNAR:
+            return self.get(WarThunderClient.MAP_OBJECTS).columnar
+        if topic == self.MAP_TRACKS:
+            self.get(WarThunderClient.MAP_OBJECTS)
+            return self.map_tracks.rows if self.map_tracks is not None else []
+        if topic == self.SNAPSHOT:
+            return self._document(self.SOURCES)
+        if topic == self.POSITION:
+            return next((row for row in self.payload(WarThunderClient.MAP_OBJECTS) if row["icon"] == "Player"), None)
+        if topic == self.SQUAD_MEMBER:
+            return self._document((WarThunderClient.INDICATORS, WarThunderClient.STATE), position=True)
+        return self.get(topic).model_dump(mode="json")
+
+    def _document(self, sources: tuple[str, ...], position: bool = False) -> dict[str, Any]:
+        """
+        Construit la forme JSON de `SnapshotModel` (ou de `SquadMemberModel`) : les sources
+        demandées et l'état de récupération de chaque source.
+
+        :param sources: sources reprises dans le document.
+        :param position: ajoute la position du joueur sur la carte (`POSITION`).
+        :return: dict au format de `SnapshotModel` ou de `SquadMemberModel`.
+        :except: Aucun; les échecs par source sont rapportés dans `sources`.
+        """
+        document: dict[str, Any] = {"seq": self.seq, "timestamp": self.timestamp}
+        for source in sources:
+            ok = source not in self.errors and getattr(self, source) is not None
+            document[source] = self.payload(source) if ok else None
+        if position:
+            ok = WarThunderClient.MAP_OBJECTS not in self.errors and self.map_objects is not None
+            document[self.POSITION] = self.payload(self.POSITION) if ok else None
+        document["sources"] = {
+            source: {
+                "ok": source not in self.errors,
+                "fetched_at": self.fetched_at.get(source),
+                "error": self.errors.get(source, self.stale.get(source)),
+                "stale": source in self.stale,
+            }
+            for source in self.SOURCES
+        }
+        return document
+
+
+def gyroscope_from(indicators: IndicatorsModel) -> GyroscopeModel:
+    """
+    Calcule les données du gyroscope à partir des indicateurs.
+
+    :param indicators: indicateurs relevés par le poller.
+    :return: `GyroscopeModel` représentant les données du gyroscope.
+    :except: ValidationError si les indicateurs ne contiennent pas les champs requis.
+    """
+    return GyroscopeModel(
+        pitch=indicators.aviahorizon_roll,
+        roll=indicators.aviahorizon_pitch,
+        yaw=indicators.bank,
+        turn=indicators.turn
+    )
+
+
+def compass_from(indicators: IndicatorsModel) -> CompassModel:
+    """
+    Calcule les données de la boussole à partir des indicateurs.
+
+    :param indicators: indicateurs relevés par le poller.
+    :return: `CompassModel` représentant les données de la boussole.
+    :except: ValidationError si les indicateurs ne contiennent pas le cap.
+    """
+    return CompassModel(heading=indicators.compass)
+
+
+def _last_good(snapshot: TelemetrySnapshot, source: str) -> dict[str, tuple[float, Any]]:
+    """
+    Dernière valeur valide d'une source dans un instantané : sa valeur du tick, ou celle qu'il a reprise.
+
+    :param snapshot: instantané précédent.
+    :param source: nom de la source.
+    :return: entrées de `TelemetrySnapshot.last_good` pour la source (vide si aucune valeur valide).
+    :except: Aucun.
+    """
+    fields = (source, TelemetrySnapshot.MAP_TRACKS) if source == WarThunderClient.MAP_OBJECTS else (source,)
+    if source in snapshot.errors:
+        return {name: snapshot.last_good[name] for name in fields if name in snapshot.last_good}
+    if getattr(snapshot, source) is None or source not in snapshot.fetched_at:
+        return {}
+    return {name: (snapshot.fetched_at[source], getattr(snapshot, name)) for name in fields}
+
+
+async def _timed(fetcher: Callable[[], Awaitable[Any]]) -> tuple[float, Any]:
+    """
+    Exécute une récupération upstream et relève l'heure de sa fin.
+
+    :param fetcher: coroutine de récupération d'une source.
+    :return: tuple (horodatage epoch de fin, résultat ou exception levée).
+    :except: Aucun; l'exception éventuelle est renvoyée comme résultat.
+    """
+    try:
+        result = await fetcher()
+    except Exception as exc:
+        result = exc
+    return time.time(), result
+
+
+class TelemetryPoller:
+    """
+    Tâche de fond qui interroge les sources War Thunder une fois par tick.
+
+    Les sources d'un tick sont récupérées en parallèle ; le résultat est publié sous la
+    forme d'un `TelemetrySnapshot` remplacé atomiquement, si bien que la charge upstream
+    ne dépend plus du nombre de clients connectés.
+
+    En mode adaptatif, le rythme suit l'état du jeu : en bataille (`IndicatorsModel.valid`),
+    les sources utiles à l'armée du véhicule (`ARMY_SOURCES`) sont interrogées toutes les
+    `interval` secondes ; au hangar ou si le jeu est injoignable, seuls les indicateurs le
+    sont, toutes les `idle_interval` secondes. Un changement de mode déclenche un tick
+    complet, immédiat lors du passage en bataille. Les sources non interrogées conservent
+    leur dernière valeur (et son horodatage `fetched_at`).
+
+    :param client: client upstream partagé.
+    :type client: WarThunderClient
+    :param interval: durée cible d'un tick en bataille, en secondes.
+    :type interval: float
+    :param recorder: enregistreur de session dont les trames sont validées à chaque tick (optionnel).
+    :type recorder: Optional[SessionRecorder]
+    :param idle_interval: durée d'un tick au hangar ou jeu injoignable, en secondes.
+    :type idle_interval: float
+    :param adaptive: active le rythme et les sources adaptatifs (sinon toutes les sources à chaque tick).
+    :type adaptive: bool
+    :param history: historique alimenté par les réponses de chaque tick (optionnel).
+    :type history: Optional[TelemetryHistory]
+    :param tracker: suivi des objets de la carte d'une trame à l'autre (un suivi par défaut si None).
+    :type tracker: Optional[MapObjectTracker]
+    :return: instance de TelemetryPoller
+    :except: ValueError si `interval` ou `idle_interval` n'est pas strictement positif.
+    """
+
+    SOURCES: tuple[str, ...] = (
+        WarThunderClient.INDICATORS,
+        WarThunderClient.STATE,
+        WarThunderClient.MAP_INFO,
+        WarThunderClient.MAP_OBJECTS,
+    )
+
+    #: Sources interrogées en bataille, selon l'armée du véhicule : /state ne décrit que les avions.
+    ARMY_SOURCES: dict[ArmyEnum, tuple[str, ...]] = {
+        ArmyEnum.AIR: SOURCES,
+        ArmyEnum.GROUND: (WarThunderClient.INDICATORS, WarThunderClient.MAP_INFO, WarThunderClient.MAP_OBJECTS),
+        ArmyEnum.NAVY: (WarThunderClient.INDICATORS, WarThunderClient.MAP_INFO, WarThunderClient.MAP_OBJECTS),
+    }
+
+    #: Sources interrogées au hangar ou jeu injoignable (battement de cœur).
+    IDLE_SOURCES: tuple[str, ...] = (WarThunderClient.INDICATORS,)
+
+    CACHE = "snapshot"
+
+    def __init__(
+            self,
+            client: WarThunderClient,
+            interval: float = 0.2,
+            recorder: Optional[SessionRecorder] = None,
+            idle_interval: float = 2.0,
+            adaptive: bool = True,
+            history: Optional[TelemetryHistory] = None,
+            tracker: Optional[MapObjectTracker] = None
+    ):
+        if interval <= 0 or idle_interval <= 0:
+            raise ValueError("Polling interval must be strictly positive")
+        self.client = client
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.adaptive = adaptive
+        self.recorder = recorder
+        self.history = history
+        self.tracker = tracker if tracker is not None else MapObjectTracker()
+        self.mode: Optional[ArmyEnum] = None
+        self.latest: Optional[TelemetrySnapshot] = None
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._tick_lock = asyncio.Lock()
+        self._published = asyncio.Condition()
+
+    @property
+    def running(self) -> bool:
+        """
+        Indique si la tâche de polling est active.
+
+        :param: None
+        :return: True si la boucle de polling tourne.
+        :except: Aucun.
+        """
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """
+        Démarre la boucle de polling (appelé au démarrage de l'application).
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="war-thunder-poller")
+
+    async def stop(self) -> None:
+        """
+        Arrête la boucle de polling (appelé à l'arrêt de l'application).
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def snapshot(self) -> TelemetrySnapshot:
+        """
+        Renvoie le dernier instantané publié.
+
+        Si aucun instantané n'existe encore (premier tick en cours ou poller arrêté),
+        un tick est exécuté immédiatement.
+
+        :param: None
+        :return: dernier `TelemetrySnapshot`.
+        :except: Aucun; les erreurs upstream sont portées par l'instantané.
+        """
+        if self.latest is None:
+            async with self._tick_lock:
+                if self.latest is None:
+                    self.client.metrics.cache_hit(self.CACHE, False)
+                    await self.poll_once()
+                    return self.latest
+        self.client.metrics.cache_hit(self.CACHE, True)
+        return self.latest
+
+    async def get(self, source: str) -> Any:
+        """
+        Renvoie la dernière valeur connue d'une source.
+
+        :param source: nom de la source (ex: `WarThunderClient.INDICATORS`).
+        :return: valeur validée de la source.
+        :except: HTTPException(502) si la source était en échec lors du dernier tick.
+        """
+        return (await self.snapshot()).get(source)
+
+    async def refresh(self) -> TelemetrySnapshot:
+        """
+        Force un tick immédiat et renvoie l'instantané qui en résulte.
+
+        Les appels concurrents sont regroupés : un appel qui attendait la fin d'un tick
+        démarré après lui réutilise ce tick au lieu d'en relancer un.
+
+        :param: None
+        :return: un `TelemetrySnapshot` dont les sources ont été récupérées après l'appel.
+        :except: Aucun; les erreurs upstream sont portées par l'instantané.
+        """
+        requested_at = time.time()
+        async with self._tick_lock:
+            latest = self.latest
+            if latest is not None and latest.fetched_at and min(latest.fetched_at.values()) >= requested_at:
+                self.client.metrics.cache_hit(self.CACHE, True)
+                return latest
+            self.client.metrics.cache_hit(self.CACHE, False)
+            return await self.poll_once()
+
+    async def wait_next(self, after_seq: int) -> TelemetrySnapshot:
+        """
+        Attend qu'un instantané plus récent que `after_seq` soit publié.
+
+        Si la boucle de polling n'est pas active, un tick est exécuté après un intervalle
+        afin que les abonnés continuent de recevoir des données.
+
+        :param after_seq: numéro de séquence du dernier instantané déjà traité.
+        :return: le dernier `TelemetrySnapshot`, de séquence strictement supérieure.
+        :except: asyncio.CancelledError si l'attente est annulée.
+        """
+        if not self.running:
+            if self.latest is None or self.latest.seq <= after_seq:
+                if self.latest is not None:
+                    await asyncio.sleep(self.interval)
+                async with self._tick_lock:
+                    if self.latest is None or self.latest.seq <= after_seq:
+                        await self.poll_once()
+            return self.latest
+        async with self._published:
+            await self._published.wait_for(
+                lambda: self.latest is not None and self.latest.seq > after_seq
+            )
+            return self.latest
+
+    @property
+    def active(self) -> bool:
+        """
+        Indique si le dernier tick a vu une partie en cours.
+
+        :param: None
+        :return: True en bataille, False au hangar ou si le jeu est injoignable.
+        :except: Aucun.
+        """
+        return self.mode is not None
+
+    @staticmethod
+    def mode_of(snapshot: TelemetrySnapshot) -> Optional[ArmyEnum]:
+        """
+        Déduit le mode de polling d'un instantané.
+
+        :param snapshot: instantané à examiner.
+        :return: armée du véhicule en bataille, ou None au hangar / jeu injoignable.
+        :except: Aucun.
+        """
+        indicators = snapshot.indicators
+        if indicators is None or WarThunderClient.INDICATORS in snapshot.errors or not indicators.valid:
+            return None
+        return indicators.army
+
+    def sources_for(self, mode: Optional[ArmyEnum]) -> tuple[str, ...]:
+        """
+        Sources à interroger dans un mode donné.
+
+        :param mode: armée en bataille, ou None au hangar.
+        :return: sources à interroger, dans l'ordre de `SOURCES`.
+        :except: Aucun.
+        """
+        if not self.adaptive:
+            return self.SOURCES
+        if mode is None:
+            return self.IDLE_SOURCES
+        return self.ARMY_SOURCES.get(mode, self.SOURCES)
+
+    async def poll_once(self, sources: Optional[tuple[str, ...]] = None) -> TelemetrySnapshot:
+        """
+        Exécute un tick : récupère les sources en parallèle et publie l'instantané.
+
+        Les sources non interrogées reprennent la valeur, l'erreur et l'horodatage
+        de l'instantané précédent. Une source en échec garde sa dernière valeur valide
+        dans `last_good`. Chaque nouvelle trame d'objets de la carte passe par le suivi
+        (`tracker`), qui lui associe identifiants et vitesses.
+
+        :param sources: sources à interroger (toutes les `SOURCES` si None).
+        :return: le nouvel instantané publié.
+        :except: Aucun; les erreurs upstream sont enregistrées dans `errors`.
+        """
+        sources = self.SOURCES if sources is None else sources
+        started = time.perf_counter()
+        fetchers = {
+            WarThunderClient.INDICATORS: self.client.get_indicators,
+            WarThunderClient.STATE: self.client.get_state,
+            WarThunderClient.MAP_INFO: self.client.get_map_info,
+            WarThunderClient.MAP_OBJECTS: self.client.get_map_objects,
+        }
+        results = await asyncio.gather(*(_timed(fetchers[source]) for source in sources))
+
+        values: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+        fetched_at: dict[str, float] = {}
+        last_good: dict[str, tuple[float, Any]] = {}
+        previous = self.latest
+        if previous is not None:
+            for source in self.SOURCES:
+                if source in sources or source not in previous.fetched_at:
+                    continue
+                fetched_at[source] = previous.fetched_at[source]
+                if source in previous.errors:
+                    errors[source] = previous.errors[source]
+                    last_good.update(_last_good(previous, source))
+                else:
+                    values[source] = getattr(previous, source)
+                    if source == WarThunderClient.MAP_OBJECTS:
+                        values["map_tracks"] = previous.map_tracks
+        for source, (completed_at, result) in zip(sources, results):
+            fetched_at[source] = completed_at
+            if isinstance(result, Exception):
+                if isinstance(result, HTTPException):
+                    errors[source] = result.detail
+                else:
+                    errors[source] = f"Upstream service unreachable: {result}"
+                if previous is not None:
+                    last_good.update(_last_good(previous, source))
+            else:
+                values[source] = result
+                if self.history is not None:
+                    self.history.record(source, completed_at, result)
+
+        if WarThunderClient.MAP_OBJECTS in sources and WarThunderClient.MAP_OBJECTS in values:
+            values["map_tracks"] = self.tracker.update(
+                fetched_at[WarThunderClient.MAP_OBJECTS],
+                values[WarThunderClient.MAP_OBJECTS],
+                values.get(WarThunderClient.MAP_INFO)
+            )
+
+        self.client.metrics.poll_tick_seconds.observe(time.perf_counter() - started)
+        self._seq += 1
+        self.latest = TelemetrySnapshot(
+            seq=self._seq,
+            timestamp=time.time(),
+            errors=MappingProxyType(errors),
+            fetched_at=MappingProxyType(fetched_at),
+            last_good=MappingProxyType(last_good),
+            **values
+        )
+        if self.recorder is not None:
+            map_info = self.latest.map_info
+            self.recorder.commit(map_info.map_generation if map_info is not None else None)
+        async with self._published:
+            self._published.notify_all()
+        return self.latest
+
+    async def _run(self) -> None:
+        """
+        Boucle de polling : un tick par intervalle, sans jamais chevaucher deux ticks.
+
+        Le premier tick et chaque tick suivant un changement de mode interrogent toutes les
+        sources ; le passage en bataille déclenche ce tick sans attendre.
+
+        :param: None
+        :return: None
+        :except: asyncio.CancelledError à l'arrêt.
+        """
+        loop = asyncio.get_running_loop()
+        sources = self.SOURCES
+        while True:
+            started = loop.time()
+            async with self._tick_lock:
+                snapshot = await self.poll_once(sources)
+            mode = self.mode_of(snapshot)
+            changed = self.adaptive and mode != self.mode
+            self.mode = mode
+            self.client.metrics.poller_active.set(value=1.0 if self.active else 0.0)
+            if changed:
+                sources = self.SOURCES
+                if self.active:
+                    continue
+            else:
+                sources = self.sources_for(mode)
+            interval = self.interval if self.active or not self.adaptive else self.idle_interval
+            await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
@@ -0,0 +1,304 @@
+"""
+Pyramide de tuiles de l'image de la carte, pour `/map_tiles/{z}/{x}/{y}`.
+
+Un client zoomé sur une partie de la carte ne télécharge et ne décode que les tuiles visibles
+au lieu de l'image entière. La pyramide est découpée une seule fois par image (donc au plus une
+fois par `map_generation`) dans un pool de processus, afin que le redimensionnement et
+l'encodage de centaines de tuiles n'occupent ni l'event loop ni le GIL, puis conservée dans un
+cache LRU borné en octets et partagé par tous les joueurs.
+"""
+
+import asyncio
+import io
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+from fastapi import HTTPException
+
+from .map_image import MapImage
+from .metrics import Metrics
+from .schemas import MapTilesModel
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+#: Côté d'une tuile, en pixels.
+TILE_SIZE: int = 256
+#: Niveau de zoom maximal, quelle que soit la taille de l'image (4^8 = 65536 tuiles au dernier niveau).
+MAX_ZOOM: int = 8
+#: Mémoire maximale occupée par les pyramides en cache (64 Mio) ; la moins récemment servie est évincée.
+DEFAULT_MAX_BYTES: int = 64 * 1024 * 1024
+#: Qualité des tuiles JPEG (les images sources JPEG restent en JPEG, les autres passent en PNG).
+JPEG_QUALITY: int = 85
+
+
+def max_zoom_of(width: int, height: int, tile_size: int = TILE_SIZE) -> int:
+    """
+    Niveau le plus détaillé utile pour une image : le premier dont le côté atteint celui de l'image.
+
+    :param width: largeur de l'image, en pixels.
+    :param height: hauteur de l'image, en pixels.
+    :param tile_size: côté d'une tuile, en pixels.
+    :return: niveau de zoom, entre 0 et `MAX_ZOOM`.
+    :except: Aucun.
+    """
+    side = max(width, height, 1)
+    return min(MAX_ZOOM, max(0, math.ceil(math.log2(side / tile_size))))
+
+
+def build_pyramid(content: bytes, tile_size: int = TILE_SIZE) -> tuple[int, str, dict[tuple[int, int, int], bytes]]:
+    """
+    Découpe une image en pyramide de tuiles (appel bloquant, exécuté dans un processus du pool).
+
+    Le niveau `max_zoom` est l'image redimensionnée au carré de `tile_size * 2^max_zoom` pixels ;
+    chaque niveau inférieur en divise le côté par deux (moyenne de 2x2 pixels).
+
+    :param content: octets de l'image source.
+    :param tile_size: côté d'une tuile, en pixels.
+    :return: tuple (max_zoom, type MIME des tuiles, tuiles encodées indexées par (z, x, y)).
+    :except: OSError si l'image ne peut pas être décodée.
+    """
+    with Image.open(io.BytesIO(content)) as source:
+        jpeg = source.format == "JPEG"
+        mode = "RGB" if jpeg else "RGBA"
+        max_zoom = max_zoom_of(source.width, source.height, tile_size)
+        side = tile_size << max_zoom
+        level = source.convert(mode)
+    if level.size != (side, side):
+        level = level.resize((side, side), Image.LANCZOS)
+
+    tiles: dict[tuple[int, int, int], bytes] = {}
+    for z in range(max_zoom, -1, -1):
+        count = 1 << z
+        for y in range(count):
+            for x in range(count):
+                tile = level.crop((x * tile_size, y * tile_size, (x + 1) * tile_size, (y + 1) * tile_size))
+                buffer = io.BytesIO()
+                if jpeg:
+                    tile.save(buffer, format="JPEG", quality=JPEG_QUALITY)
+                else:
+                    tile.save(buffer, format="PNG", compress_level=1)
+                tiles[(z, x, y)] = buffer.getvalue()
+        if z:
+            level = level.reduce(2)
+    return max_zoom, "image/jpeg" if jpeg else "image/png", tiles
+
+
+@dataclass(frozen=True)
+class TilePyramid:
+    """
+    Pyramide de tuiles d'une image de carte.
+
+    :param generation: génération de carte de l'image découpée.
+    :type generation: Optional[int]
+    :param digest: empreinte SHA-1 de l'image source.
+    :type digest: str
+    :param tile_size: côté d'une tuile, en pixels.
+    :type tile_size: int
+    :param max_zoom: niveau le plus détaillé.
+    :type max_zoom: int
+    :param media_type: type MIME des tuiles.
+    :type media_type: str
+    :param tiles: tuiles encodées, indexées par (z, x, y).
+    :type tiles: dict[tuple[int, int, int], bytes]
+    :param build_seconds: durée de génération, envoi entre processus compris.
+    :type build_seconds: float
+    :return: instance de TilePyramid
+    :except: Aucun
+    """
+
+    generation: Optional[int]
+    digest: str
+    tile_size: int
+    max_zoom: int
+    media_type: str
+    tiles: dict[tuple[int, int, int], bytes]
+    build_seconds: float
+
+    @cached_property
+    def nbytes(self) -> int:
+        """
+        Mémoire occupée par les tuiles encodées.
+
+        :param: None
+        :return: taille totale en octets.
+        :except: Aucun.
+        """
+        return sum(len(tile) for tile in self.tiles.values())
+
+    def etag(self, z: int, x: int, y: int) -> str:
+        """
+        ETag fort d'une tuile, lié à l'image source.
+
+        :param z: niveau de zoom.
+        :param x: colonne de la tuile.
+        :param y: ligne de la tuile.
+        :return: ETag entre guillemets.
+        :except: Aucun.
+        """
+        return f'"{self.digest}-{self.tile_size}-{z}-{x}-{y}"'
+
+    def tile(self, z: int, x: int, y: int) -> bytes:
+        """
+        Renvoie une tuile encodée.
+
+        :param z: niveau de zoom (0 = carte entière en une tuile).
+        :param x: colonne de la tuile, de 0 à 2^z - 1.
+        :param y: ligne de la tuile, de 0 à 2^z - 1.
+        :return: octets de la tuile.
+        :except: HTTPException(404) si la tuile n'existe pas.
+        """
+        content = self.tiles.get((z, x, y))
+        if content is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown tile {z}/{x}/{y}: zoom ranges over 0-{self.max_zoom}"
+                       f" and x, y over 0 to 2^zoom - 1"
+            )
+        return content
+
+    def describe(self) -> MapTilesModel:
+        """
+        Décrit la pyramide pour la route `/map_tiles`.
+
+        :param: None
+        :return: `MapTilesModel` de la pyramide.
+        :except: Aucun.
+        """
+        return MapTilesModel(
+            generation=self.generation,
+            tile_size=self.tile_size,
+            max_zoom=self.max_zoom,
+            media_type=self.media_type,
+            tiles=len(self.tiles),
+            bytes=self.nbytes,
+            build_seconds=self.build_seconds
+        )
+
+
+class TileCache:
+    """
+    Cache LRU des pyramides de tuiles, indexé par empreinte de l'image source.
+
+    Les pyramides sont générées dans un pool de processus démarré à la première demande ;
+    les requêtes concurrentes attendent la génération en cours au lieu d'en lancer une autre.
+    Deux joueurs sur la même carte partagent la même pyramide.
+
+    :param metrics: registre de métriques (durée de génération, mémoire, taux de réutilisation).
+    :type metrics: Metrics
+    :param max_bytes: mémoire maximale occupée par les pyramides en cache; la plus récente est
+        toujours conservée.
+    :type max_bytes: int
+    :param workers: nombre de processus du pool.
+    :type workers: int
+    :return: instance de TileCache
+    :except: ValueError si `max_bytes` ou `workers` n'est pas strictement positif.
+    """
+
+    CACHE = "map_tiles"
+
+    def __init__(self, metrics: Metrics, max_bytes: int = DEFAULT_MAX_BYTES, workers: int = 1):
+        if max_bytes <= 0:
+            raise ValueError("Tile cache max_bytes must be strictly positive")
+        if workers <= 0:
+            raise ValueError("Tile cache workers must be strictly positive")
+        self.metrics = metrics
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.pyramids: dict[str, TilePyramid] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Mémoire occupée par toutes les pyramides en cache.
+
+        :param: None
+        :return: taille totale en octets.
+        :except: Aucun.
+        """
+        return sum(pyramid.nbytes for pyramid in self.pyramids.values())
+
+    def _touch(self, pyramid: TilePyramid) -> TilePyramid:
+        """
+        Marque une pyramide comme la plus récemment servie.
+
+        :param pyramid: pyramide servie.
+        :return: la même pyramide.
+        :except: Aucun.
+        """
+        self.pyramids.pop(pyramid.digest, None)
+        self.pyramids[pyramid.digest] = pyramid
+        return pyramid
+
+    async def get(self, image: MapImage) -> TilePyramid:
+        """
+        Renvoie la pyramide d'une image, en la générant dans le pool de processus si nécessaire.
+
+        :param image: image de carte de la génération courante.
+        :return: `TilePyramid` de l'image.
+        :except: HTTPException(501) si Pillow n'est pas installé; HTTPException(502) si l'image
+            ne peut pas être décodée; HTTPException(503) si un processus du pool s'est arrêté.
+        """
+        if Image is None:
+            raise HTTPException(status_code=501, detail="Map tiles require Pillow (pip install pillow)")
+        pyramid = self.pyramids.get(image.digest)
+        if pyramid is not None:
+            self.metrics.cache_hit(self.CACHE, True)
+            return self._touch(pyramid)
+
+        async with self._lock:
+            pyramid = self.pyramids.get(image.digest)
+            if pyramid is not None:
+                self.metrics.cache_hit(self.CACHE, True)
+                return self._touch(pyramid)
+            self.metrics.cache_hit(self.CACHE, False)
+            if self._executor is None:
+                # "spawn" : ne pas dupliquer par fork un processus qui fait tourner une event loop et des threads.
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            started = time.perf_counter()
+            try:
+                max_zoom, media_type, tiles = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, build_pyramid, image.content, TILE_SIZE
+                )
+            except OSError as exc:
+                raise HTTPException(status_code=502, detail=f"Cannot decode the map image: {exc}")
+            except BrokenProcessPool:
+                self._executor = None
+                raise HTTPException(status_code=503, detail="Tile generation worker stopped, retry later")
+            build_seconds = time.perf_counter() - started
+            self.metrics.tiles_build_seconds.observe(build_seconds)
+            pyramid = self._touch(TilePyramid(
+                generation=image.generation,
+                digest=image.digest,
+                tile_size=TILE_SIZE,
+                max_zoom=max_zoom,
+                media_type=media_type,
+                tiles=tiles,
+                build_seconds=build_seconds
+            ))
+            while len(self.pyramids) > 1 and self.nbytes > self.max_bytes:
+                del self.pyramids[next(iter(self.pyramids))]
+            self.metrics.tiles_bytes.set(value=self.nbytes)
+            return pyramid
+
+    def close(self) -> None:
+        """
+        Arrête le pool de processus (sans attendre une génération en cours).
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
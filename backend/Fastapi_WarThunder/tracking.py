@@ -0,0 +1,328 @@
+"""
+Suivi des objets de la carte d'une trame /map_obj.json à la suivante.
+
+L'upstream ne fournit que des positions anonymes : `MapObjectTracker` associe chaque objet
+d'une trame à une piste de la trame précédente de même type, icône et couleur, la plus
+proche de la position prédite. Les pistes sont rangées dans une grille de hachage spatial
+dont la maille vaut le rayon d'association : chaque objet n'examine que les 9 cases qui
+l'entourent, si bien que le coût d'une trame reste quasi linéaire en nombre d'objets.
+La vitesse de chaque piste est estimée par différences finies lissées.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Optional
+
+from .columnar import MISSING, MapObjectColumns
+from .schemas import MapInfoModel
+
+#: Vitesse maximale plausible d'un objet (m/s), qui fixe le rayon d'association entre deux trames.
+DEFAULT_MAX_SPEED: float = 700.0
+#: Rayon d'association par seconde (unités de carte normalisées) lorsque la taille de la carte est inconnue.
+DEFAULT_GATE_RATE: float = 0.05
+#: Rayon d'association minimal (unités de carte normalisées), qui absorbe le bruit des positions.
+MIN_GATE: float = 0.002
+#: Rayon d'association maximal (unités de carte normalisées), atteint après une longue pause du polling.
+MAX_GATE: float = 0.25
+#: Nombre de trames consécutives sans correspondance avant l'abandon d'une piste.
+DEFAULT_MAX_MISSED: int = 5
+#: Poids de la dernière mesure dans le lissage exponentiel de la vitesse.
+SMOOTHING: float = 0.5
+#: Vitesse (m/s, ou unités normalisées par seconde sans taille de carte) sous laquelle le cap n'est pas défini.
+STILL_SPEED: float = 1e-6
+
+
+class _Track:
+    """
+    Piste d'un objet : dernière position observée, vitesse estimée et compteurs.
+    """
+
+    __slots__ = ("id", "key", "x", "y", "vx", "vy", "seen_at", "missed")
+
+    def __init__(self, track_id: int, key: tuple, x: float, y: float, seen_at: float):
+        self.id = track_id
+        self.key = key
+        self.x = x
+        self.y = y
+        self.vx = math.nan
+        self.vy = math.nan
+        self.seen_at = seen_at
+        self.missed = 0
+
+    def predict(self, timestamp: float) -> tuple[float, float]:
+        """
+        Position attendue de l'objet à un instant donné, d'après sa vitesse estimée.
+
+        :param timestamp: horodatage epoch (secondes).
+        :return: tuple (x, y) prédit; la dernière position si la vitesse est encore inconnue.
+        :except: Aucun.
+        """
+        if self.vx != self.vx:
+            return self.x, self.y
+        elapsed = timestamp - self.seen_at
+        return self.x + self.vx * elapsed, self.y + self.vy * elapsed
+
+    def observe(self, x: float, y: float, timestamp: float) -> None:
+        """
+        Met à jour la piste avec une nouvelle position et lisse l'estimation de la vitesse.
+
+        :param x: position X observée.
+        :param y: position Y observée.
+        :param timestamp: horodatage epoch (secondes) de l'observation.
+        :return: None
+        :except: Aucun.
+        """
+        elapsed = timestamp - self.seen_at
+        if elapsed > 0:
+            vx, vy = (x - self.x) / elapsed, (y - self.y) / elapsed
+            if self.vx != self.vx:
+                self.vx, self.vy = vx, vy
+            else:
+                self.vx += SMOOTHING * (vx - self.vx)
+                self.vy += SMOOTHING * (vy - self.vy)
+        self.x, self.y = x, y
+        self.seen_at = timestamp
+        self.missed = 0
+
+
+@dataclass(frozen=True)
+class MapTracks:
+    """
+    Résultat du suivi d'une trame : identifiant et vitesse de chaque objet, alignés sur ses colonnes.
+
+    :param objects: objets de la trame.
+    :type objects: MapObjectColumns
+    :param ids: identifiant de piste de chaque objet (`MISSING` si l'objet n'a pas de position).
+    :type ids: array
+    :param vx: vitesse sur X, en unités normalisées par seconde (NaN si inconnue).
+    :type vx: array
+    :param vy: vitesse sur Y, en unités normalisées par seconde (NaN si inconnue).
+    :type vy: array
+    :param map_size: largeur et hauteur de la carte en mètres (None si inconnues).
+    :type map_size: Optional[tuple[float, float]]
+    :return: instance de MapTracks
+    :except: Aucun
+    """
+
+    objects: MapObjectColumns
+    ids: array
+    vx: array
+    vy: array
+    map_size: Optional[tuple[float, float]] = None
+
+    def __len__(self) -> int:
+        return self.objects.count
+
+    def take(self, indices: list[int]) -> "MapTracks":
+        """
+        Extrait un sous-ensemble des objets suivis, dans l'ordre des indices donnés.
+
+        :param indices: indices des objets conservés.
+        :return: `MapTracks` du sous-ensemble.
+        :except: IndexError si un indice est hors bornes.
+        """
+        return MapTracks(
+            objects=self.objects.take(indices),
+            ids=array("q", [self.ids[i] for i in indices]),
+            vx=array("d", [self.vx[i] for i in indices]),
+            vy=array("d", [self.vy[i] for i in indices]),
+            map_size=self.map_size
+        )
+
+    @cached_property
+    def rows(self) -> list[dict[str, Any]]:
+        """
+        Forme JSON ligne par ligne, au format de `MapTrackModel`.
+
+        :param: None
+        :return: liste de dicts, un par objet, dans l'ordre de la trame.
+        :except: Aucun.
+        """
+        scale_x, scale_y = self.map_size if self.map_size is not None else (1.0, 1.0)
+        rows = []
+        for row, track_id, vx, vy in zip(self.objects.rows, self.ids, self.vx, self.vy):
+            row = dict(row, id=track_id if track_id != MISSING else None, vx=None, vy=None, speed=None, heading=None)
+            if vx == vx:
+                mx, my = vx * scale_x, vy * scale_y
+                speed = math.hypot(mx, my)
+                row["vx"], row["vy"] = vx, vy
+                row["speed"] = speed if self.map_size is not None else None
+                if speed > STILL_SPEED:
+                    row["heading"] = math.degrees(math.atan2(mx, -my)) % 360.0
+            rows.append(row)
+        return rows
+
+
+def map_size_of(map_info: Optional[MapInfoModel]) -> Optional[tuple[float, float]]:
+    """
+    Largeur et hauteur de la carte en mètres, d'après /map_info.json.
+
+    :param map_info: informations de carte (optionnel).
+    :return: tuple (largeur, hauteur), ou None si la carte est inconnue ou dégénérée.
+    :except: Aucun.
+    """
+    if map_info is None or not map_info.valid or len(map_info.map_min) < 2 or len(map_info.map_max) < 2:
+        return None
+    width = map_info.map_max[0] - map_info.map_min[0]
+    height = map_info.map_max[1] - map_info.map_min[1]
+    if width <= 0 or height <= 0:
+        return None
+    return width, height
+
+
+class MapObjectTracker:
+    """
+    Attribue un identifiant stable aux objets de la carte et estime leur vitesse et leur cap.
+
+    Deux objets ne peuvent être associés que s'ils partagent type, icône et couleur et si la
+    distance à la position prédite reste sous le rayon d'association (`max_speed` fois le temps
+    écoulé). Les candidats sont traités du plus proche au plus lointain (association gloutonne).
+    Une piste sans correspondance est conservée `max_missed` trames avant d'être abandonnée ;
+    toutes les pistes sont oubliées lorsque la carte change (`map_generation`).
+
+    :param max_speed: vitesse maximale plausible d'un objet, en m/s.
+    :type max_speed: float
+    :param max_missed: nombre de trames sans correspondance avant l'abandon d'une piste.
+    :type max_missed: int
+    :return: instance de MapObjectTracker
+    :except: ValueError si `max_speed` n'est pas strictement positive ou si `max_missed` est négatif.
+    """
+
+    def __init__(self, max_speed: float = DEFAULT_MAX_SPEED, max_missed: int = DEFAULT_MAX_MISSED):
+        if max_speed <= 0:
+            raise ValueError("Tracker max_speed must be strictly positive")
+        if max_missed < 0:
+            raise ValueError("Tracker max_missed must be positive")
+        self.max_speed = max_speed
+        self.max_missed = max_missed
+        self._tracks: list[_Track] = []
+        self._next_id = 0
+        self._timestamp: Optional[float] = None
+        self._generation: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def reset(self) -> None:
+        """
+        Oublie toutes les pistes (changement de carte).
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        self._tracks = []
+        self._timestamp = None
+
+    def _gate(self, elapsed: float, map_size: Optional[tuple[float, float]]) -> float:
+        """
+        Rayon d'association, en unités normalisées, pour un intervalle donné entre deux trames.
+
+        :param elapsed: temps écoulé depuis la trame précédente, en secondes.
+        :param map_size: largeur et hauteur de la carte en mètres (optionnel).
+        :return: rayon borné par `MIN_GATE` et `MAX_GATE`.
+        :except: Aucun.
+        """
+        if map_size is not None:
+            gate = self.max_speed * elapsed / min(map_size)
+        else:
+            gate = DEFAULT_GATE_RATE * elapsed
+        return min(max(gate, MIN_GATE), MAX_GATE)
+
+    def update(
+            self,
+            timestamp: float,
+            objects: MapObjectColumns,
+            map_info: Optional[MapInfoModel] = None
+    ) -> MapTracks:
+        """
+        Associe les objets d'une nouvelle trame aux pistes existantes.
+
+        La position d'un objet est celle de `MapObjectColumns.positions` ; un objet sans
+        position ne reçoit pas d'identifiant.
+
+        :param timestamp: horodatage epoch (secondes) de la trame.
+        :param objects: objets de la trame, en colonnes.
+        :param map_info: informations de carte du même tick (taille de la carte, génération).
+        :return: `MapTracks` de la trame.
+        :except: Aucun.
+        """
+        generation = map_info.map_generation if map_info is not None else None
+        if generation is not None and generation != self._generation:
+            if self._generation is not None:
+                self.reset()
+            self._generation = generation
+        map_size = map_size_of(map_info)
+
+        count = objects.count
+        xs, ys = objects.positions
+        colors = objects.colors
+        positions: list[Optional[tuple[float, float]]] = []
+        keys: list[tuple] = []
+        for i in range(count):
+            x, y = xs[i], ys[i]
+            color = objects.color[i]
+            keys.append((objects.type[i], objects.icon[i], colors[color] if color != MISSING else None))
+            positions.append((x, y) if x == x and y == y else None)
+
+        assigned: list[Optional[_Track]] = [None] * count
+        if self._tracks and self._timestamp is not None:
+            gate = self._gate(timestamp - self._timestamp, map_size)
+            gate2 = gate * gate
+            grid: dict[tuple, list[tuple[_Track, float, float]]] = {}
+            for track in self._tracks:
+                px, py = track.predict(timestamp)
+                grid.setdefault((track.key, math.floor(px / gate), math.floor(py / gate)), []).append((track, px, py))
+
+            candidates = []
+            for i, position in enumerate(positions):
+                if position is None:
+                    continue
+                x, y = position
+                key, cx, cy = keys[i], math.floor(x / gate), math.floor(y / gate)
+                for gx in (cx - 1, cx, cx + 1):
+                    for gy in (cy - 1, cy, cy + 1):
+                        for track, px, py in grid.get((key, gx, gy), ()):
+                            distance2 = (x - px) ** 2 + (y - py) ** 2
+                            if distance2 <= gate2:
+                                candidates.append((distance2, i, track.id, track))
+            candidates.sort(key=lambda candidate: candidate[:3])
+
+            matched: set[int] = set()
+            for _distance2, i, track_id, track in candidates:
+                if assigned[i] is None and track_id not in matched:
+                    assigned[i] = track
+                    matched.add(track_id)
+        else:
+            matched = set()
+
+        tracks: list[_Track] = []
+        for track in self._tracks:
+            if track.id not in matched:
+                track.missed += 1
+                if track.missed <= self.max_missed:
+                    tracks.append(track)
+
+        ids, vx, vy = array("q"), array("d"), array("d")
+        for i, position in enumerate(positions):
+            if position is None:
+                ids.append(MISSING)
+                vx.append(math.nan)
+                vy.append(math.nan)
+                continue
+            track = assigned[i]
+            if track is None:
+                track = _Track(self._next_id, keys[i], position[0], position[1], timestamp)
+                self._next_id += 1
+            else:
+                track.observe(position[0], position[1], timestamp)
+            tracks.append(track)
+            ids.append(track.id)
+            vx.append(track.vx)
+            vy.append(track.vy)
+
+        self._tracks = tracks
+        self._timestamp = timestamp
+        return MapTracks(objects=objects, ids=ids, vx=vx, vy=vy, map_size=map_size)
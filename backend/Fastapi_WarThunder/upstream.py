@@ -0,0 +1,320 @@
+"""
+Client HTTP mutualisé vers le serveur web intégré de War Thunder (port 8111 par défaut).
+
+Ce module définit la classe `WarThunderClient` qui conserve un unique `httpx.AsyncClient`
+(pool de connexions + keep-alive) pour toute la durée de vie de l'application, ainsi que
+les méthodes qui récupèrent et valident chaque source upstream. Chaque source a son
+disjoncteur (`breaker.CircuitBreaker`) : un jeu fermé fait échouer les requêtes immédiatement
+au lieu d'attendre le timeout, et une sonde en tâche de fond détecte son retour.
+"""
+
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+from httpx import AsyncClient, Limits, Timeout, TransportError
+
+from .breaker import DEFAULT_BACKOFF, DEFAULT_MAX_BACKOFF, DEFAULT_THRESHOLD, CircuitBreaker, CircuitOpenError
+from .columnar import MapObjectColumns
+from .ingest import StateParser
+from .metrics import Metrics
+from .schemas import (
+    IndicatorsModel,
+    MapInfoModel,
+    StateModel
+)
+
+if TYPE_CHECKING:
+    from .recorder import SessionRecorder
+
+T = TypeVar("T")
+
+
+class WarThunderClient:
+    """
+    Client upstream War Thunder partagé, avec pool de connexions et timeouts par source.
+
+    :param host: adresse IP ou hostname du serveur War Thunder.
+    :type host: str
+    :param port: port d'écoute du serveur War Thunder.
+    :type port: int
+    :param timeouts: timeouts (en secondes) par source, fusionnés avec `DEFAULT_TIMEOUTS`.
+    :type timeouts: Optional[dict[str, float]]
+    :param max_connections: nombre maximal de connexions simultanées du pool.
+    :type max_connections: int
+    :param max_keepalive_connections: nombre maximal de connexions gardées ouvertes.
+    :type max_keepalive_connections: int
+    :param keepalive_expiry: durée (en secondes) avant fermeture d'une connexion inactive.
+    :type keepalive_expiry: float
+    :param trusted_ingest: construit `StateModel` sans revalidation Pydantic (voir `StateParser`).
+    :type trusted_ingest: bool
+    :param recorder: enregistreur recevant le corps brut de chaque réponse (optionnel).
+    :type recorder: Optional[SessionRecorder]
+    :param metrics: registre des métriques à alimenter (un registre propre est créé si None).
+    :type metrics: Optional[Metrics]
+    :param breaker_threshold: échecs réseau consécutifs qui ouvrent le disjoncteur d'une source.
+    :type breaker_threshold: int
+    :param breaker_backoff: délai (secondes) avant la première sonde d'une source injoignable.
+    :type breaker_backoff: float
+    :param breaker_max_backoff: délai maximal (secondes) entre deux sondes.
+    :type breaker_max_backoff: float
+    :return: instance de `WarThunderClient`.
+    :except: ValueError si une source inconnue est présente dans `timeouts` ou si un paramètre
+             de disjoncteur est hors bornes.
+    """
+
+    INDICATORS: str = "indicators"
+    STATE: str = "state"
+    MAP_INFO: str = "map_info"
+    MAP_OBJECTS: str = "map_objects"
+    MAP_IMG: str = "map_img"
+
+    PATHS: dict[str, str] = {
+        INDICATORS: "indicators",
+        STATE: "state",
+        MAP_INFO: "map_info.json",
+        MAP_OBJECTS: "map_obj.json",
+        MAP_IMG: "map.img",
+    }
+
+    DEFAULT_TIMEOUTS: dict[str, float] = {
+        INDICATORS: 5.0,
+        STATE: 5.0,
+        MAP_INFO: 5.0,
+        MAP_OBJECTS: 5.0,
+        MAP_IMG: 10.0,
+    }
+
+    def __init__(
+            self,
+            host: str = "localhost",
+            port: int = 8111,
+            timeouts: Optional[dict[str, float]] = None,
+            max_connections: int = 10,
+            max_keepalive_connections: int = 10,
+            keepalive_expiry: float = 30.0,
+            trusted_ingest: bool = False,
+            recorder: Optional["SessionRecorder"] = None,
+            metrics: Optional[Metrics] = None,
+            breaker_threshold: int = DEFAULT_THRESHOLD,
+            breaker_backoff: float = DEFAULT_BACKOFF,
+            breaker_max_backoff: float = DEFAULT_MAX_BACKOFF
+    ):
+        unknown = set(timeouts or {}) - set(self.PATHS)
+        if unknown:
+            raise ValueError(f"Unknown upstream source(s): {', '.join(sorted(unknown))}")
+
+        self.base_url = f"http://{host}:{port}"
+        self.urls: dict[str, str] = {
+            source: f"{self.base_url}/{path}" for source, path in self.PATHS.items()
+        }
+        self.timeouts: dict[str, Timeout] = {
+            source: Timeout(value)
+            for source, value in {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}.items()
+        }
+        self.limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.state_parser = StateParser(trusted=trusted_ingest)
+        self.recorder = recorder
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.breakers: dict[str, CircuitBreaker] = {
+            source: CircuitBreaker(
+                source, threshold=breaker_threshold, backoff=breaker_backoff, max_backoff=breaker_max_backoff
+            )
+            for source in self.PATHS
+        }
+        self._client: Optional[AsyncClient] = None
+        self._probes: dict[str, asyncio.Task] = {}
+
+    @property
+    def client(self) -> AsyncClient:
+        """
+        Renvoie le client HTTP partagé, en le créant à la première utilisation.
+
+        :param: None
+        :return: `httpx.AsyncClient` partagé par toutes les requêtes upstream.
+        :except: Aucun.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = AsyncClient(limits=self.limits, timeout=self.timeouts[self.INDICATORS])
+        return self._client
+
+    async def start(self) -> None:
+        """
+        Ouvre le pool de connexions (appelé au démarrage de l'application).
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        _ = self.client
+
+    async def close(self) -> None:
+        """
+        Arrête les sondes en cours et ferme le pool de connexions (appelé à l'arrêt de l'application).
+
+        :param: None
+        :return: None
+        :except: Aucun.
+        """
+        probes = list(self._probes.values())
+        self._probes.clear()
+        for probe in probes:
+            probe.cancel()
+        await asyncio.gather(*probes, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch(self, source: str):
+        """
+        Exécute un GET sur la source upstream demandée via le pool partagé.
+
+        La durée et les échecs sont relevés dans `metrics` ; le corps de la réponse est
+        transmis à l'enregistreur de session s'il est configuré. Si le disjoncteur de la source
+        est ouvert, l'appel échoue immédiatement, sans requête.
+
+        :param source: nom de la source (ex: `WarThunderClient.STATE`).
+        :return: `httpx.Response` dont le statut a été vérifié.
+        :except: CircuitOpenError si le disjoncteur de la source est ouvert;
+                 httpx.HTTPError si l'upstream est injoignable ou répond en erreur.
+        """
+        breaker = self.breakers[source]
+        try:
+            breaker.check()
+        except CircuitOpenError:
+            self.metrics.upstream_errors.inc(source, "circuit")
+            raise
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(self.urls[source], timeout=self.timeouts[source])
+            response.raise_for_status()
+        except TransportError as exc:
+            self.metrics.upstream_errors.inc(source, "fetch")
+            if breaker.failure(str(exc) or type(exc).__name__):
+                self._opened(source)
+            raise
+        except Exception:
+            self.metrics.upstream_errors.inc(source, "fetch")
+            raise
+        finally:
+            self.metrics.upstream_fetch_seconds.observe(time.perf_counter() - started, source)
+        if breaker.success():
+            self._closed(source)
+        if self.recorder is not None:
+            self.recorder.record(source, time.time(), response.content)
+        return response
+
+    def _opened(self, source: str) -> None:
+        """
+        Relève l'ouverture du disjoncteur d'une source et lance sa sonde en tâche de fond.
+
+        :param source: nom de la source.
+        :return: None
+        :except: Aucun.
+        """
+        self.metrics.upstream_circuit_open.inc(source)
+        if source not in self._probes:
+            self._probes[source] = asyncio.create_task(self._probe(source), name=f"war-thunder-probe-{source}")
+
+    def _closed(self, source: str) -> None:
+        """
+        Relève la fermeture du disjoncteur d'une source.
+
+        :param source: nom de la source.
+        :return: None
+        :except: Aucun.
+        """
+        self.metrics.upstream_circuit_open.dec(source)
+
+    async def _probe(self, source: str) -> None:
+        """
+        Sonde une source tant que son disjoncteur est ouvert, puis le referme dès qu'elle répond.
+
+        Seuls les en-têtes sont lus : sonder l'image de la carte ne la télécharge pas.
+
+        :param source: nom de la source.
+        :return: None
+        :except: asyncio.CancelledError à la fermeture du client.
+        """
+        breaker = self.breakers[source]
+        try:
+            while breaker.open:
+                await asyncio.sleep(breaker.retry_in)
+                try:
+                    async with self.client.stream("GET", self.urls[source], timeout=self.timeouts[source]):
+                        pass
+                except TransportError as exc:
+                    breaker.probe_failed(str(exc) or type(exc).__name__)
+                else:
+                    if breaker.success():
+                        self._closed(source)
+        finally:
+            self._probes.pop(source, None)
+
+    async def _get(self, source: str, parse: Callable[[bytes], T]) -> T:
+        """
+        Récupère une source upstream puis convertit son corps, en mesurant la conversion.
+
+        :param source: nom de la source.
+        :param parse: conversion du corps brut en modèle.
+        :return: valeur renvoyée par `parse`.
+        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        """
+        try:
+            response = await self.fetch(source)
+        except Exception as exc:
+            raise HTTPException(status_code=502, detail=f"Upstream service unreachable: {exc}")
+        started = time.perf_counter()
+        try:
+            result = parse(response.content)
+        except Exception as exc:
+            self.metrics.upstream_errors.inc(source, "parse")
+            raise HTTPException(status_code=502, detail=f"Upstream service unreachable: {exc}")
+        self.metrics.parse_seconds.observe(time.perf_counter() - started, source)
+        return result
+
+    async def get_indicators(self) -> IndicatorsModel:
+        """
+        Récupère les indicateurs depuis le serveur War Thunder et les valide via Pydantic.
+
+        :param: None
+        :return: `IndicatorsModel` avec les indicateurs remontés par l'upstream.
+        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        """
+        return await self._get(self.INDICATORS, lambda content: IndicatorsModel(**json.loads(content)))
+
+    async def get_map_info(self) -> MapInfoModel:
+        """
+        Récupère les informations de la carte depuis le serveur War Thunder.
+
+        :param: None
+        :return: `MapInfoModel` décrivant la grille et les bornes de la carte.
+        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        """
+        return await self._get(self.MAP_INFO, lambda content: MapInfoModel(**json.loads(content)))
+
+    async def get_map_objects(self) -> MapObjectColumns:
+        """
+        Récupère les objets présents sur la carte depuis l'upstream, sous forme de colonnes.
+
+        :param: None
+        :return: `MapObjectColumns` des objets de la carte.
+        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        """
+        return await self._get(self.MAP_OBJECTS, MapObjectColumns.from_json)
+
+    async def get_state(self) -> StateModel:
+        """
+        Récupère l'état du joueur/véhicule depuis le serveur War Thunder.
+
+        :param: None
+        :return: `StateModel` représentant l'état actuel (contrôles, moteurs, etc.).
+        :except: HTTPException(502) si l'upstream est injoignable ou répond mal.
+        """
+        return await self._get(self.STATE, self.state_parser.parse_json)
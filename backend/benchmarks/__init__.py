@@ -0,0 +1,3 @@
+"""
+Benchmarks reproductibles du backend War Thunder (à lancer depuis le dossier `backend`).
+"""
@@ -0,0 +1,66 @@
+"""
+Benchmark de l'encodage des réponses de télémétrie : JSON, MessagePack et CBOR.
+
+Pour chaque charge utile (indicateurs, état, objets de la carte en lignes et en colonnes),
+mesure la taille du corps et le temps d'encodage (conversion des modèles comprise) de chaque
+format disponible dans `Fastapi_WarThunder.encoding.ENCODERS`. Les formats dont la
+bibliothèque n'est pas installée (`msgpack`, `cbor2`) sont signalés et ignorés.
+
+Usage (depuis le dossier `backend`) :
+    python -m benchmarks.bench_encoding [--objects 50 200 500] [--number 2000]
+"""
+
+import argparse
+import json
+import timeit
+
+from Fastapi_WarThunder.columnar import MapObjectColumns
+from Fastapi_WarThunder.encoding import BINARY_MEDIA_TYPES, ENCODERS, encode
+from Fastapi_WarThunder.ingest import StateParser
+from Fastapi_WarThunder.schemas import IndicatorsModel
+
+from .bench_endpoints import INDICATORS
+from .bench_map_objects import make_frame as make_map_objects
+from .bench_state_ingest import make_frame as make_state
+
+
+def main():
+    """
+    Mesure et affiche, par charge utile et par format, la taille encodée et le temps d'encodage.
+
+    :param: None (arguments lus depuis la ligne de commande).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark JSON / MessagePack / CBOR response encoding.")
+    parser.add_argument("--objects", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--engines", type=int, default=2)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    missing = [media_type for media_type in BINARY_MEDIA_TYPES if media_type not in ENCODERS]
+    if missing:
+        print(f"not installed (skipped): {', '.join(missing)}")
+
+    payloads = {
+        "indicators": IndicatorsModel(**INDICATORS),
+        f"state ({args.engines} engines)": StateParser()(make_state(args.engines)),
+    }
+    for objects in args.objects:
+        columns = MapObjectColumns.from_json(json.dumps(make_map_objects(objects)).encode("utf-8"))
+        payloads[f"map_objects rows ({objects})"] = columns.rows
+        payloads[f"map_objects columnar ({objects})"] = columns.columnar
+
+    print(f"{'payload':<30}{'format':<22}{'bytes':>8}{'vs json':>9}{'us/encode':>11}")
+    for name, value in payloads.items():
+        json_size = len(encode("application/json", value))
+        for media_type in ENCODERS:
+            size = len(encode(media_type, value))
+            best = min(timeit.repeat(lambda: encode(media_type, value), number=args.number, repeat=args.repeat))
+            print(f"{name:<30}{media_type:<22}{size:>8}{size / json_size:>9.2f}"
+                  f"{best / args.number * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
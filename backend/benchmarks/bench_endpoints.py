@@ -0,0 +1,349 @@
+"""
+Benchmark de latence et de débit des routes HTTP de l'application.
+
+L'application `App` est lancée dans le processus (transport ASGI, sans socket côté client)
+et interroge un faux serveur War Thunder : un `ReplayApp` servi par Uvicorn sur un port
+local libre, qui rejoue un enregistrement synthétique (ou celui passé via `--recording`).
+
+Pour chaque route et chaque niveau de concurrence, N clients envoient des requêtes en boucle
+pendant `--duration` secondes ; les percentiles p50/p95/p99 et le débit sont écrits dans un
+fichier JSON, comparable d'un commit à l'autre via `--compare`, avec les octets transférés
+et le temps CPU (client et application confondus, dans le même processus) par requête.
+`--accept-encoding` choisit la compression demandée (`identity` par défaut, `gzip`, `br`).
+
+Usage (depuis le dossier `backend`) :
+    python -m benchmarks.bench_endpoints [--concurrency 1 10 100] [--duration 5]
+        [--accept-encoding gzip] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import statistics
+import struct
+import subprocess
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+from Fastapi_WarThunder import App
+from Fastapi_WarThunder.recorder import SessionRecorder, iter_records
+from Fastapi_WarThunder.replay import KEEPALIVE_TIMEOUT, ReplayApp
+from Fastapi_WarThunder.upstream import WarThunderClient
+
+from .bench_map_objects import make_frame as make_map_objects
+from .bench_state_ingest import make_frame as make_state
+
+ROUTES: tuple[str, ...] = (
+    "/indicators", "/state", "/map_objects", "/map_img", "/gyroscope", "/compass", "/speed", "/altitude",
+)
+
+INDICATORS = {
+    "valid": True, "army": "air", "type": "a-35b", "speed": 56.0, "vario": 0.8, "altitude_hour": 587.5,
+    "altitude_min": 587.5, "altitude_10k": 20587.5, "aviahorizon_roll": 1.0, "aviahorizon_pitch": -2.2,
+    "bank": -0.01, "turn": -0.002, "compass": 252.1, "compass2": 2.9, "manifold_pressure": 1.1,
+    "rpm": 2600.0, "oil_pressure": 1, "oil_temperature": 87.4, "head_temperature": 229.5, "fuel": 780,
+    "head_temperature1": -273.1, "fuel_pressure": 10.9, "gear_lamp_down": 0, "gear_lamp_up": 0, "gear_lamp_off": 0,
+    "blister1": 0, "blister2": 0, "blister3": 0, "blister4": 0,
+}
+MAP_INFO = {
+    "grid_size": [52719.4, 55385.3], "grid_steps": [5500, 5500], "grid_zero": [6494.3, 19547.5],
+    "hud_type": 0, "map_generation": 1, "map_max": [65536, 65536], "map_min": [-65536, -65536], "valid": True,
+}
+
+
+def make_png(size: int) -> bytes:
+    """
+    Construit une image PNG RGB carrée (dégradé), pour simuler /map.img.
+
+    :param size: largeur et hauteur en pixels.
+    :return: octets PNG.
+    :except: Aucun.
+    """
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = bytes(value for x in range(size) for value in ((x * 4) % 256, 128, 64))
+    raw = b"".join(b"\x00" + row for _ in range(size))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+def write_synthetic_recording(directory: str, objects: int, frames: int = 50) -> Path:
+    """
+    Écrit un enregistrement `.wtrec` synthétique (10 Hz) couvrant toutes les sources.
+
+    :param directory: dossier de destination.
+    :param objects: nombre d'objets de carte par trame.
+    :param frames: nombre de ticks enregistrés.
+    :return: chemin de l'enregistrement créé.
+    :except: OSError si l'écriture échoue.
+    """
+    recorder = SessionRecorder(directory)
+    recorder.start()
+    started = time.time()
+    state = json.dumps(make_state(2)).encode("utf-8")
+    map_info = json.dumps(MAP_INFO).encode("utf-8")
+    recorder.record(WarThunderClient.MAP_IMG, started, make_png(512))
+    for tick in range(frames):
+        timestamp = started + tick * 0.1
+        indicators = dict(INDICATORS, compass=(tick * 3.6) % 360, speed=56.0 + tick % 7)
+        recorder.record(WarThunderClient.INDICATORS, timestamp, json.dumps(indicators).encode("utf-8"))
+        recorder.record(WarThunderClient.STATE, timestamp, state)
+        recorder.record(WarThunderClient.MAP_INFO, timestamp, map_info)
+        recorder.record(WarThunderClient.MAP_OBJECTS, timestamp,
+                        json.dumps(make_map_objects(objects, seed=tick)).encode("utf-8"))
+        recorder.commit(MAP_INFO["map_generation"])
+    recorder.close()
+    return recorder.path
+
+
+def free_port() -> int:
+    """
+    Réserve puis libère un port TCP local.
+
+    :param: None
+    :return: numéro de port libre.
+    :except: OSError si aucun port n'est disponible.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: list[float], rank: float) -> float:
+    """
+    Percentile (rang le plus proche) d'une liste triée.
+
+    :param sorted_values: valeurs triées (non vide).
+    :param rank: rang entre 0 et 100.
+    :return: valeur du percentile.
+    :except: Aucun.
+    """
+    index = max(0, math.ceil(rank / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+async def measure(client: httpx.AsyncClient, route: str, concurrency: int, duration: float) -> dict:
+    """
+    Envoie des requêtes sur une route depuis `concurrency` clients pendant `duration` secondes.
+
+    :param client: client HTTP branché sur l'application.
+    :param route: route mesurée.
+    :param concurrency: nombre de clients simultanés.
+    :param duration: durée de la mesure en secondes.
+    :return: dict du résultat (requêtes, erreurs et première erreur, débit, percentiles en millisecondes,
+        octets de corps reçus et temps CPU par requête).
+    :except: Aucun; les réponses non 2xx/304 sont comptées comme erreurs.
+    """
+    latencies: list[float] = []
+    errors = 0
+    first_error = None
+    downloaded = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors, first_error, downloaded
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(route)
+                downloaded += response.num_bytes_downloaded
+                error = f"{response.status_code} {response.text[:200]}" if response.status_code >= 400 else None
+            except httpx.HTTPError as exc:
+                error = repr(exc)
+            latencies.append(time.perf_counter() - started)
+            if error is not None:
+                errors += 1
+                first_error = first_error or error
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    requests = len(latencies)
+    latencies.sort()
+    if not latencies:
+        latencies = [math.nan]
+    return {
+        "route": route,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1e3, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1e3, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1e3, 3),
+        "max_ms": round(latencies[-1] * 1e3, 3),
+        "bytes_per_request": round(downloaded / requests) if requests else None,
+        "cpu_ms_per_request": round(cpu / requests * 1e3, 4) if requests else None,
+        "first_error": first_error,
+    }
+
+
+async def run(args: argparse.Namespace, recording: Path) -> list[dict]:
+    """
+    Démarre le faux upstream et l'application, puis mesure chaque route à chaque concurrence.
+
+    :param args: arguments de la ligne de commande.
+    :param recording: enregistrement rejoué par le faux upstream.
+    :return: liste des résultats de `measure`.
+    :except: RuntimeError si le faux upstream ne démarre pas.
+    """
+    port = free_port()
+    upstream = uvicorn.Server(uvicorn.Config(
+        ReplayApp(str(recording), LOOP=True, LATENCY=args.upstream_latency),
+        host="127.0.0.1", port=port, log_level="warning", lifespan="on",
+        timeout_keep_alive=KEEPALIVE_TIMEOUT
+    ))
+    upstream_task = asyncio.create_task(upstream.serve())
+    while not upstream.started:
+        if upstream_task.done():
+            raise RuntimeError("Fake upstream failed to start")
+        await asyncio.sleep(0.01)
+
+    app = App(IP_SERVER_WAR_THUNDER="127.0.0.1", PORT_SERVER_WAR_THUNDER=port,
+              POLL_INTERVAL=args.poll_interval, TRUSTED_INGEST=args.trusted_ingest)
+    results = []
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            headers = {"Accept-Encoding": args.accept_encoding}
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+                await app.poller.refresh()
+                for route in args.routes:
+                    await measure(client, route, 1, args.warmup)
+                    for concurrency in args.concurrency:
+                        result = await measure(client, route, concurrency, args.duration)
+                        results.append(result)
+                        print(f"{route:<14}{concurrency:>5}{result['rps']:>10.1f}{result['p50_ms']:>10.2f}"
+                              f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}"
+                              f"{result['bytes_per_request'] or 0:>10}{result['cpu_ms_per_request'] or 0:>9.3f}")
+    finally:
+        upstream.should_exit = True
+        await upstream_task
+    return results
+
+
+def git_revision() -> str:
+    """
+    Révision git courante (pour identifier le commit mesuré).
+
+    :param: None
+    :return: hash court, suffixé de "-dirty" si l'arbre est modifié; "unknown" hors dépôt git.
+    :except: Aucun.
+    """
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """
+    Affiche l'évolution du débit, du p95 et des octets transférés par rapport à un fichier de
+    résultats précédent.
+
+    :param results: résultats courants.
+    :param baseline_path: fichier JSON produit par une exécution précédente.
+    :return: None
+    :except: OSError/ValueError si le fichier de référence est illisible.
+    """
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)
+    previous = {(item["route"], item["concurrency"]): item for item in baseline["results"]}
+    print(f"\nvs {baseline_path} ({baseline['meta'].get('git_revision')})")
+    print(f"{'route':<14}{'conc':>5}{'rps %':>10}{'p95 %':>10}{'bytes %':>10}")
+    for item in results:
+        before = previous.get((item["route"], item["concurrency"]))
+        if before is None or not before["rps"] or not before["p95_ms"]:
+            continue
+        before_bytes, after_bytes = before.get("bytes_per_request"), item["bytes_per_request"]
+        if before_bytes and after_bytes:
+            bytes_change = f"{(after_bytes / before_bytes - 1) * 100:>+10.1f}"
+        else:
+            bytes_change = f"{'-':>10}"
+        print(f"{item['route']:<14}{item['concurrency']:>5}"
+              f"{(item['rps'] / before['rps'] - 1) * 100:>+10.1f}"
+              f"{(item['p95_ms'] / before['p95_ms'] - 1) * 100:>+10.1f}{bytes_change}")
+
+
+def main():
+    """
+    Lance la suite et écrit les résultats au format JSON.
+
+    :param: None (arguments lus depuis la ligne de commande).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP routes against a fake upstream.")
+    parser.add_argument("--routes", nargs="+", default=list(ROUTES))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=5.0,
+                        help="Seconds of load per route and concurrency level.")
+    parser.add_argument("--warmup", type=float, default=0.5,
+                        help="Seconds of single-client warm-up per route.")
+    parser.add_argument("--objects", type=int, default=200,
+                        help="Map objects per frame in the synthetic recording.")
+    parser.add_argument("--recording", type=str, default=None,
+                        help="Replay this .wtrec instead of a synthetic recording.")
+    parser.add_argument("--poll-interval", type=float, default=0.2)
+    parser.add_argument("--upstream-latency", type=float, default=0.0,
+                        help="Seconds of latency injected by the fake upstream.")
+    parser.add_argument("--trusted-ingest", action="store_true")
+    parser.add_argument("--accept-encoding", type=str, default="identity",
+                        help="Accept-Encoding sent by the clients (identity, gzip, br).")
+    parser.add_argument("--output", type=str, default="bench_endpoints.json")
+    parser.add_argument("--compare", type=str, default=None,
+                        help="Previous results file to compare against.")
+    args = parser.parse_args()
+
+    print(f"{'route':<14}{'conc':>5}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+          f"{'bytes':>10}{'cpu ms':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        recording = Path(args.recording) if args.recording else write_synthetic_recording(directory, args.objects)
+        frames = sum(1 for _ in iter_records(recording))
+        results = asyncio.run(run(args, recording))
+
+    report = {
+        "meta": {
+            "benchmark": "endpoints",
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "recording": args.recording or f"synthetic ({args.objects} map objects)",
+            "recording_frames": frames,
+            "duration_s": args.duration,
+            "poll_interval_s": args.poll_interval,
+            "upstream_latency_s": args.upstream_latency,
+            "trusted_ingest": args.trusted_ingest,
+            "accept_encoding": args.accept_encoding,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
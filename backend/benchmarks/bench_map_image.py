@@ -0,0 +1,201 @@
+"""
+Benchmark mémoire de `/map_img?as_base64=true` sous requêtes concurrentes (`tracemalloc`).
+
+Un faux upstream (`replay.py`, dans un processus séparé pour ne pas fausser la mesure) sert
+une image de carte de `--image-mb` Mo. L'application est appelée directement en ASGI, avec
+un `send` qui compte puis jette les octets : seule la mémoire du serveur est mesurée.
+
+Trois scénarios de `--concurrency` requêtes simultanées :
+  - legacy : reproduction de l'ancien chemin (base64 décodé en `str` puis JSON ré-encodé
+    par requête), pour comparaison ;
+  - cold : premières requêtes d'une génération (téléchargement et encodage base64 compris) ;
+  - warm : requêtes suivantes, servies depuis le tampon base64 en cache.
+
+Le pic est rapporté en Mo et en nombre de copies de l'image.
+
+Usage (depuis le dossier `backend`) :
+    python -m benchmarks.bench_map_image [--image-mb 4] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+from fastapi.responses import JSONResponse
+
+from Fastapi_WarThunder import App
+from Fastapi_WarThunder.recorder import SessionRecorder
+from Fastapi_WarThunder.upstream import WarThunderClient
+
+from .bench_endpoints import MAP_INFO, free_port
+
+
+def write_recording(directory: str, image: bytes) -> Path:
+    """
+    Écrit un enregistrement `.wtrec` minimal : l'image de la carte et ses informations.
+
+    :param directory: dossier de destination.
+    :param image: octets de l'image.
+    :return: chemin de l'enregistrement créé.
+    :except: OSError si l'écriture échoue.
+    """
+    recorder = SessionRecorder(directory)
+    recorder.start()
+    now = time.time()
+    recorder.record(WarThunderClient.MAP_IMG, now, image)
+    recorder.record(WarThunderClient.MAP_INFO, now, json.dumps(MAP_INFO).encode("utf-8"))
+    recorder.commit(MAP_INFO["map_generation"])
+    recorder.close()
+    return recorder.path
+
+
+async def call(app, path: str, query: bytes = b"") -> int:
+    """
+    Appelle l'application en ASGI et jette le corps de la réponse.
+
+    :param app: application ASGI.
+    :param path: chemin demandé.
+    :param query: querystring.
+    :return: nombre d'octets du corps reçu.
+    :except: RuntimeError si le statut n'est pas 200.
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query, "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", b"identity")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    received = 0
+    requested = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Comme un vrai serveur : le client ne se déconnecte pas avant la fin de la réponse.
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"{path}: HTTP {message['status']}")
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return received
+
+
+async def legacy(app: App, concurrency: int) -> None:
+    """
+    Ancien chemin : chaque requête décode le base64 en `str`, puis le corps est ré-encodé en JSON.
+
+    :param app: application (pour l'image en cache).
+    :param concurrency: nombre de requêtes simultanées.
+    :return: None
+    :except: Aucun.
+    """
+    image = app.map_image.image
+
+    async def one():
+        response = JSONResponse({
+            "content": base64.b64encode(image.content).decode("ascii"), "content_type": image.content_type
+        })
+        await call(response, "/map_img")
+
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+
+
+async def peak(scenario) -> float:
+    """
+    Mesure le pic de mémoire allouée pendant un scénario, au-delà de la mémoire déjà allouée.
+
+    :param scenario: coroutine à mesurer.
+    :return: pic en octets.
+    :except: Aucun.
+    """
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    await scenario
+    return tracemalloc.get_traced_memory()[1] - before
+
+
+async def run(args: argparse.Namespace, port: int) -> None:
+    """
+    Lance l'application contre le faux upstream et mesure chaque scénario.
+
+    :param args: arguments de la ligne de commande.
+    :param port: port du faux upstream.
+    :return: None
+    :except: RuntimeError si une requête échoue.
+    """
+    size = int(args.image_mb * 1024 * 1024)
+    app = App(IP_SERVER_WAR_THUNDER="127.0.0.1", PORT_SERVER_WAR_THUNDER=port, POLL_INTERVAL=0.5)
+    async with app.router.lifespan_context(app):
+        await app.poller.refresh()
+        tracemalloc.start()
+        requests = [call(app, "/map_img", b"as_base64=true") for _ in range(args.concurrency)]
+        results = {"cold": await peak(asyncio.gather(*requests))}
+        requests = [call(app, "/map_img", b"as_base64=true") for _ in range(args.concurrency)]
+        results["warm"] = await peak(asyncio.gather(*requests))
+        results["legacy"] = await peak(legacy(app, args.concurrency))
+        tracemalloc.stop()
+
+    print(f"image {size / 2 ** 20:.1f} MiB, {args.concurrency} concurrent requests")
+    print(f"{'scenario':<10}{'peak MiB':>10}{'image copies':>14}")
+    for name in ("legacy", "cold", "warm"):
+        print(f"{name:<10}{results[name] / 2 ** 20:>10.1f}{results[name] / size:>14.2f}")
+
+
+def main():
+    """
+    Démarre le faux upstream puis mesure les scénarios.
+
+    :param: None (arguments lus depuis la ligne de commande).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark memory of the base64 map image route.")
+    parser.add_argument("--image-mb", type=float, default=4.0)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Octets aléatoires derrière une signature PNG : incompressibles, comme une vraie carte.
+        image = b"\x89PNG\r\n\x1a\n" + os.urandom(int(args.image_mb * 1024 * 1024) - 8)
+        recording = write_recording(directory, image)
+        port = free_port()
+        upstream = subprocess.Popen(
+            [sys.executable, "replay.py", str(recording), "--host", "127.0.0.1", "--port", str(port), "--loop"],
+            cwd=Path(__file__).resolve().parent.parent, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            deadline = time.monotonic() + 10
+            while True:
+                try:
+                    httpx.get(f"http://127.0.0.1:{port}/map_info.json")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError("Fake upstream failed to start")
+                    time.sleep(0.1)
+            asyncio.run(run(args, port))
+        finally:
+            upstream.terminate()
+            upstream.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark de l'analyse et de la sérialisation d'une trame /map_obj.json.
+
+Compare l'ancienne conversion (`json.loads` puis un `MapObjectModel` par objet, sérialisé
+via `model_dump`) au chemin en colonnes de `MapObjectColumns`, pour la sortie par lignes
+et pour la sortie `?format=columnar`. Chaque mesure part des octets bruts de la réponse ;
+le chemin en colonnes est sérialisé par `encoding.encode`, comme les routes servies.
+
+Usage (depuis le dossier `backend`) :
+    python -m benchmarks.bench_map_objects [--objects 50 200 500] [--number 500]
+"""
+
+import argparse
+import json
+import random
+import timeit
+
+from Fastapi_WarThunder.columnar import MapObjectColumns
+from Fastapi_WarThunder.encoding import JSON, encode
+from Fastapi_WarThunder.schemas import MapObjectIcon, MapObjectIconBg, MapObjectModel, MapObjectType
+
+ICONS = ("LightTank", "MediumTank", "SPAA", "Ship", "Boat", "Fighter")
+COLORS = ((23, 77, 255), (250, 12, 0), (250, 200, 30))
+
+
+def make_frame(objects: int, seed: int = 1) -> list[dict]:
+    """
+    Construit une trame /map_obj.json synthétique : un aérodrome, le joueur, puis des unités.
+
+    :param objects: nombre total d'objets.
+    :param seed: graine du générateur aléatoire.
+    :return: liste d'objets au format de l'upstream War Thunder.
+    :except: Aucun.
+    """
+    rnd = random.Random(seed)
+    frame = [
+        {"type": "airfield", "color": "#174DFF", "color[]": [23, 77, 255], "blink": 0, "icon": "none",
+         "icon_bg": "none", "sx": 0.688678, "sy": 0.488574, "ex": 0.664311, "ey": 0.490086},
+        {"type": "aircraft", "color": "#faC81E", "color[]": [250, 200, 30], "blink": 0, "icon": "Player",
+         "icon_bg": "none", "x": 0.559299, "y": 0.106122, "dx": -0.998621, "dy": 0.052501},
+    ]
+    while len(frame) < objects:
+        rgb = rnd.choice(COLORS)
+        frame.append({
+            "type": rnd.choice(("ground_model", "aircraft")), "color": "#%02x%02x%02x" % rgb,
+            "color[]": list(rgb), "blink": rnd.choice((0, 2)), "icon": rnd.choice(ICONS), "icon_bg": "none",
+            "x": rnd.random(), "y": rnd.random(), "dx": rnd.uniform(-1, 1), "dy": rnd.uniform(-1, 1),
+        })
+    return frame[:objects]
+
+
+def legacy_parse(data: list[dict]) -> list[MapObjectModel]:
+    """
+    Reproduction de la conversion objet par objet d'origine (référence "avant").
+
+    :param data: trame /map_obj.json décodée.
+    :return: liste de `MapObjectModel`.
+    :except: ValueError si un objet est invalide.
+    """
+    res: list[MapObjectModel] = []
+    for item in data:
+        res.append(MapObjectModel(
+            type=MapObjectType(item.get("type")),
+            icon=MapObjectIcon(item.get("icon")) if item.get("icon") else None,
+            icon_bg=MapObjectIconBg(item.get("icon_bg")) if item.get("icon_bg") else None,
+            color_hex=item.get("color"),
+            color_rgb=item.get("color[]"),
+            blink=item.get("blink"),
+            x=item.get("x"),
+            y=item.get("y"),
+            dx=item.get("dx"),
+            dy=item.get("dy"),
+            sx=item.get("sx"),
+            sy=item.get("sy"),
+            ex=item.get("ex"),
+            ey=item.get("ey")
+        ))
+    return res
+
+
+def main():
+    """
+    Mesure et affiche le temps moyen par trame (analyse, puis analyse + sérialisation JSON).
+
+    :param: None (arguments lus depuis la ligne de commande).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark /map_obj.json parsing and serialization.")
+    parser.add_argument("--objects", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    def dumps(value) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    cases = {
+        "legacy parse": lambda content: legacy_parse(json.loads(content)),
+        "columnar parse": MapObjectColumns.from_json,
+        "legacy parse+rows json": lambda content: dumps(
+            [item.model_dump(mode="json") for item in legacy_parse(json.loads(content))]
+        ),
+        "columnar parse+rows json": lambda content: encode(JSON, MapObjectColumns.from_json(content).rows),
+        "columnar parse+columnar json": lambda content: encode(JSON, MapObjectColumns.from_json(content).columnar),
+    }
+    print(f"{'objects':>7}  {'case':<30}{'us/frame':>10}")
+    for objects in args.objects:
+        content = json.dumps(make_frame(objects)).encode("utf-8")
+        for name, run in cases.items():
+            best = min(timeit.repeat(lambda: run(content), number=args.number, repeat=args.repeat))
+            print(f"{objects:>7}  {name:<30}{best / args.number * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark des requêtes de voisinage sur les objets de la carte.
+
+Compare, pour plusieurs tailles de trame, un parcours complet des objets (filtrage sans
+index) aux requêtes de `SpatialIndex` : rectangle, rayon autour du joueur et k plus proches
+ennemis. Le coût de construction de l'index, payé une fois par tick, est affiché à part.
+
+Usage (depuis le dossier `backend`) :
+    python -m benchmarks.bench_spatial [--objects 50 200 500 2000] [--number 2000]
+"""
+
+import argparse
+import json
+import timeit
+
+from Fastapi_WarThunder.columnar import MapObjectColumns
+from Fastapi_WarThunder.spatial import MapQuery, SpatialIndex
+
+from .bench_map_objects import make_frame
+
+
+def scan(columns: MapObjectColumns, x: float, y: float, radius: float) -> list[int]:
+    """
+    Référence sans index : teste la distance de chaque objet au centre.
+
+    :param columns: objets de la trame.
+    :param x: abscisse du centre.
+    :param y: ordonnée du centre.
+    :param radius: rayon de recherche.
+    :return: indices des objets dans le rayon.
+    :except: Aucun.
+    """
+    xs, ys = columns.positions
+    return [i for i in range(columns.count) if (xs[i] - x) ** 2 + (ys[i] - y) ** 2 <= radius * radius]
+
+
+def main():
+    """
+    Mesure et affiche le temps de construction de l'index et de chaque type de requête.
+
+    :param: None (arguments lus depuis la ligne de commande).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark map object spatial queries.")
+    parser.add_argument("--objects", type=int, nargs="+", default=[50, 200, 500, 2000])
+    parser.add_argument("--radius", type=float, default=0.1)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'objects':>8}{'build us':>10}{'scan us':>10}{'radius us':>11}{'bbox us':>10}{'5-nn us':>10}")
+    for objects in args.objects:
+        columns = MapObjectColumns.from_json(json.dumps(make_frame(objects)).encode("utf-8"))
+        columns.positions
+        build = min(timeit.repeat(lambda: SpatialIndex(columns), number=20, repeat=3)) / 20
+        index = SpatialIndex(columns)
+        x, y = index.xs[index.player], index.ys[index.player]
+        queries = {
+            "radius": MapQuery(near="player", radius=args.radius),
+            "bbox": MapQuery(bbox=(x - args.radius, y - args.radius, x + args.radius, y + args.radius)),
+            "knn": MapQuery(near="player", k=5, side="enemy"),
+        }
+        timings = [min(timeit.repeat(lambda: scan(columns, x, y, args.radius), number=args.number, repeat=3))]
+        for query in queries.values():
+            timings.append(min(timeit.repeat(lambda: index.query(query), number=args.number, repeat=3)))
+        print(f"{objects:>8}{build * 1e6:>10.1f}"
+              + "".join(f"{best / args.number * 1e6:>{width}.1f}" for best, width in zip(timings, (10, 11, 10, 10))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark du temps d'analyse d'une trame /state.
+
+Compare l'ancienne conversion (`json.loads`, un `data.get` par champ puis validation Pydantic
+complète, moteur 1 uniquement) au `StateParser` compilé, en mode validé et en mode de confiance.
+Chaque mesure part des octets bruts de la réponse, comme dans `WarThunderClient.get_state`.
+
+Usage (depuis le dossier `backend`) :
+    python -m benchmarks.bench_state_ingest [--engines 1 2 4] [--number 20000]
+"""
+
+import argparse
+import json
+import timeit
+
+from Fastapi_WarThunder.ingest import ENGINE_FIELDS, StateParser
+from Fastapi_WarThunder.schemas import StateModel
+
+BASE_FRAME = {
+    "valid": True, "aileron, %": 0, "elevator, %": -35, "rudder, %": -9, "flaps, %": 100,
+    "gear, %": 0, "airbrake, %": 0, "H, m": 6473, "TAS, km/h": 284, "IAS, km/h": 203,
+    "M": 0.25, "AoA, deg": 1.6, "AoS, deg": 0, "Ny": 1, "Vy, m/s": 0.3, "Wx, deg/s": 0,
+    "Mfuel, kg": 780, "Mfuel0, kg": 780,
+}
+ENGINE_VALUES = (110, 100, 100, 0, 2, 3, 1133.3, 2600, 1.09, 85, 26.9, 1016, 93)
+
+
+def make_frame(engines: int) -> dict:
+    """
+    Construit une trame /state synthétique avec `engines` moteurs.
+
+    :param engines: nombre de moteurs.
+    :return: dict au format de l'upstream War Thunder.
+    :except: Aucun.
+    """
+    frame = dict(BASE_FRAME)
+    for n in range(1, engines + 1):
+        for (template, _, _), value in zip(ENGINE_FIELDS, ENGINE_VALUES):
+            frame[template.format(n=n)] = value
+    return frame
+
+
+def legacy_parse(data: dict) -> StateModel:
+    """
+    Reproduction de la conversion manuelle d'origine (référence "avant").
+
+    :param data: trame /state.
+    :return: `StateModel` validé (moteur 1 uniquement).
+    :except: ValidationError si la trame est invalide.
+    """
+    return StateModel(
+        valid=data.get("valid", False),
+        aileron=data.get("aileron, %"),
+        elevator=data.get("elevator, %"),
+        rudder=data.get("rudder, %"),
+        flaps=data.get("flaps, %"),
+        gear=data.get("gear, %"),
+        airbrake=data.get("airbrake, %"),
+        H_m=data.get("H, m"),
+        TAS_kmh=data.get("TAS, km/h"),
+        IAS_kmh=data.get("IAS, km/h"),
+        M=data.get("M"),
+        AoA_deg=data.get("AoA, deg"),
+        AoS_deg=data.get("AoS, deg"),
+        Ny=data.get("Ny"),
+        Vy_ms=data.get("Vy, m/s"),
+        Wx_deg_s=data.get("Wx, deg/s"),
+        Mfuel_kg=data.get("Mfuel, kg"),
+        Mfuel0_kg=data.get("Mfuel0, kg"),
+        throttle1_percent=data.get("throttle 1, %"),
+        RPM_throttle1_percent=data.get("RPM throttle 1, %"),
+        mixture1_percent=data.get("mixture 1, %"),
+        radiator1_percent=data.get("radiator 1, %"),
+        compressor_stage1=data.get("compressor stage 1"),
+        magneto1=data.get("magneto 1"),
+        power1_hp=data.get("power 1, hp"),
+        RPM1=data.get("RPM 1"),
+        manifold_pressure1_atm=data.get("manifold pressure 1, atm"),
+        oil_temp1_C=data.get("oil temp 1, C"),
+        pitch1_deg=data.get("pitch 1, deg"),
+        thrust1_kg=data.get("thrust 1, kgs"),
+        efficiency1_percent=data.get("efficiency 1, %")
+    )
+
+
+def main():
+    """
+    Mesure et affiche le temps moyen d'analyse par trame pour chaque implémentation.
+
+    :param: None (arguments lus depuis la ligne de commande).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark /state frame parsing.")
+    parser.add_argument("--engines", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    parsers = {
+        "legacy (validated)": lambda content: legacy_parse(json.loads(content)),
+        "compiled (validated)": StateParser().parse_json,
+        "compiled (trusted)": StateParser(trusted=True).parse_json,
+    }
+    print(f"{'engines':>7}  {'parser':<22}{'us/frame':>10}")
+    for engines in args.engines:
+        content = json.dumps(make_frame(engines)).encode("utf-8")
+        for name, parse in parsers.items():
+            best = min(timeit.repeat(lambda: parse(content), number=args.number, repeat=args.repeat))
+            print(f"{engines:>7}  {name:<22}{best / args.number * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark de la découpe de l'image de la carte en pyramide de tuiles (`/map_tiles`).
+
+Génère une image synthétique de la taille des cartes War Thunder (dégradés et bruit, pour que
+l'encodage ait un coût réaliste), la découpe avec `build_pyramid` et affiche, par taille et
+format, la durée de génération, le nombre de tuiles et la mémoire occupée, comparée à celle
+de l'image entière. Mesure aussi le surcoût du passage par le pool de processus de `TileCache`.
+
+Usage (depuis le dossier `backend`) :
+    python -m benchmarks.bench_tiles [--sizes 1024 2048 4096] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import io
+import random
+import time
+
+from PIL import Image
+
+from Fastapi_WarThunder.map_image import MapImage
+from Fastapi_WarThunder.metrics import Metrics
+from Fastapi_WarThunder.tiles import TileCache, build_pyramid
+
+
+def make_image(size: int, image_format: str, seed: int = 1) -> bytes:
+    """
+    Construit une image de carte synthétique.
+
+    :param size: côté de l'image, en pixels.
+    :param image_format: `JPEG` ou `PNG`.
+    :param seed: graine du générateur aléatoire.
+    :return: octets de l'image encodée.
+    :except: Aucun.
+    """
+    rnd = random.Random(seed)
+    gradient = Image.linear_gradient("L").resize((size, size))
+    noise = Image.effect_noise((size, size), 40)
+    image = Image.merge("RGB", (gradient, noise, gradient.rotate(90)))
+    for _ in range(200):
+        x, y, radius = rnd.randrange(size), rnd.randrange(size), rnd.randrange(4, size // 16)
+        image.paste((rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)),
+                    (x, y, min(size, x + radius), min(size, y + radius)))
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, quality=85)
+    return buffer.getvalue()
+
+
+async def through_pool(image: MapImage) -> float:
+    """
+    Mesure une génération complète via `TileCache` (pool de processus déjà démarré).
+
+    :param image: image de carte.
+    :return: durée en secondes.
+    :except: Aucun.
+    """
+    cache = TileCache(Metrics())
+    try:
+        await cache.get(MapImage(generation=None, content=make_image(256, "PNG"), content_type="image/png"))
+        started = time.perf_counter()
+        await cache.get(image)
+        return time.perf_counter() - started
+    finally:
+        cache.close()
+
+
+def main():
+    """
+    Mesure et affiche la durée de découpe et la mémoire de la pyramide pour chaque taille d'image.
+
+    :param: None (arguments lus depuis la ligne de commande).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark map tile pyramid generation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 2048, 4096])
+    parser.add_argument("--formats", nargs="+", default=["JPEG", "PNG"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size':>6}{'format':>7}{'image KiB':>11}{'zoom':>6}{'tiles':>7}{'tiles KiB':>11}"
+          f"{'build ms':>10}{'pool ms':>9}")
+    for size in args.sizes:
+        for image_format in args.formats:
+            content = make_image(size, image_format)
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                max_zoom, _media_type, tiles = build_pyramid(content)
+                best = min(best, time.perf_counter() - started)
+            image = MapImage(generation=1, content=content, content_type=f"image/{image_format.lower()}")
+            pool = asyncio.run(through_pool(image))
+            print(f"{size:>6}{image_format:>7}{len(content) / 1024:>11.0f}{max_zoom:>6}{len(tiles):>7}"
+                  f"{sum(map(len, tiles.values())) / 1024:>11.0f}{best * 1e3:>10.0f}{pool * 1e3:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark du suivi des objets de la carte (`MapObjectTracker.update`).
+
+Génère une trame synthétique (voir `bench_map_objects.make_frame`) puis la fait évoluer :
+chaque unité avance d'un pas aléatoire et la trame est mélangée, comme les positions
+anonymes de /map_obj.json. Mesure le temps d'association par trame pour plusieurs tailles,
+afin de vérifier que le coût reste quasi linéaire en nombre d'objets.
+
+Usage (depuis le dossier `backend`) :
+    python -m benchmarks.bench_tracking [--objects 50 200 500 2000] [--frames 200]
+"""
+
+import argparse
+import random
+import time
+
+from Fastapi_WarThunder.columnar import MapObjectColumns
+from Fastapi_WarThunder.schemas import MapInfoModel
+from Fastapi_WarThunder.tracking import MapObjectTracker
+
+from .bench_map_objects import make_frame
+
+MAP_INFO = MapInfoModel(
+    grid_size=[65536.0, 65536.0], grid_steps=[8192.0, 8192.0], grid_zero=[-32768.0, 32768.0], hud_type=0,
+    map_generation=1, map_max=[32768.0, 32768.0], map_min=[-32768.0, -32768.0], valid=True
+)
+
+
+def make_frames(objects: int, frames: int, interval: float, seed: int = 1) -> list[MapObjectColumns]:
+    """
+    Construit une suite de trames où chaque unité se déplace à vitesse constante, dans un ordre aléatoire.
+
+    :param objects: nombre d'objets par trame.
+    :param frames: nombre de trames.
+    :param interval: intervalle entre deux trames, en secondes.
+    :param seed: graine du générateur aléatoire.
+    :return: liste de trames en colonnes.
+    :except: Aucun.
+    """
+    rnd = random.Random(seed)
+    base = make_frame(objects, seed)
+    steps = [(rnd.uniform(-300, 300) * interval / 65536.0, rnd.uniform(-300, 300) * interval / 65536.0)
+             for _ in base]
+    result = []
+    for frame in range(frames):
+        items = []
+        for item, (step_x, step_y) in zip(base, steps):
+            item = dict(item)
+            if "x" in item:
+                item["x"] += step_x * frame
+                item["y"] += step_y * frame
+            items.append(item)
+        rnd.shuffle(items)
+        result.append(MapObjectColumns.from_items(items))
+    return result
+
+
+def main():
+    """
+    Mesure et affiche le temps moyen d'association par trame et par objet.
+
+    :param: None (arguments lus depuis la ligne de commande).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark map object tracking.")
+    parser.add_argument("--objects", type=int, nargs="+", default=[50, 200, 500, 2000])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'objects':>8}{'ms/frame':>11}{'us/object':>11}{'tracks':>8}")
+    for objects in args.objects:
+        frames = make_frames(objects, args.frames, args.interval)
+        tracker = MapObjectTracker()
+        tracker.update(0.0, frames[0], MAP_INFO)
+        started = time.perf_counter()
+        for index, frame in enumerate(frames[1:], start=1):
+            tracker.update(index * args.interval, frame, MAP_INFO)
+        elapsed = (time.perf_counter() - started) / (len(frames) - 1)
+        print(f"{objects:>8}{elapsed * 1e3:>11.3f}{elapsed / objects * 1e6:>11.2f}{len(tracker):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,41 @@ import uvicorn
 from Fastapi_WarThunder import App
 
 
+def parse_timeout(value: str) -> tuple[str, float]:
+    """
+    Convertit un argument `SOURCE=SECONDES` en couple (source, timeout).
+
+    :param value: valeur brute passée à `--upstream-timeout`.
+    :return: tuple (nom de la source, timeout en secondes).
+    :except: argparse.ArgumentTypeError si le format est invalide.
+    """
+    source, sep, seconds = value.partition("=")
+    try:
+        if not sep:
+            raise ValueError(value)
+        return source.strip(), float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected SOURCE=SECONDS, got '{value}'")
+
+
+def parse_player(value: str) -> tuple[str, tuple[str, int]]:
+    """
+    Convertit un argument `NOM=HÔTE[:PORT]` en couple (nom, (hôte, port)).
+
+    :param value: valeur brute passée à `--player`.
+    :return: tuple (nom du joueur, (hôte, port)); le port vaut 8111 s'il est omis.
+    :except: argparse.ArgumentTypeError si le format est invalide.
+    """
+    name, sep, address = value.partition("=")
+    host, _, port = address.partition(":")
+    try:
+        if not sep or not name.strip() or not host.strip():
+            raise ValueError(value)
+        return name.strip(), (host.strip(), int(port) if port else 8111)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=HOST[:PORT], got '{value}'")
+
+
 def main():
     """
     Parse les arguments de ligne de commande et démarre le serveur Uvicorn contenant l'application FastAPI.
@@ -20,6 +55,24 @@ def main():
         --port (int): port pour Uvicorn (défaut: 8000).
         --war-thunder-ip (str): IP du serveur War Thunder (défaut: "localhost").
         --war-thunder-port (int): port du serveur War Thunder (défaut: 8111).
+        --player (NOM=HÔTE[:PORT]): joueur suivi, répétable; remplace --war-thunder-ip/--war-thunder-port
+            (le premier joueur est servi par les routes non préfixées; un nom ne peut apparaître qu'une fois).
+        --upstream-timeout (SOURCE=SECONDES): timeout d'une source upstream, répétable
+            (sources: indicators, state, map_info, map_objects, map_img).
+        --max-connections (int): taille maximale du pool de connexions upstream (défaut: 10).
+        --max-keepalive-connections (int): connexions keep-alive conservées (défaut: 10).
+        --keepalive-expiry (float): durée de vie d'une connexion inactive en secondes (défaut: 30).
+        --poll-interval (float): intervalle de polling upstream en bataille, en secondes (défaut: 0.2).
+        --idle-poll-interval (float): intervalle de polling au hangar ou jeu injoignable (défaut: 2.0).
+        --no-adaptive-polling: interroge toutes les sources à `--poll-interval`, quel que soit l'état du jeu.
+        --trusted-ingest: construit l'état sans revalidation Pydantic (chemin rapide).
+        --record-dir (str): dossier où enregistrer chaque partie (désactivé par défaut).
+        --history-capacity (int): points d'historique conservés par source (défaut: 9000).
+        --breaker-threshold (int): échecs réseau consécutifs avant d'échouer immédiatement (défaut: 3).
+        --breaker-backoff (float): délai avant la première sonde d'une source injoignable (défaut: 1.0).
+        --breaker-max-backoff (float): délai maximal entre deux sondes (défaut: 10.0).
+        --max-stale (float): ancienneté maximale en secondes des données servies à la place d'une
+            source en échec (défaut: 1.0; 0 pour renvoyer 502 dès qu'une source échoue).
     :return: None
     :except: SystemExit si l'analyse des arguments échoue ou si argparse termine le programme.
     """
@@ -32,12 +85,68 @@ def main():
                         help="IP address of the War Thunder server.")
     parser.add_argument("--war-thunder-port", type=int, default=8111,
                         help="Port number of the War Thunder server.")
+    parser.add_argument("--player", type=parse_player, action="append", default=[],
+                        metavar="NAME=HOST[:PORT]",
+                        help="War Thunder client of one player, served under /players/NAME/. Can be repeated"
+                             " with distinct names; replaces --war-thunder-ip/--war-thunder-port.")
+    parser.add_argument("--upstream-timeout", type=parse_timeout, action="append", default=[],
+                        metavar="SOURCE=SECONDS",
+                        help="Timeout for one upstream source (indicators, state, map_info, "
+                             "map_objects, map_img). Can be repeated.")
+    parser.add_argument("--max-connections", type=int, default=10,
+                        help="Maximum number of pooled connections to the War Thunder server.")
+    parser.add_argument("--max-keepalive-connections", type=int, default=10,
+                        help="Maximum number of idle keep-alive connections to the War Thunder server.")
+    parser.add_argument("--keepalive-expiry", type=float, default=30.0,
+                        help="Seconds before an idle upstream connection is closed.")
+    parser.add_argument("--poll-interval", type=float, default=0.2,
+                        help="Seconds between two polls of the War Thunder server during a battle.")
+    parser.add_argument("--idle-poll-interval", type=float, default=2.0,
+                        help="Seconds between two polls while in the hangar or when the game is unreachable.")
+    parser.add_argument("--no-adaptive-polling", action="store_true",
+                        help="Poll every source at --poll-interval regardless of the game state.")
+    parser.add_argument("--trusted-ingest", action="store_true",
+                        help="Build /state models without re-running Pydantic validation.")
+    parser.add_argument("--record-dir", type=str, default=None,
+                        help="Directory where each match is recorded as a binary .wtrec file.")
+    parser.add_argument("--history-capacity", type=int, default=9000,
+                        help="Points of /history kept per source (9000 = 30 minutes at 0.2 s).")
+    parser.add_argument("--breaker-threshold", type=int, default=3,
+                        help="Consecutive network failures after which a source fails fast until it recovers.")
+    parser.add_argument("--breaker-backoff", type=float, default=1.0,
+                        help="Seconds before the first background probe of an unreachable source.")
+    parser.add_argument("--breaker-max-backoff", type=float, default=10.0,
+                        help="Maximum seconds between two background probes of an unreachable source.")
+    parser.add_argument("--max-stale", type=float, default=1.0,
+                        help="Seconds a failed source keeps being served from its last good value"
+                             " (flagged stale), unless the request sets max_stale_ms.")
 
     args = parser.parse_args()
 
+    players: dict[str, tuple[str, int]] = {}
+    for name, address in args.player:
+        if name in players:
+            parser.error(f"duplicate player name {name!r} in --player")
+        players[name] = address
+
     app = App(
         IP_SERVER_WAR_THUNDER=args.war_thunder_ip,
-        PORT_SERVER_WAR_THUNDER=args.war_thunder_port
+        PORT_SERVER_WAR_THUNDER=args.war_thunder_port,
+        PLAYERS=players or None,
+        UPSTREAM_TIMEOUTS=dict(args.upstream_timeout),
+        MAX_CONNECTIONS=args.max_connections,
+        MAX_KEEPALIVE_CONNECTIONS=args.max_keepalive_connections,
+        KEEPALIVE_EXPIRY=args.keepalive_expiry,
+        POLL_INTERVAL=args.poll_interval,
+        IDLE_POLL_INTERVAL=args.idle_poll_interval,
+        ADAPTIVE_POLLING=not args.no_adaptive_polling,
+        TRUSTED_INGEST=args.trusted_ingest,
+        RECORD_DIR=args.record_dir,
+        HISTORY_CAPACITY=args.history_capacity,
+        BREAKER_THRESHOLD=args.breaker_threshold,
+        BREAKER_BACKOFF=args.breaker_backoff,
+        BREAKER_MAX_BACKOFF=args.breaker_max_backoff,
+        MAX_STALE=args.max_stale
     )
 
     uvicorn.run(app, host=args.host, port=args.port)
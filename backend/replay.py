@@ -0,0 +1,60 @@
+"""
+Entrypoint pour démarrer un faux serveur War Thunder rejouant une session enregistrée.
+
+Ce module expose la fonction `main()` qui parse les arguments CLI et démarre Uvicorn ;
+le backend (`main.py`) peut ensuite y être pointé via `--war-thunder-ip`/`--war-thunder-port`.
+"""
+
+import argparse
+
+import uvicorn
+
+from Fastapi_WarThunder.replay import KEEPALIVE_TIMEOUT, ReplayApp
+
+
+def main():
+    """
+    Parse les arguments de ligne de commande et démarre le serveur de relecture.
+
+    :param: (aucun) Les paramètres sont lus depuis la ligne de commande :
+        recording (str): fichier `.wtrec` produit par `main.py --record-dir`.
+        --host (str): hôte pour Uvicorn (défaut: "localhost").
+        --port (int): port pour Uvicorn (défaut: 8111, celui du jeu).
+        --speed (float): vitesse de lecture (défaut: 1.0).
+        --loop: reprend la lecture au début une fois l'enregistrement terminé.
+        --latency (float): latence ajoutée à chaque réponse en secondes (défaut: 0).
+        --jitter (float): variation aléatoire maximale de la latence en secondes (défaut: 0).
+    :return: None
+    :except: SystemExit si l'analyse des arguments échoue ou si argparse termine le programme.
+    """
+    parser = argparse.ArgumentParser(description="Replay a recorded War Thunder session.")
+    parser.add_argument("recording", type=str,
+                        help="Recording (.wtrec) to replay.")
+    parser.add_argument("--host", type=str, default="localhost",
+                        help="Host address to run the server on.")
+    parser.add_argument("--port", type=int, default=8111,
+                        help="Port number to run the server on.")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Playback speed (1.0 = real time).")
+    parser.add_argument("--loop", action="store_true",
+                        help="Restart from the beginning when the recording ends.")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds of latency added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Maximum random variation (+/-) of the latency, in seconds.")
+
+    args = parser.parse_args()
+
+    app = ReplayApp(
+        RECORDING_PATH=args.recording,
+        SPEED=args.speed,
+        LOOP=args.loop,
+        LATENCY=args.latency,
+        JITTER=args.jitter
+    )
+
+    uvicorn.run(app, host=args.host, port=args.port, timeout_keep_alive=KEEPALIVE_TIMEOUT)
+
+
+if __name__ == "__main__":
+    main()
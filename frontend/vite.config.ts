@@ -12,7 +12,10 @@ export default defineConfig({
       '/gyroscope': { target: 'http://localhost:8000', changeOrigin: true },
       '/compass': { target: 'http://localhost:8000', changeOrigin: true },
       '/speed': { target: 'http://localhost:8000', changeOrigin: true },
-      '/altitude': { target: 'http://localhost:8000', changeOrigin: true }
+      '/altitude': { target: 'http://localhost:8000', changeOrigin: true },
+      '/snapshot': { target: 'http://localhost:8000', changeOrigin: true },
+      '/sse': { target: 'http://localhost:8000', changeOrigin: true },
+      '/ws': { target: 'ws://localhost:8000', ws: true, changeOrigin: true }
     }
   }
 })